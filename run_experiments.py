@@ -4,50 +4,255 @@ import argparse
 import os
 import random
 import sys
+from collections import Counter
 
-from src.heuristics import hamming, manhattan
+from src.openlist import OPEN_LISTS
+from src.hooks import FLayerTracer
+from src.heuristics import for_board
+from src.state import get_board
 from src.experiment import (
+    select_heuristics,
     generate_trials,
-    run_batch,
-    summarize,
-    save_csv,
+    generate_trials_by_depth,
+    parse_depth_spec,
+    iter_batch,
+    ALGORITHMS,
+    ResultWriter,
+    read_results_csv,
+    SummaryAccumulator,
     save_summary_csv,
     format_summary_table,
 )
 
 
+# Default for --heuristics; entries without tables for the chosen --size are skipped
+DEFAULT_HEURISTICS = "Hamming,Manhattan,LinearConflict,PDB"
+
+
+def _parse_size(text: str):
+    """argparse type for --size: "4" → (4, 4), "3x4" → (3, 4)."""
+    rows, _, cols = text.lower().partition("x")
+    try:
+        shape = (int(rows), int(cols or rows))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected N or ROWSxCOLS, got {text!r}")
+    if min(shape) < 2:
+        raise argparse.ArgumentTypeError("boards need at least 2 rows and 2 columns")
+    return shape
+
+
 def main(argv=None):
     parser = argparse.ArgumentParser(
         description="Run 8-puzzle A* experiments with multiple heuristics."
     )
     parser.add_argument("--trials", type=int, default=100, help="Number of random solvable start states")
     parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducibility")
+    parser.add_argument(
+        "--size",
+        type=_parse_size,
+        default=(3, 3),
+        help="Board size: 3 (8-puzzle, default), 4 (15-puzzle), 5 (24-puzzle) or ROWSxCOLS "
+             "for rectangles, e.g. 3x4; PDB exists only for 3 and 4, Perfect and --depths only for 3",
+    )
     parser.add_argument("--out", type=str, default="docs/results.csv", help="Output CSV file for raw results")
     parser.add_argument("--summary", type=str, default="docs/summary.csv", help="Output CSV file for summary stats")
+    parser.add_argument(
+        "--heuristics",
+        type=str,
+        default=None,
+        help=f"Comma-separated heuristics to compare (Hamming, Manhattan, LinearConflict, PDB, Zero, Perfect); "
+             f"default {DEFAULT_HEURISTICS}, without those that do not exist for --size",
+    )
+    parser.add_argument(
+        "--algorithm",
+        choices=sorted(ALGORITHMS),
+        default="astar",
+        help="Search algorithm: astar (default), idastar (memory-light, in-place board), bidir "
+             "(bidirectional: BFS for Zero, MM for the other heuristics) or arastar (anytime: "
+             "weighted A* first, then improved down to weight 1) or hda (hash-distributed parallel A*: "
+             "each search runs on --workers processes)",
+    )
+    parser.add_argument(
+        "--weight",
+        type=float,
+        default=None,
+        help="astar: weighted A* with f = g + WEIGHT*h (suboptimal, at most WEIGHT times the "
+             "optimal depth); arastar: initial weight (default 3)",
+    )
+    parser.add_argument(
+        "--open-list",
+        choices=sorted(OPEN_LISTS),
+        default="heap",
+        help="A*/bidir open list: heap (default) or bucket (O(1) push/pop, deeper g first)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for the batch (1 = serial, 0 = one per CPU); with --algorithm hda "
+             "the processes of each single search, and the batch runs serially",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Trials per work unit in parallel mode (default: ~4 chunks per worker)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Append to an existing --out file and skip (start_state, heuristic) runs already in it "
+             "(use the same --seed/--trials as the interrupted run)",
+    )
+    parser.add_argument(
+        "--depths",
+        type=str,
+        default=None,
+        help="Sample start states by exact solution depth instead of uniformly, e.g. "
+             "'4,8,12-16' (--trials states per depth) or '20:50' (50 states at depth 20); "
+             "the summary is then reported per heuristic and depth",
+    )
+    parser.add_argument(
+        "--max-expanded",
+        type=int,
+        default=None,
+        help="Stop a single search after this many expansions (status node_limit)",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=None,
+        help="Wall-clock limit per search in seconds (status timeout)",
+    )
+    parser.add_argument(
+        "--max-nodes",
+        type=int,
+        default=None,
+        help="Not for idastar/hda: stop when the stored states exceed this (status memory_limit)",
+    )
+    parser.add_argument(
+        "--instrument",
+        action="store_true",
+        help="Record search counters (generated, stale pops, reopenings, peak open/closed, "
+             "h calls and time, branching factor) in the raw CSV and summary",
+    )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        default=None,
+        help="A* only, serial only, integer --weight only: append a per-f-layer expansion histogram of every search "
+             "to this binary trace file (see src/hooks.py)",
+    )
 
     args = parser.parse_args(argv)
 
     rng = random.Random(args.seed)
 
-    heuristics = {
-        "Hamming": hamming,
-        "Manhattan": manhattan,
-    }
+    try:
+        heuristics = select_heuristics((args.heuristics or DEFAULT_HEURISTICS).split(","))
+    except ValueError as e:
+        parser.error(str(e))
 
-    print(f"Generating {args.trials} random solvable states (seed={args.seed})…")
-    trials = generate_trials(args.trials, rng)
+    rows, cols = args.size
+    if args.size != (3, 3):
+        if args.depths:
+            parser.error("--depths needs the exact-distance table, which only exists for --size 3")
+        board = get_board(rows, cols)
+        for name, fn in list(heuristics.items()):
+            try:
+                for_board(fn, board)   # PDB/Perfect haben nicht für jede Größe Tabellen
+            except ValueError as e:
+                if args.heuristics is not None:
+                    parser.error(f"{name}: {e}")
+                print(f"Skipping {name}: {e}")   # nur aus dem Default → weglassen statt abbrechen
+                del heuristics[name]
 
-    print("Running A* search with both heuristics…")
-    results = run_batch(trials, heuristics)
-
-    print("Computing summary statistics…")
-    summary_rows = summarize(results)
+    if args.depths:
+        try:
+            per_depth = parse_depth_spec(args.depths, args.trials)
+        except ValueError as e:
+            parser.error(f"invalid --depths: {e}")
+        print(f"Generating {sum(per_depth.values())} states at depths {sorted(per_depth)} (seed={args.seed})…")
+        trials = generate_trials_by_depth(per_depth, rng)
+    else:
+        print(f"Generating {args.trials} random solvable {rows}x{cols} states (seed={args.seed})…")
+        trials = generate_trials(args.trials, rng, size=args.size)
 
+    print(f"Running {args.algorithm} search with {', '.join(heuristics)}…")
+    # Solver-specific options (open lists only exist for A* and the bidirectional search)
+    has_open_list = args.algorithm in ("astar", "bidir")
+    search_kwargs = {"open_list": args.open_list} if has_open_list else {}
+    # Only depth ends up in the CSVs → no parent pointers or solution paths needed
+    search_kwargs["store_path"] = False
+    # Per-search budgets: a stopped search is recorded with its status (unsolved, except
+    # arastar, which keeps its best solution so far)
+    if args.max_expanded is not None:
+        search_kwargs["max_expanded"] = args.max_expanded
+    if args.time_limit is not None:
+        search_kwargs["time_limit"] = args.time_limit
+    if args.max_nodes is not None:
+        if args.algorithm == "idastar":
+            parser.error("--max-nodes does not apply to --algorithm idastar (it stores no states)")
+        if args.algorithm == "hda":
+            parser.error("--max-nodes does not apply to --algorithm hda (states are spread over processes)")
+        search_kwargs["max_nodes"] = args.max_nodes
+    if args.weight is not None:
+        if args.algorithm not in ("astar", "arastar"):
+            parser.error("--weight only applies to --algorithm astar or arastar")
+        if args.weight < 1:
+            parser.error("--weight must be at least 1")
+        if search_kwargs.get("open_list") == "bucket" and not args.weight.is_integer():
+            parser.error("--open-list bucket needs an integer --weight")
+        if args.trace and not args.weight.is_integer():
+            parser.error("--trace needs an integer --weight (trace files store integer f-layers)")
+        search_kwargs["weight"] = args.weight
+    if args.instrument:
+        search_kwargs["instrument"] = True
+    batch_workers = args.workers
+    if args.algorithm == "hda":
+        # Die Prozesse arbeiten an einer Suche zusammen → Trials nacheinander
+        search_kwargs["workers"] = args.workers
+        batch_workers = 1
+    tracer = None
+    if args.trace:
+        if args.algorithm != "astar" or args.workers != 1:
+            parser.error("--trace needs --algorithm astar and --workers 1")
+        os.makedirs(os.path.dirname(args.trace) or ".", exist_ok=True)
+        tracer = search_kwargs["hooks"] = FLayerTracer(args.trace, shape=args.size)
     # ensure output directory exists
-    os.makedirs(os.path.dirname(args.out), exist_ok=True)
-    os.makedirs(os.path.dirname(args.summary), exist_ok=True)
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    os.makedirs(os.path.dirname(args.summary) or ".", exist_ok=True)
+
+    # Stream results straight into the CSV and the summary accumulator:
+    # nothing is kept in memory per trial, and completed rows survive a crash.
+    accumulator = SummaryAccumulator(by_depth=bool(args.depths))
+    with ResultWriter(args.out, append=args.resume) as writer:
+        skip = None
+        if args.resume:
+            # Rows already on disk count towards the summary and are not recomputed
+            skip = Counter()
+            for row in read_results_csv(args.out):
+                skip[(row.start_state, row.heuristic)] += 1
+                accumulator.add(row)
+            print(f"Resuming: {sum(skip.values())} runs already in {args.out}, skipping them…")
 
-    save_csv(results, args.out)
+        for res in iter_batch(
+            trials,
+            heuristics,
+            args.algorithm,
+            search_kwargs,
+            workers=batch_workers,
+            chunksize=args.chunksize,
+            skip=skip,
+        ):
+            writer.write(res)
+            accumulator.add(res)
+    if tracer is not None:
+        tracer.close()
+        print(f"Traced {tracer.searches} searches to {args.trace}")
+
+    print("Computing summary statistics…")
+    summary_rows = accumulator.rows()
     save_summary_csv(summary_rows, args.summary)
 
     print("\n=== Experiment Summary ===")
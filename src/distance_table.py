@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import mmap
+import os
+import time
+from array import array
+from typing import List, Optional, Sequence
+
+from .state import PuzzleState, GOAL, GOAL_CODE, GOAL_BLANK, LazyPath, packed_neighbors, unpack_tiles
+from .ranking import N_STATES, rank_tiles
+from .search import SearchResult
+
+# ------------------------- Exakte Distanztabelle -----------------------------
+# Das 8-Puzzle hat nur 181440 lösbare Zustände. Eine einmalige Rückwärts-BFS vom
+# Ziel speichert für jeden Zustand die exakte Distanz (1 Byte, Index = Rank).
+# Die Tabelle wird auf Platte gecacht und per mmap geladen, sodass mehrere
+# Prozesse dieselben Speicherseiten teilen.
+
+MAGIC = b"8PZDIST1"          # Dateikennung + Formatversion
+HEADER_SIZE = len(MAGIC)
+UNSEEN = 0xFF                # Markierung für "noch nicht erreicht" während der BFS
+
+# Standardort des Caches: <repo>/data/distances_3x3.bin
+DEFAULT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "distances_3x3.bin"
+)
+
+
+# ------------------------------- Builder -------------------------------------
+
+def build_distance_table() -> bytearray:
+    """
+    Run a backward BFS from GOAL and return a bytearray `d` with
+    d[rank(s)] = exact number of moves from s to GOAL, for every solvable s.
+    """
+    table = bytearray([UNSEEN]) * N_STATES
+    table[rank_tiles(GOAL)] = 0
+
+    # Schichtweise BFS auf gepackten Boards: (code, blank, parent_blank)
+    frontier = [(GOAL_CODE, GOAL_BLANK, -1)]
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for code, blank, parent_blank in frontier:
+            for child, child_blank, _ in packed_neighbors(code, blank, parent_blank):
+                r = rank_tiles(unpack_tiles(child))
+                if table[r] == UNSEEN:
+                    table[r] = depth
+                    next_frontier.append((child, child_blank, blank))
+        frontier = next_frontier
+    return table
+
+
+def save_distance_table(table: Sequence[int], path: str = DEFAULT_PATH) -> None:
+    """Write the table (with header) atomically to `path`."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(bytes(table))
+    os.replace(tmp, path)  # andere Prozesse sehen nie eine halb geschriebene Datei
+
+
+# -------------------------------- Loader -------------------------------------
+
+def load_distance_table(path: str = DEFAULT_PATH, build: bool = True) -> memoryview:
+    """
+    Memory-map the cached table at `path` and return a read-only view
+    indexed by rank. If the file is missing and `build` is True, the table
+    is built and cached first.
+    """
+    if not os.path.exists(path):
+        if not build:
+            raise FileNotFoundError(path)
+        save_distance_table(build_distance_table(), path)
+
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mm[:HEADER_SIZE] != MAGIC or len(mm) != HEADER_SIZE + N_STATES:
+        mm.close()
+        raise ValueError(f"{path} is not a valid 8-puzzle distance table")
+    return memoryview(mm)[HEADER_SIZE:]
+
+
+_table: Optional[memoryview] = None
+
+
+def get_distance_table() -> memoryview:
+    """Return the process-wide table, loading (or building) the default cache once."""
+    global _table
+    if _table is None:
+        _table = load_distance_table()
+    return _table
+
+
+# --------------------------- Zustände nach Tiefe --------------------------------
+
+def ranks_by_depth(table: Optional[Sequence[int]] = None) -> List[array]:
+    """
+    Group all ranks by exact solution depth: result[d] is an array('I') of the
+    ranks of every state exactly d moves from GOAL (d = 0 .. max depth).
+    """
+    if table is None:
+        table = get_distance_table()
+    buckets: List[array] = []
+    for r, d in enumerate(table):
+        while len(buckets) <= d:
+            buckets.append(array("I"))
+        buckets[d].append(r)
+    return buckets
+
+
+# ------------------------- Perfekte Heuristik --------------------------------
+
+def perfect(s: PuzzleState) -> int:
+    """Exact distance to GOAL (a perfect heuristic: A* expands only the solution path)."""
+    return get_distance_table()[rank_tiles(s.tiles)]
+
+
+def _perfect_for_board(board):
+    # Siehe heuristics.for_board(): exakte Distanzen gibt es nur für das 3x3-Board
+    raise ValueError(f"the distance table only exists for the 3x3 board, not {board}")
+
+
+perfect.for_board = _perfect_for_board  # type: ignore[attr-defined]
+
+
+# --------------------------- Lösen per Abstieg --------------------------------
+
+def solve_by_descent(start: PuzzleState, table: Optional[Sequence[int]] = None) -> SearchResult:
+    """
+    Return an optimal solution without search: from `start`, always step to a
+    neighbour whose exact distance is one smaller. Costs O(depth) table lookups.
+    """
+    t0 = time.perf_counter()
+    if table is None:
+        table = get_distance_table()
+
+    current = start
+    d = table[rank_tiles(current.tiles)]
+    letters: List[str] = []
+    while d > 0:
+        for ns, action, _ in current.neighbors():
+            if table[rank_tiles(ns.tiles)] == d - 1:  # dieser Nachbar liegt auf einem optimalen Weg
+                current = ns
+                letters.append(action[0])   # Zugbuchstabe wie in state.MOVE_LETTERS
+                break
+        d -= 1
+    moves = "".join(letters)
+
+    return SearchResult(
+        solved=True,
+        depth=len(moves),
+        expanded=len(moves),  # pro Zug wird genau ein Zustand erweitert
+        runtime_s=time.perf_counter() - t0,
+        heuristic="Descent",
+        start_state=start.tiles,
+        path=LazyPath(start, moves),
+        moves=moves,
+    )
+
+
+# ------------------------------ Self-test ------------------------------------
+
+if __name__ == "__main__":
+    t0 = time.perf_counter()
+    table = load_distance_table()
+    print(f"Loaded {len(table)} distances in {time.perf_counter() - t0:.2f}s, max depth = {max(table)}")
+    res = solve_by_descent(PuzzleState((8, 6, 7, 2, 5, 4, 3, 0, 1)), table)
+    print(f"Descent: depth={res.depth}, time={res.runtime_s:.6f}s")
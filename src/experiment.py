@@ -1,166 +1,596 @@
 from __future__ import annotations
 
-from typing import Callable, Dict, Iterable, List, Tuple
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple
 import csv
+import os
 import random
-import statistics as stats
 
 from .state import PuzzleState
-from .utils import random_solvable_state
-from . import search
-from .heuristics import hamming, manhattan
+from .utils import BoardSize, random_solvable_states
+from .metrics import QuantileSketch, RunningStats
+from . import search, parallel_search
+from .search import STATS_FIELDS, SearchStats
+from .heuristics import hamming, manhattan, linear_conflict, zero_heuristic
+from .distance_table import perfect, get_distance_table, ranks_by_depth
+from .ranking import rank_tiles, unrank_batch
+from .pattern_db import pdb
 
 
 HeuristicMap = Dict[str, Callable[[PuzzleState], int]]
 
+# All heuristics selectable by name (e.g. from run_experiments.py --heuristics).
+AVAILABLE_HEURISTICS: HeuristicMap = {
+    "Hamming": hamming,
+    "Manhattan": manhattan,
+    "LinearConflict": linear_conflict,
+    "PDB": pdb,  # additive disjoint pattern databases (4-4), cached under data/
+    "Zero": zero_heuristic,
+    "Perfect": perfect,  # exact distances; builds/loads the cached table on first use
+}
+
+
+# Search algorithms selectable by name (e.g. from run_experiments.py --algorithm).
+# All of them take (start, heuristic) and return a search.SearchResult.
+ALGORITHMS = {
+    "astar": search.a_star,
+    "idastar": search.ida_star,
+    "bidir": search.bidirectional,
+    "arastar": search.ara_star,
+    "hda": parallel_search.hda_star,   # parallel within one search (search_kwargs["workers"])
+}
+
+
+def select_heuristics(names: Iterable[str]) -> HeuristicMap:
+    """
+    Build a HeuristicMap from display names (case-insensitive, in the given order).
+    Raises ValueError for unknown names.
+    """
+    by_lower = {k.lower(): k for k in AVAILABLE_HEURISTICS}
+    selected: HeuristicMap = {}
+    for name in names:
+        key = by_lower.get(name.strip().lower())
+        if key is None:
+            raise ValueError(
+                f"unknown heuristic {name!r}; choose from {', '.join(AVAILABLE_HEURISTICS)}"
+            )
+        selected[key] = AVAILABLE_HEURISTICS[key]
+    return selected
+
 
 # ------------------------------- Trial gen -----------------------------------
 
-def generate_trials(n: int, rng: random.Random) -> List[PuzzleState]:
+def generate_trials(n: int, rng: random.Random, size: BoardSize = 3) -> List[PuzzleState]:
     """
     Generate `n` solvable random start states using a provided RNG.
     """
     # Function signature:
     # - n: how many random start states to generate
     # - rng: a random.Random instance (so you can control the seed for reproducibility)
+    # - size: board width (3 = 8-puzzle, 4 = 15-puzzle, 5 = 24-puzzle) or (rows, cols), e.g. (3, 4)
     # Returns: a list of PuzzleState objects
 
-    return [random_solvable_state(rng) for _ in range(n)]
+    return random_solvable_states(rng, n, size=size)
 
-    # Uses a list comprehension to call random_solvable_state(rng) n times.
-    # Each call returns a new solvable PuzzleState.
+    # Draws n uniform random ranks of solvable states and unranks them in one batch.
+    # Each entry is a new solvable PuzzleState (never the goal itself).
     # The resulting list of PuzzleState objects is returned.
 
 
+def generate_trials_by_depth(
+    per_depth: Mapping[int, int],
+    rng: random.Random,
+) -> List[PuzzleState]:
+    """
+    Generate start states with a requested exact-depth distribution.
+
+    `per_depth` maps solution depth -> number of states (e.g. {4: 10, 20: 10}).
+    States are drawn uniformly among all states of that exact depth, using the
+    exact-distance table (built/loaded on first use). Depths with fewer states
+    than requested are sampled with replacement. Output is grouped by depth in
+    ascending order.
+    """
+    buckets = ranks_by_depth()
+    trials: List[PuzzleState] = []
+    for depth in sorted(per_depth):
+        count = per_depth[depth]
+        if not 0 <= depth < len(buckets):
+            raise ValueError(f"no 8-puzzle states at depth {depth} (max depth is {len(buckets) - 1})")
+        bucket = buckets[depth]
+        if count <= len(bucket):
+            ranks = rng.sample(range(len(bucket)), count)   # without replacement
+        else:
+            ranks = rng.choices(range(len(bucket)), k=count)  # e.g. depth 1 has only 2 states
+        trials.extend(unrank_batch(bucket[i] for i in ranks))
+    return trials
+
+
+def parse_depth_spec(spec: str, default_count: int) -> Dict[int, int]:
+    """
+    Parse a depth specification like "2,4,10-12,20:50".
+
+    Each item is a depth or an inclusive depth range, optionally followed by
+    ":count"; items without a count get `default_count` states per depth.
+    """
+    per_depth: Dict[int, int] = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        depths, _, count = item.partition(":")
+        lo, _, hi = depths.partition("-")
+        n = int(count) if count else default_count
+        for d in range(int(lo), int(hi or lo) + 1):
+            per_depth[d] = n
+    return per_depth
+
+
 # ------------------------------- Single run ----------------------------------
 
-def run_trial(start: PuzzleState, heuristic_fn: Callable[[PuzzleState], int]):
+def run_trial(
+    start: PuzzleState,
+    heuristic_fn: Callable[[PuzzleState], int],
+    algorithm: str = "astar",
+    search_kwargs: Optional[Mapping[str, Any]] = None,
+):
     """
-    Run A* for a single (start, heuristic) pair and return the SearchResult
-    produced by search.a_star(). We don't depend on a specific class path;
-    we only expect the result to expose attributes used by summarize()/CSV.
+    Run the selected search algorithm (see ALGORITHMS; A* by default) for a
+    single (start, heuristic) pair and return the SearchResult it produces.
+    `search_kwargs` are passed on to the solver (e.g. {"open_list": "bucket"}).
+    We don't depend on a specific class path; we only expect the result to
+    expose attributes used by summarize()/CSV.
     """
 
-    return search.a_star(start, heuristic_fn)
-    # Calls the A* search algorithm with the given start state and heuristic function.
-    # Returns whatever SearchResult-like object search.a_star produces.
+    return ALGORITHMS[algorithm](start, heuristic_fn, **(search_kwargs or {}))
+    # Calls the chosen search algorithm with the given start state and heuristic function.
+    # Returns whatever SearchResult-like object the solver produces.
 
 
 # ------------------------------ Batch runner ---------------------------------
 
-def run_batch(trials: List[PuzzleState], heuristics: HeuristicMap):
+def run_batch(
+    trials: List[PuzzleState],
+    heuristics: HeuristicMap,
+    algorithm: str = "astar",
+    search_kwargs: Optional[Mapping[str, Any]] = None,
+    workers: int = 1,
+    chunksize: Optional[int] = None,
+):
+    """
+    Evaluate every heuristic on every trial with the given algorithm
+    (and solver options `search_kwargs`). Returns a list of SearchResult objects.
+
+    This collects everything in memory; for large runs use iter_batch() and
+    stream the results into a ResultWriter / SummaryAccumulator instead.
+    """
+    return list(iter_batch(trials, heuristics, algorithm, search_kwargs, workers, chunksize))
+
+
+def iter_batch(
+    trials: List[PuzzleState],
+    heuristics: HeuristicMap,
+    algorithm: str = "astar",
+    search_kwargs: Optional[Mapping[str, Any]] = None,
+    workers: int = 1,
+    chunksize: Optional[int] = None,
+    skip: Optional[Mapping[Tuple[Tuple[int, ...], str], int]] = None,
+) -> Iterator:
     """
-    Evaluate every heuristic on every trial. Returns a list of SearchResult objects.
+    Generator version of run_batch(): yields SearchResults one by one, in
+    trial order, as soon as they are available.
+
+    With workers > 1 (or workers=0 for one per CPU) the trials are split into
+    chunks of `chunksize` trials and evaluated in a process pool. Results come
+    back in the same order as the serial run; only runtime_s differs.
+
+    `skip` maps (start_state, heuristic name) to how many of those runs are
+    already done (e.g. counted from read_results_csv() when resuming); that
+    many occurrences are skipped.
     """
+    work = _plan_work(trials, heuristics, skip)
+    if not work:
+        return
+
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(work) <= 1:
+        for item in work:
+            yield from _run_chunk([item], heuristics, algorithm, search_kwargs)
+        return
+
+    # Default: about four chunks per worker, so slow chunks don't leave workers idle.
+    if chunksize is None:
+        chunksize = max(1, len(work) // (workers * 4))
+    chunks = [work[i:i + chunksize] for i in range(0, len(work), chunksize)]
+
+    # Warm up every heuristic once in the parent so cached tables (distance table,
+    # pattern databases) are built before the pool starts, not once per worker.
+    for fn in heuristics.values():
+        fn(work[0][0])
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # pool.map yields chunk results in submission order -> deterministic output
+        for part in pool.map(
+            _run_chunk,
+            chunks,
+            repeat(heuristics),
+            repeat(algorithm),
+            repeat(search_kwargs),
+        ):
+            yield from part
+
+
+def _plan_work(
+    trials: List[PuzzleState],
+    heuristics: HeuristicMap,
+    skip: Optional[Mapping[Tuple[Tuple[int, ...], str], int]],
+) -> List[Tuple[PuzzleState, Tuple[str, ...]]]:
+    """List of (start, heuristic names still to run), in trial order."""
+    if not skip:
+        names = tuple(heuristics)
+        return [(start, names) for start in trials]
+
+    remaining = Counter(skip)  # consumed in trial order, so duplicate trials are handled
+    work = []
+    for start in trials:
+        todo = []
+        for name in heuristics:
+            key = (start.tiles, name)
+            if remaining[key] > 0:
+                remaining[key] -= 1
+            else:
+                todo.append(name)
+        if todo:
+            work.append((start, tuple(todo)))
+    return work
+
+
+def _run_chunk(
+    work: List[Tuple[PuzzleState, Tuple[str, ...]]],
+    heuristics: HeuristicMap,
+    algorithm: str,
+    search_kwargs: Optional[Mapping[str, Any]],
+):
+    """Serial work unit: the listed heuristics on every trial of one chunk."""
     results = []  # Initialize an empty list to collect all search results.
-    for start in trials: # Loop over every starting state in the list of trials.
-        for name, fn in heuristics.items(): # For each trial, loop over every (heuristic name, heuristic function) pair.
-            res = run_trial(start, fn)
-            # Run A* on this (start, heuristic) combination.
+    for start, names in work: # Loop over every starting state in this chunk.
+        for name in names: # For each trial, loop over the heuristic names still to run.
+            res = run_trial(start, heuristics[name], algorithm, search_kwargs)
+            # Run the search on this (start, heuristic) combination.
             # res is the SearchResult returned by run_trial.
 
             # Ensure the heuristic name is set (a_star already sets it from fn.__name__)
             # but we enforce the display name provided by the dict key if they differ.
-            if res.heuristic.lower() != name.lower():
+            if res.heuristic != name:
                 # Create a shallow patched object (res is a dataclass in search.py)
                 # Direct assignment is fine; dataclass is not frozen.
                 res.heuristic = name
             results.append(res) # Append this SearchResult to the overall results list.
     return results
-# Return the full list of SearchResult objects for all (trial, heuristic) pairs.
+# Return the full list of SearchResult objects for this chunk.
 
 
 # ------------------------------ Summarization --------------------------------
 
+# Percentiles reported for expanded nodes and runtime in every summary row
+SUMMARY_QUANTILES = (("p50", 0.50), ("p90", 0.90), ("p99", 0.99))
+
+SUMMARY_FIELDS = [
+    "heuristic",
+    "n_runs",
+    "mean_expanded",
+    "std_expanded",
+    "p50_expanded",
+    "p90_expanded",
+    "p99_expanded",
+    "max_expanded",
+    "mean_time_s",
+    "std_time_s",
+    "p50_time_s",
+    "p90_time_s",
+    "p99_time_s",
+    "max_time_s",
+    "mean_depth_if_solved",
+    "solve_rate",
+]
+
+# Extra summary columns for instrumented runs (search_kwargs={"instrument": True})
+INSTRUMENT_SUMMARY_FIELDS = [f"mean_{name}" for name in STATS_FIELDS]
+
+
+class _HeuristicSummary:
+    """Streaming statistics of one heuristic (O(1) memory apart from the sketches)."""
+
+    def __init__(self) -> None:
+        self.expanded = RunningStats()
+        self.runtime_s = RunningStats()
+        self.depth = RunningStats()          # solved runs only
+        self.expanded_q = QuantileSketch()
+        self.runtime_q = QuantileSketch()
+        self.stats: Dict[str, RunningStats] = {}   # instrumented runs only (SearchStats fields)
+
+    def add_stats(self, stats: SearchStats) -> None:
+        for name in STATS_FIELDS:
+            self.stats.setdefault(name, RunningStats()).add(getattr(stats, name))
+
+    def merge(self, other: "_HeuristicSummary") -> None:
+        self.expanded.merge(other.expanded)
+        self.runtime_s.merge(other.runtime_s)
+        self.depth.merge(other.depth)
+        self.expanded_q.merge(other.expanded_q)
+        self.runtime_q.merge(other.runtime_q)
+        for name, rs in other.stats.items():
+            self.stats.setdefault(name, RunningStats()).merge(rs)
+
+
+class SummaryAccumulator:
+    """
+    Streaming per-heuristic summary of a stream of results.
+
+    Mean/stddev are updated with Welford's method and percentiles come from a
+    mergeable QuantileSketch (1% relative error), so memory does not grow with
+    the number of trials and results can be discarded right after add().
+    Accumulators from different workers can be combined with merge().
+
+    With by_depth=True every (heuristic, depth) pair gets its own row (extra
+    "depth" column), to see how cost scales with depth. The depth is the exact
+    distance of the start state (the depth generate_trials_by_depth() sampled
+    it at), so runs stopped by a budget stay in their group; 8-puzzle only.
+    """
+
+    def __init__(self, by_depth: bool = False) -> None:
+        self.by_depth = by_depth
+        # key: heuristic name, or (heuristic name, depth) with by_depth
+        self._by_h: Dict[Any, _HeuristicSummary] = {}
+
+    def _group(self, key) -> _HeuristicSummary:
+        group = self._by_h.get(key)
+        if group is None:
+            group = self._by_h[key] = _HeuristicSummary()
+        return group
+
+    def add(self, r) -> None:
+        group = self._group((r.heuristic, _sampled_depth(r.start_state)) if self.by_depth else r.heuristic)
+        group.expanded.add(r.expanded)
+        group.runtime_s.add(r.runtime_s)
+        group.expanded_q.add(r.expanded)
+        group.runtime_q.add(r.runtime_s)
+        if r.solved:
+            group.depth.add(r.depth)
+        stats = getattr(r, "stats", None)
+        if stats is not None:
+            group.add_stats(stats)
+
+    def merge(self, other: "SummaryAccumulator") -> None:
+        if other.by_depth != self.by_depth:
+            raise ValueError("cannot merge accumulators with different by_depth settings")
+        for key, group in other._by_h.items():
+            self._group(key).merge(group)
+
+    def rows(self) -> List[Dict[str, float]]:
+        """Summary rows (columns SUMMARY_FIELDS), sorted by heuristic name (and depth)."""
+        rows = []
+        for key, group in self._by_h.items():
+            n = group.expanded.count
+            row = {"heuristic": key[0], "depth": key[1]} if self.by_depth else {"heuristic": key}
+            row.update({
+                "n_runs": n,
+                "mean_expanded": group.expanded.mean,
+                "std_expanded": group.expanded.stdev,
+            })
+            for label, q in SUMMARY_QUANTILES:
+                row[f"{label}_expanded"] = group.expanded_q.quantile(q)
+            row["max_expanded"] = group.expanded.max
+            row["mean_time_s"] = group.runtime_s.mean
+            row["std_time_s"] = group.runtime_s.stdev
+            for label, q in SUMMARY_QUANTILES:
+                row[f"{label}_time_s"] = group.runtime_q.quantile(q)
+            row["max_time_s"] = group.runtime_s.max
+            row["mean_depth_if_solved"] = group.depth.mean if group.depth.count else 0.0
+            row["solve_rate"] = group.depth.count / n
+            for name, rs in group.stats.items():
+                row[f"mean_{name}"] = rs.mean
+            rows.append(row)
+        # Stable order: alphabetical by heuristic name, then by depth
+        rows.sort(key=lambda r: (r["heuristic"], r.get("depth", 0)))
+        return rows
+
+
+def _sampled_depth(start_state: Tuple[int, ...]) -> int:
+    # Exakte Distanz des Starts = Tiefe, für die er gezogen wurde (nicht r.depth:
+    # abgebrochene Läufe haben depth 0)
+    return get_distance_table()[rank_tiles(start_state)]
+
+
 def summarize(results) -> List[Dict[str, float]]:
     """
-    Compute mean/stddev per heuristic for expanded nodes and runtime (seconds).
-    Also reports mean solution depth to verify comparable difficulty.
-    """
-    by_h: Dict[str, List] = {} # Dictionary mapping heuristic name -> list of SearchResult objects using that heuristic.
-    for r in results: 
-        by_h.setdefault(r.heuristic, []).append(r)
-
-        # Ensure a list exists for the heuristic name r.heuristic in by_h.
-        # Then append this result r to that list.
-        # setdefault(k, []) returns the existing list for k, or adds and returns [] if missing.
-
-    rows = []
-    for hname, group in by_h.items():
-        expanded_vals = [r.expanded for r in group]
-        time_vals = [r.runtime_s for r in group]
-        depth_vals = [r.depth for r in group if r.solved]
-
-        row = {
-            "heuristic": hname,
-            "n_runs": len(group),
-            "mean_expanded": stats.mean(expanded_vals),
-            "std_expanded": (stats.stdev(expanded_vals) if len(expanded_vals) > 1 else 0.0),
-            "mean_time_s": stats.mean(time_vals),
-            "std_time_s": (stats.stdev(time_vals) if len(time_vals) > 1 else 0.0),
-            "mean_depth_if_solved": (stats.mean(depth_vals) if depth_vals else 0.0),
-            "solve_rate": sum(1 for r in group if r.solved) / len(group),
-        }
-        rows.append(row)
-    # Stable order: Manhattan then Hamming if both are present
-    order = {name: i for i, name in enumerate(sorted([r["heuristic"] for r in rows]))}
-    rows.sort(key=lambda r: order[r["heuristic"]])
-    return rows
+    Compute mean/stddev and p50/p90/p99/max per heuristic for expanded nodes
+    and runtime (seconds). Also reports mean solution depth to verify
+    comparable difficulty. Instrumented results (SearchResult.stats) add the
+    mean of every SearchStats counter (INSTRUMENT_SUMMARY_FIELDS).
+    Accepts any iterable of results (a list or a stream from iter_batch()).
+    """
+    acc = SummaryAccumulator()
+    for r in results:
+        acc.add(r)
+    return acc.rows()
 
 
 # ------------------------------- CSV writers ---------------------------------
 
+RESULT_FIELDS = [
+    "trial", "heuristic", "solved", "status", "depth", "expanded", "runtime_s", "start_state", *STATS_FIELDS,
+]
+
+
+class ResultRow(NamedTuple):
+    """One raw result read back from a results CSV (same fields SummaryAccumulator uses)."""
+
+    heuristic: str
+    solved: bool
+    depth: int
+    expanded: int
+    runtime_s: float
+    start_state: Tuple[int, ...]
+    status: str = ""
+    stats: Optional[SearchStats] = None
+
+
+def read_results_csv(path: str) -> Iterator[ResultRow]:
+    """
+    Stream the rows of a results CSV written by ResultWriter.
+    A truncated last row (e.g. from a crashed run) is skipped.
+    """
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                yield ResultRow(
+                    heuristic=row["heuristic"],
+                    solved=bool(int(row["solved"])),
+                    depth=int(row["depth"]),
+                    expanded=int(row["expanded"]),
+                    runtime_s=float(row["runtime_s"]),
+                    start_state=tuple(int(v) for v in row["start_state"].split()),
+                    status=row["status"],
+                    stats=_parse_stats(row),
+                )
+            except (KeyError, TypeError, ValueError):
+                continue  # incomplete row at the end of a crashed run
+
+
+def _parse_stats(row: Dict[str, str]) -> Optional[SearchStats]:
+    # Instrumentation columns are empty for runs without instrument=True
+    if not row.get(STATS_FIELDS[0]):
+        return None
+    # The dataclass defaults (0 or 0.0) tell whether a column is an int or a float
+    return SearchStats(**{
+        name: type(getattr(SearchStats, name))(row[name]) for name in STATS_FIELDS
+    })
+
+
+class ResultWriter:
+    """
+    Streaming CSV writer for raw per-trial results.
+
+    Rows are written as results arrive and the file is flushed every
+    `flush_every` rows, so a crashed run still leaves its completed rows on disk.
+    With append=True an existing file is continued (trial numbers carry on and
+    a truncated last line is dropped) instead of being overwritten.
+    Use as a context manager:
+
+        with ResultWriter(path) as w:
+            for r in iter_batch(...):
+                w.write(r)
+    """
+
+    def __init__(self, path: str, flush_every: int = 100, append: bool = False) -> None:
+        self.path = path
+        self.flush_every = flush_every
+        self.rows_written = 0
+        if append and os.path.exists(path) and os.path.getsize(path) > 0:
+            self.rows_written = _prepare_append(path)
+            self._f = open(path, "a", newline="")
+            self._w = csv.DictWriter(self._f, fieldnames=RESULT_FIELDS)
+        else:
+            self._f = open(path, "w", newline="")
+            self._w = csv.DictWriter(self._f, fieldnames=RESULT_FIELDS)
+            self._w.writeheader()
+
+    def write(self, r) -> None:
+        self.rows_written += 1
+        self._w.writerow({
+            "trial": self.rows_written,
+            "heuristic": r.heuristic,
+            "solved": int(bool(r.solved)),
+            "status": getattr(r, "status", "") or ("solved" if r.solved else "exhausted"),
+            "depth": r.depth,
+            "expanded": r.expanded,
+            "runtime_s": f"{r.runtime_s:.6f}",
+            "start_state": " ".join(map(str, r.start_state)),
+            **_stats_columns(getattr(r, "stats", None)),
+        })
+        if self.rows_written % self.flush_every == 0:
+            self._f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _stats_columns(stats: Optional[SearchStats]) -> Dict[str, Any]:
+    if stats is None:
+        return {}
+    row = {name: getattr(stats, name) for name in STATS_FIELDS}
+    row["h_time_s"] = f"{stats.h_time_s:.6f}"
+    row["branching_factor"] = f"{stats.branching_factor:.4f}"
+    return row
+
+
+def _prepare_append(path: str) -> int:
+    """
+    Check the header of an existing results CSV, cut off a partial last line
+    and return the number of data rows already in the file.
+    """
+    with open(path, "r+b") as f:
+        data = f.read()
+        header = data.split(b"\n", 1)[0].decode().strip()
+        if header.split(",") != RESULT_FIELDS:
+            raise ValueError(f"{path} has columns {header!r}, expected {','.join(RESULT_FIELDS)}")
+        if not data.endswith(b"\n"):
+            # Crash mid-row: drop the incomplete tail so appended rows start on a fresh line
+            f.truncate(data.rfind(b"\n") + 1)
+            data = data[: data.rfind(b"\n") + 1]
+    return max(0, data.count(b"\n") - 1)
+
+
 def save_csv(results, path: str) -> None:
     """
-    Write raw per-trial results to CSV.
+    Write raw per-trial results to CSV (any iterable; rows are streamed).
 
     Columns:
-    trial, heuristic, solved, depth, expanded, runtime_s, start_state
+    trial, heuristic, solved, status, depth, expanded, runtime_s, start_state,
+    then the SearchStats counters (empty unless the search was instrumented)
+    (status: solved / exhausted / node_limit / timeout / memory_limit)
     """
-    fieldnames = ["trial", "heuristic", "solved", "depth", "expanded", "runtime_s", "start_state"]
-    with open(path, "w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        # Create a trial index per (heuristic) group for readability
-        trial_idx = 0
-        for i, r in enumerate(results, start=1):
-            # Make a simple rolling trial id that resets for each pair if needed later
-            w.writerow({
-                "trial": i,
-                "heuristic": r.heuristic,
-                "solved": int(bool(r.solved)),
-                "depth": r.depth,
-                "expanded": r.expanded,
-                "runtime_s": f"{r.runtime_s:.6f}",
-                "start_state": " ".join(map(str, r.start_state)),
-            })
+    with ResultWriter(path) as w:
+        for r in results:
+            w.write(r)
 
 
 def save_summary_csv(rows: List[Dict[str, float]], path: str) -> None:
     """
     Write aggregated summary stats to CSV.
 
-    Columns:
-    heuristic, n_runs, mean_expanded, std_expanded, mean_time_s, std_time_s,
-    mean_depth_if_solved, solve_rate
-    """
-    fieldnames = [
-        "heuristic",
-        "n_runs",
-        "mean_expanded",
-        "std_expanded",
-        "mean_time_s",
-        "std_time_s",
-        "mean_depth_if_solved",
-        "solve_rate",
-    ]
+    Columns (SUMMARY_FIELDS):
+    heuristic, n_runs, mean/std/p50/p90/p99/max of expanded,
+    mean/std/p50/p90/p99/max of time_s, mean_depth_if_solved, solve_rate
+    (+ INSTRUMENT_SUMMARY_FIELDS for instrumented runs)
+    """
     with open(path, "w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
+        w = csv.DictWriter(f, fieldnames=_summary_fields(rows))
         w.writeheader()
         for r in rows:
             w.writerow(r)
 
 
+def _summary_fields(rows: List[Dict[str, float]]) -> List[str]:
+    # Per-depth summaries carry an extra "depth" column right after the heuristic
+    fields = SUMMARY_FIELDS
+    if rows and "depth" in rows[0]:
+        fields = SUMMARY_FIELDS[:1] + ["depth"] + SUMMARY_FIELDS[1:]
+    # Instrumentation columns only if at least one group was instrumented
+    if any(INSTRUMENT_SUMMARY_FIELDS[0] in r for r in rows):
+        fields = fields + INSTRUMENT_SUMMARY_FIELDS
+    return fields
+
+
 # ------------------------------- Pretty print --------------------------------
 
 def format_summary_table(rows: List[Dict[str, float]]) -> str:
@@ -177,13 +607,14 @@ def format_summary_table(rows: List[Dict[str, float]]) -> str:
         )
     except Exception:
         # Fallback monospace table
-        headers = ["heuristic", "n_runs", "mean_expanded", "std_expanded",
-                   "mean_time_s", "std_time_s", "mean_depth_if_solved", "solve_rate"]
+        headers = _summary_fields(rows)
         lines = []
         lines.append(" | ".join(headers))
         lines.append("-" * (len(lines[0]) + 5))
         for r in rows:
-            line = " | ".join(str(r[h]) if not isinstance(r[h], float) else f"{r[h]:.3f}" for h in headers)
+            line = " | ".join(
+                str(r.get(h, "")) if not isinstance(r.get(h), float) else f"{r[h]:.3f}" for h in headers
+            )
             lines.append(line)
         return "\n".join(lines)
 
@@ -193,7 +624,7 @@ def format_summary_table(rows: List[Dict[str, float]]) -> str:
 if __name__ == "__main__":
     rng = random.Random(42)
     trials = generate_trials(5, rng)
-    heuristics: HeuristicMap = {"Hamming": hamming, "Manhattan": manhattan}
+    heuristics = select_heuristics(["Hamming", "Manhattan", "LinearConflict"])
     results = run_batch(trials, heuristics)
     summary = summarize(results)
     print(format_summary_table(summary))
\ No newline at end of file
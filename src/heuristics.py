@@ -1,13 +1,90 @@
 from __future__ import annotations  # Ermöglicht Typannotationen, auch wenn Klassen später definiert werden
-from typing import Tuple  # Wird verwendet, wenn Funktionen Tupel (z. B. (x, y)) zurückgeben
+from typing import Protocol, Tuple  # Wird verwendet, wenn Funktionen Tupel (z. B. (x, y)) zurückgeben
 
 # Importiert wichtige Konstanten und Klassen aus dem state-Modul
 # PuzzleState = beschreibt einen bestimmten Puzzle-Zustand
 # GOAL = Zielzustand (z. B. (1,2,3,4,5,6,7,8,0))
-# GOAL_POS = Dictionary, das jedem Stein seine Zielkoordinaten zuordnet
 # INDEX_TO_RC = ordnet jedem Index (0–8) die passende (Zeile, Spalte)-Position zu
 # N = Größe des Spielfelds (beim 8-Puzzle = 3)
-from .state import PuzzleState, GOAL, GOAL_POS, INDEX_TO_RC, N
+from .state import PuzzleState, GOAL, INDEX_TO_RC, N, BITS_PER_CELL, CELL_MASK, Board, DEFAULT_BOARD
+
+
+# ------------------------ INKREMENTELLE HEURISTIKEN ------------------------
+# Ein Zug verschiebt genau einen Stein um ein Feld. Heuristiken, die das ausnutzen,
+# bieten zusätzlich eine delta()-Funktion an: h(Kind) = h(Eltern) + delta(...).
+# search.a_star verwendet delta() automatisch, wenn die Heuristik sie besitzt.
+
+class IncrementalHeuristic(Protocol):
+    """
+    A heuristic that can update its value from the parent's value.
+
+    delta(code, tile, src, dst) returns h(child) - h(parent), where `tile`
+    moved from index `src` to index `dst` and `code` is the packed child
+    board (see state.pack_tiles).
+    """
+
+    __name__: str
+
+    def __call__(self, s: PuzzleState) -> int: ...
+
+    def delta(self, code: int, tile: int, src: int, dst: int) -> int: ...
+
+
+# ------------------------ ANDERE BOARDGRÖSSEN ------------------------
+# Die Funktionen unten sind mit den 3x3-Tabellen fest verdrahtet (schnellster Pfad).
+# Für andere Boards (15-Puzzle, ...) baut for_board() einmal pro (Heuristik, Board)
+# eine spezialisierte Variante mit eigenen Tabellen; search.a_star/ida_star rufen
+# for_board() selbst auf, wenn der Startzustand nicht auf dem 3x3-Board liegt.
+
+_SPECIALIZED: dict = {}   # (Heuristik, Board) → spezialisierte Heuristik
+
+
+def for_board(h, board: Board):
+    """
+    Return `h` specialised to `board` (an IncrementalHeuristic if `h` is one).
+
+    For the 3x3 board this is `h` itself. Heuristics with a `for_board`
+    attribute build board-specific tables once per board; heuristics without
+    one are assumed to be size-independent and returned unchanged. A
+    heuristic that only exists for 3x3 raises ValueError from its factory.
+    """
+    if board is DEFAULT_BOARD:
+        return h
+    factory = getattr(h, "for_board", None)
+    if factory is None:
+        return h
+    key = (h, board)
+    specialized = _SPECIALIZED.get(key)
+    if specialized is None:
+        specialized = _SPECIALIZED[key] = factory(board)
+    return specialized
+
+
+def for_goal(h, board: Board, goal: Tuple[int, ...]):
+    """
+    Return `h` estimating the distance to `goal` instead of board.goal, or
+    None if `h` cannot be re-aimed (no `for_board` factory, or one that only
+    exists for the standard 3x3 goal, like PDB and Perfect).
+
+    Used for the backward half of search.bidirectional(); the result is not
+    cached, since every start state is a different goal.
+    """
+    if goal == board.goal:
+        return for_board(h, board)
+    factory = getattr(h, "for_board", None)
+    if factory is None:
+        return None
+    try:
+        return factory(board.with_goal(goal))
+    except ValueError:
+        return None
+
+
+def _named(fn, name: str, delta):
+    # Spezialisierte Varianten behalten den Namen der 3x3-Heuristik (für SearchResult.heuristic)
+    fn.__name__ = name
+    fn.delta = delta
+    return fn
 
 
 # ------------------------ HAMMING-HEURISTIK ------------------------
@@ -16,6 +93,8 @@ from .state import PuzzleState, GOAL, GOAL_POS, INDEX_TO_RC, N
 
 def hamming(s: PuzzleState) -> int:
 
+    if s.board is not DEFAULT_BOARD:  # andere Boardgröße → spezialisierte Variante
+        return for_board(hamming, s.board)(s)
     tiles = s.tiles  # Zugriff auf die aktuelle Anordnung der Steine
 
     # Wir vergleichen jeden Stein mit seiner Position im Zielzustand
@@ -24,32 +103,269 @@ def hamming(s: PuzzleState) -> int:
     return sum(1 for i, v in enumerate(tiles) if v != 0 and v != GOAL[i])
 
 
+def _hamming_delta(code: int, tile: int, src: int, dst: int) -> int:
+    # Nur der bewegte Stein kann von "falsch" zu "richtig" wechseln (oder umgekehrt)
+    return (GOAL[dst] != tile) - (GOAL[src] != tile)
+
+
+hamming.delta = _hamming_delta  # type: ignore[attr-defined]
+
+
+def _hamming_for(board: Board):
+    goal = board.goal
+
+    def hamming_board(s: PuzzleState) -> int:
+        return sum(1 for i, v in enumerate(s.tiles) if v != 0 and v != goal[i])
+
+    def delta(code: int, tile: int, src: int, dst: int) -> int:
+        return (goal[dst] != tile) - (goal[src] != tile)
+
+    return _named(hamming_board, "hamming", delta)
+
+
+hamming.for_board = _hamming_for  # type: ignore[attr-defined]
+
+
 # ------------------------ MANHATTAN-HEURISTIK ------------------------
 
+def _manhattan_table(board: Board) -> Tuple[Tuple[int, ...], ...]:
+    goal_pos = board.goal_pos
+    return tuple(
+        tuple(
+            0 if tile == 0 else abs(r - goal_pos[tile][0]) + abs(c - goal_pos[tile][1])
+            for r, c in board.index_to_rc
+        )
+        for tile in range(board.size)
+    )
+
+
+# Vorberechnete Tabelle: MANHATTAN_TABLE[tile][idx] = Distanz von Stein `tile` auf Feld `idx`
+# zu seinem Zielfeld. Das Leerfeld (tile 0) hat überall Distanz 0.
+MANHATTAN_TABLE: Tuple[Tuple[int, ...], ...] = _manhattan_table(DEFAULT_BOARD)
+
+
 #Idee: misst, wie weit jeder Stein von seinem Platz entfernt ist.
 def manhattan(s: PuzzleState) -> int:
-   
 
-    dist = 0  # Startwert der gesamten Distanz
+    if s.board is not DEFAULT_BOARD:  # andere Boardgröße → spezialisierte Variante
+        return for_board(manhattan, s.board)(s)
+    table = MANHATTAN_TABLE  # lokale Referenz, spart globale Lookups in der Schleife
 
     # Für jedes Feld im Puzzle: Index = Position, tile = Zahl des Steins
-    for idx, tile in enumerate(s.tiles):
-        if tile == 0:  # Leeres Feld überspringen
-            continue
+    # Manhattan-Distanz (horizontale + vertikale Entfernung) kommt direkt aus der Tabelle
+    return sum(table[tile][idx] for idx, tile in enumerate(s.tiles))
+
+
+def _manhattan_delta(code: int, tile: int, src: int, dst: int) -> int:
+    # Nur der bewegte Stein ändert seine Distanz (immer um genau ±1)
+    row = MANHATTAN_TABLE[tile]
+    return row[dst] - row[src]
+
+
+manhattan.delta = _manhattan_delta  # type: ignore[attr-defined]
+
+
+def _manhattan_for(board: Board):
+    table = _manhattan_table(board)
 
-        # Aktuelle Zeilen-/Spaltenposition berechnen
-        r, c = INDEX_TO_RC[idx]
+    def manhattan_board(s: PuzzleState) -> int:
+        return sum(table[tile][idx] for idx, tile in enumerate(s.tiles))
 
-        # Zielposition des Steins (gr = goal_row, gc = goal_col)
-        gr, gc = GOAL_POS[tile]
+    def delta(code: int, tile: int, src: int, dst: int) -> int:
+        row = table[tile]
+        return row[dst] - row[src]
 
-        # Manhattan-Distanz = horizontale + vertikale Entfernung
-        dist += abs(r - gr) + abs(c - gc)
+    return _named(manhattan_board, "manhattan", delta)
 
-    # Gesamt-Distanz zurückgeben
+
+manhattan.for_board = _manhattan_for  # type: ignore[attr-defined]
+
+
+# ------------------------ LINEAR-CONFLICT-HEURISTIK ------------------------
+# Idee: Zwei Steine in derselben Zeile, die beide in diese Zeile gehören, aber in
+# falscher Reihenfolge stehen, müssen aneinander vorbei → mindestens 2 Extrazüge.
+# Pro Zeile/Spalte: 2 * (Anzahl Steine, die mindestens herausmüssen) zu Manhattan addieren.
+
+# Schlüssel einer Zeile/Spalte: Ziffer pro Feld = Zielposition + 1 innerhalb der Linie,
+# oder 0, falls der Stein nicht in diese Linie gehört (Basis N+1, Feld k hat Gewicht (N+1)**k)
+_LINE_BASE = N + 1
+
+
+def _line_conflict_cost(key: int, length: int = N, base: int = _LINE_BASE) -> int:
+    """2 * (tiles in the line - longest increasing run of their goal positions)."""
+    goals = []
+    for _ in range(length):
+        key, d = divmod(key, base)
+        if d:
+            goals.append(d - 1)
+    # Längste aufsteigende Teilfolge: diese Steine dürfen bleiben, alle anderen müssen raus
+    best = [1] * len(goals)
+    for i in range(len(goals)):
+        for j in range(i):
+            if goals[j] < goals[i] and best[j] + 1 > best[i]:
+                best[i] = best[j] + 1
+    return 2 * (len(goals) - max(best, default=0))
+
+
+# LINE_CONFLICTS[key] = Zusatzkosten einer Linie; gilt für Zeilen und Spalten gleichermaßen
+LINE_CONFLICTS: Tuple[int, ...] = tuple(_line_conflict_cost(k) for k in range(_LINE_BASE ** N))
+
+def _key_parts(
+    board: Board, row_base: int, col_base: int
+) -> Tuple[Tuple[Tuple[int, ...], ...], Tuple[Tuple[int, ...], ...]]:
+    goal_pos = board.goal_pos
+    row_part = tuple(
+        tuple(
+            (goal_pos[tile][1] + 1) * row_base ** c if tile != 0 and goal_pos[tile][0] == r else 0
+            for r, c in board.index_to_rc
+        )
+        for tile in range(board.size)
+    )
+    col_part = tuple(
+        tuple(
+            (goal_pos[tile][0] + 1) * col_base ** r if tile != 0 and goal_pos[tile][1] == c else 0
+            for r, c in board.index_to_rc
+        )
+        for tile in range(board.size)
+    )
+    return row_part, col_part
+
+
+# Beitrag von Stein `tile` auf Feld `idx` zum Schlüssel seiner Zeile bzw. Spalte
+ROW_KEY_PART, COL_KEY_PART = _key_parts(DEFAULT_BOARD, _LINE_BASE, _LINE_BASE)
+
+
+def linear_conflict(s: PuzzleState) -> int:
+    """Manhattan distance plus 2 moves per tile that must leave its line to resolve conflicts."""
+    if s.board is not DEFAULT_BOARD:  # andere Boardgröße → spezialisierte Variante
+        return for_board(linear_conflict, s.board)(s)
+    tiles = s.tiles
+    table = MANHATTAN_TABLE
+    dist = sum(table[tile][idx] for idx, tile in enumerate(tiles))
+
+    for line in range(N):
+        # Zeile `line` und Spalte `line` gleichzeitig aufsummieren
+        row_key = 0
+        col_key = 0
+        for k in range(N):
+            i = line * N + k
+            j = k * N + line
+            row_key += ROW_KEY_PART[tiles[i]][i]
+            col_key += COL_KEY_PART[tiles[j]][j]
+        dist += LINE_CONFLICTS[row_key] + LINE_CONFLICTS[col_key]
     return dist
 
 
+def _line_key(code: int, cells: Tuple[int, ...], parts: Tuple[Tuple[int, ...], ...]) -> int:
+    # Schlüssel einer Linie direkt aus dem gepackten Board lesen
+    key = 0
+    for i in cells:
+        key += parts[(code >> (BITS_PER_CELL * i)) & CELL_MASK][i]
+    return key
+
+
+# Felder jeder Zeile / Spalte (für _line_key)
+_ROW_CELLS: Tuple[Tuple[int, ...], ...] = tuple(tuple(r * N + c for c in range(N)) for r in range(N))
+_COL_CELLS: Tuple[Tuple[int, ...], ...] = tuple(tuple(r * N + c for r in range(N)) for c in range(N))
+
+
+def _linear_conflict_delta(code: int, tile: int, src: int, dst: int) -> int:
+    row = MANHATTAN_TABLE[tile]
+    delta = row[dst] - row[src]
+
+    # Ein vertikaler Zug ändert nur die Zeilen von src und dst, ein horizontaler nur die
+    # Spalten; die Reihenfolge innerhalb der anderen Linie bleibt gleich (Leerfeld zählt nicht)
+    sr, sc = INDEX_TO_RC[src]
+    dr, dc = INDEX_TO_RC[dst]
+    if sc == dc:
+        parts, src_cells, dst_cells = ROW_KEY_PART, _ROW_CELLS[sr], _ROW_CELLS[dr]
+    else:
+        parts, src_cells, dst_cells = COL_KEY_PART, _COL_CELLS[sc], _COL_CELLS[dc]
+
+    # Kind-Schlüssel aus dem Board, Eltern-Schlüssel = Kind ± Beitrag des bewegten Steins
+    src_key = _line_key(code, src_cells, parts)
+    dst_key = _line_key(code, dst_cells, parts)
+    part = parts[tile]
+    delta += LINE_CONFLICTS[src_key] - LINE_CONFLICTS[src_key + part[src]]
+    delta += LINE_CONFLICTS[dst_key] - LINE_CONFLICTS[dst_key - part[dst]]
+    return delta
+
+
+linear_conflict.delta = _linear_conflict_delta  # type: ignore[attr-defined]
+
+
+# Größte Linie, deren Konfliktkosten vorab komplett tabelliert werden (6**6 = 46656
+# Schlüssel); längere Linien (z. B. 2x8-Boards) füllen die Tabelle erst bei Bedarf
+_EAGER_CONFLICT_KEYS = 6 ** 6
+
+
+class _LazyConflicts(dict):
+    # Wie das Tupel LINE_CONFLICTS indizierbar, berechnet aber nur tatsächlich vorkommende Schlüssel
+    def __init__(self, length: int, base: int) -> None:
+        super().__init__()
+        self.length, self.base = length, base
+
+    def __missing__(self, key: int) -> int:
+        cost = self[key] = _line_conflict_cost(key, self.length, self.base)
+        return cost
+
+
+def _conflict_table(length: int, base: int):
+    if base ** length <= _EAGER_CONFLICT_KEYS:
+        return tuple(_line_conflict_cost(k, length, base) for k in range(base ** length))
+    return _LazyConflicts(length, base)
+
+
+def _linear_conflict_for(board: Board):
+    # Dieselbe Logik wie oben, mit den Tabellen des Boards in Zellvariablen
+    rows, cols = board.rows, board.cols
+    bits, mask = board.bits_per_cell, board.cell_mask
+    index_to_rc = board.index_to_rc
+    table = _manhattan_table(board)
+    # Zeilen haben `cols` Felder mit Ziffern 0..cols, Spalten `rows` Felder mit Ziffern 0..rows
+    row_conflicts = _conflict_table(cols, cols + 1)
+    col_conflicts = _conflict_table(rows, rows + 1)
+    row_part, col_part = _key_parts(board, cols + 1, rows + 1)
+    row_cells = tuple(tuple(r * cols + c for c in range(cols)) for r in range(rows))
+    col_cells = tuple(tuple(r * cols + c for r in range(rows)) for c in range(cols))
+
+    def linear_conflict_board(s: PuzzleState) -> int:
+        tiles = s.tiles
+        dist = sum(table[tile][idx] for idx, tile in enumerate(tiles))
+        for cells in row_cells:
+            dist += row_conflicts[sum(row_part[tiles[i]][i] for i in cells)]
+        for cells in col_cells:
+            dist += col_conflicts[sum(col_part[tiles[i]][i] for i in cells)]
+        return dist
+
+    def key(code: int, cells: Tuple[int, ...], parts) -> int:
+        k = 0
+        for i in cells:
+            k += parts[(code >> (bits * i)) & mask][i]
+        return k
+
+    def delta(code: int, tile: int, src: int, dst: int) -> int:
+        row = table[tile]
+        d = row[dst] - row[src]
+        sr, sc = index_to_rc[src]
+        dr, dc = index_to_rc[dst]
+        if sc == dc:
+            conflicts, parts, src_cells, dst_cells = row_conflicts, row_part, row_cells[sr], row_cells[dr]
+        else:
+            conflicts, parts, src_cells, dst_cells = col_conflicts, col_part, col_cells[sc], col_cells[dc]
+        src_key = key(code, src_cells, parts)
+        dst_key = key(code, dst_cells, parts)
+        part = parts[tile]
+        d += conflicts[src_key] - conflicts[src_key + part[src]]
+        d += conflicts[dst_key] - conflicts[dst_key - part[dst]]
+        return d
+
+    return _named(linear_conflict_board, "linear_conflict", delta)
+
+
+linear_conflict.for_board = _linear_conflict_for  # type: ignore[attr-defined]
+
+
 # ------------------------ ZERO-HEURISTIK (KONTROLLWERT) ------------------------
 def zero_heuristic(_: PuzzleState) -> int:
     """
@@ -60,6 +376,13 @@ def zero_heuristic(_: PuzzleState) -> int:
     return 0
 
 
+def _zero_delta(code: int, tile: int, src: int, dst: int) -> int:
+    return 0
+
+
+zero_heuristic.delta = _zero_delta  # type: ignore[attr-defined]
+
+
 # ------------------------ SELBSTTEST (nur beim direkten Ausführen) ------------------------
 if __name__ == "__main__":
 
@@ -82,3 +405,4 @@ if __name__ == "__main__":
     # Gibt die berechneten Heuristikwerte aus
     print("Hamming =", hamming(s))
     print("Manhattan =", manhattan(s))
+    print("Linear conflict =", linear_conflict(s))
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import os
+import struct
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, NamedTuple, Optional, Tuple
+
+from .state import board_for_tiles
+
+if TYPE_CHECKING:
+    from .search import SearchResult
+
+# ------------------------------ Such-Hooks -----------------------------------
+# a_star(..., hooks=obj) ruft Methoden von `obj` an festen Stellen der Suche auf.
+# Nur tatsächlich überschriebene Methoden werden gebunden; alle anderen sind in der
+# Suchschleife None und kosten dort nur einen `is not None`-Vergleich. Ohne hooks
+# (Standard) läuft die Schleife wie bisher.
+
+
+class SearchHooks:
+    """
+    Base class for search event hooks; override only the events you need.
+
+    All codes are packed boards (see Board.pack of the searched board), f and g are integers.
+    """
+
+    def on_expand(self, code: int, blank: int, g: int, f: int) -> None:
+        """A state is taken from the open list and expanded."""
+
+    def on_generate(self, code: int, blank: int, g: int, f: int) -> None:
+        """A successor was pushed onto the open list (new state or shorter path)."""
+
+    def on_f_layer(self, f: int, expanded: int) -> None:
+        """The first state of a new (larger) f-layer is expanded; `expanded` counts all before it."""
+
+    def on_goal(self, code: int, g: int) -> None:
+        """The goal was expanded at depth g."""
+
+    def on_finish(self, result: "SearchResult") -> None:
+        """The search returned `result` (solved, exhausted or stopped by a budget)."""
+
+
+def bind_hook(hooks: Optional[SearchHooks], name: str) -> Optional[Callable]:
+    """Return the bound method `name` of `hooks`, or None if it is missing or not overridden."""
+    if hooks is None:
+        return None
+    method = getattr(hooks, name, None)
+    if method is None or getattr(type(hooks), name, None) is getattr(SearchHooks, name):
+        return None   # geerbte No-op-Methode → gar nicht erst aufrufen
+    return method
+
+
+# ------------------------------ Trace-Datei -----------------------------------
+# Binärformat (little endian):
+#   Datei:  MAGIC, danach ein Datensatz pro Suche
+#   Satz:   rows (u8), cols (u8), solved (u8), depth (u16), n (u32), dann rows*cols Bytes
+#           Startzustand und n × (f u16, g u16, count u32)
+# Der Startzustand steht als Kachel-Bytes statt als gepackter Code, damit auch
+# größere und rechteckige Boards (15-Puzzle, 3x4, ...) in dieselbe Datei passen.
+# Die Einträge bilden pro f-Schicht ein Histogramm der Expansionen über g.
+
+TRACE_MAGIC = b"8PZTRC03"
+_RECORD = struct.Struct("<BBBHI")
+_ENTRY = struct.Struct("<HHI")
+
+
+class TraceRecord(NamedTuple):
+    """One traced search: histogram[f][g] = expansions with that f and g."""
+
+    start_state: Tuple[int, ...]
+    solved: bool
+    depth: int
+    histogram: Dict[int, Dict[int, int]]
+    shape: Tuple[int, int]
+
+
+class FLayerTracer(SearchHooks):
+    """
+    Hooks that record a per-f-layer expansion histogram of every search and
+    append it to a binary trace file (read back with read_trace()).
+    Rectangular boards need `shape=(rows, cols)`; square ones are inferred.
+    An existing file is continued only if it is a trace of the same format and
+    board shape (ValueError otherwise).
+
+        with FLayerTracer("trace.bin") as tracer:
+            a_star(start, manhattan, hooks=tracer)
+    """
+
+    def __init__(self, path: str, shape: Optional[Tuple[int, int]] = None) -> None:
+        self.path = path
+        self.shape = shape   # (rows, cols) der Suchen; None = quadratisch aus der Kachelanzahl
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        # Form der Suchen in einer vorhandenen Datei; neue Sätze müssen dazu passen
+        self._file_shape = None if new else _check_trace_header(path, shape)
+        self._f = open(path, "ab")
+        if new:
+            self._f.write(TRACE_MAGIC)
+        self._counts: Dict[int, Dict[int, int]] = {}
+        self.searches = 0
+
+    def on_expand(self, code: int, blank: int, g: int, f: int) -> None:
+        layer = self._counts.get(f)
+        if layer is None:
+            layer = self._counts[f] = {}
+        layer[g] = layer.get(g, 0) + 1
+
+    def on_finish(self, result: "SearchResult") -> None:
+        entries = [(f, g, c) for f, layer in sorted(self._counts.items()) for g, c in sorted(layer.items())]
+        start = result.start_state
+        rows, cols = self.shape or board_for_tiles(start).shape
+        if rows * cols != len(start):
+            raise ValueError(f"tracer shape {rows}x{cols} does not fit a start state of {len(start)} tiles")
+        if self._file_shape is None:
+            self._file_shape = (rows, cols)
+        elif self._file_shape != (rows, cols):
+            file_rows, file_cols = self._file_shape
+            raise ValueError(f"{self.path} holds {file_rows}x{file_cols} searches, not {rows}x{cols}")
+        self._f.write(_RECORD.pack(rows, cols, result.solved, result.depth, len(entries)))
+        self._f.write(bytes(start))
+        self._f.write(b"".join(_ENTRY.pack(*e) for e in entries))
+        self._counts = {}
+        self.searches += 1
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> "FLayerTracer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _check_trace_header(path: str, shape: Optional[Tuple[int, int]]) -> Optional[Tuple[int, int]]:
+    """
+    Validate an existing trace file before appending: it must start with
+    TRACE_MAGIC, and its records must match `shape` (if given). Returns the
+    shape of its first record, or None if it has none yet.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(TRACE_MAGIC)) != TRACE_MAGIC:
+            raise ValueError(f"{path} is not a search trace file of format {TRACE_MAGIC.decode()}")
+        head = f.read(_RECORD.size)
+    if len(head) < _RECORD.size:
+        return None
+    file_shape = tuple(_RECORD.unpack(head)[:2])
+    if shape is not None and tuple(shape) != file_shape:
+        raise ValueError(f"{path} holds {file_shape[0]}x{file_shape[1]} searches, not {shape[0]}x{shape[1]}")
+    return file_shape
+
+
+def read_trace(path: str) -> Iterator[TraceRecord]:
+    """Stream the records of a trace file written by FLayerTracer."""
+    with open(path, "rb") as f:
+        if f.read(len(TRACE_MAGIC)) != TRACE_MAGIC:
+            raise ValueError(f"{path} is not a search trace file")
+        while True:
+            head = f.read(_RECORD.size)
+            if len(head) < _RECORD.size:
+                return   # Dateiende (oder abgeschnittener letzter Satz)
+            rows, cols, solved, depth, n = _RECORD.unpack(head)
+            cells = rows * cols
+            body = f.read(cells + n * _ENTRY.size)
+            if len(body) < cells + n * _ENTRY.size:
+                return
+            histogram: Dict[int, Dict[int, int]] = {}
+            for fv, g, count in _ENTRY.iter_unpack(body[cells:]):
+                histogram.setdefault(fv, {})[g] = count
+            yield TraceRecord(tuple(body[:cells]), bool(solved), depth, histogram, (rows, cols))
@@ -1,8 +1,9 @@
 from __future__ import annotations  # Erlaubt Typannotationen auch bei Klassen, die erst später definiert werden
 
+import math  # Logarithmen für die Bucket-Grenzen der Quantil-Skizze
 import time  # Zum Messen der Ausführungszeit von Funktionen
 from dataclasses import dataclass  # Ermöglicht das einfache Erstellen von Datencontainern
-from typing import Any, Iterable, List, Tuple  # Typangaben für Lesbarkeit und Fehlervermeidung
+from typing import Any, Dict, Iterable, List, Tuple  # Typangaben für Lesbarkeit und Fehlervermeidung
 
 import statistics as stats  # Für Mittelwert- und Standardabweichungsberechnung
 
@@ -48,6 +49,145 @@ def mean_std(values: Iterable[float | int]) -> Tuple[float, float]:
     return float(stats.mean(vals)), float(stats.stdev(vals))  # Mittelwert & Standardabweichung zurückgeben
 
 
+# ------------------------- KLASSE: RunningStats -------------------------
+#Mittelwert und Standardabweichung im Streaming-Betrieb (Welford-Algorithmus):
+#O(1) Speicher, egal wie viele Werte kommen; zwei Instanzen lassen sich zusammenführen.
+
+class RunningStats:
+    """Online count/mean/stdev/min/max (Welford); mergeable across workers."""
+
+    def __init__(self) -> None:
+        self.count = 0            # Anzahl bisheriger Werte
+        self.mean = 0.0           # laufender Mittelwert
+        self._m2 = 0.0            # Summe der quadrierten Abweichungen vom Mittelwert
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        d = x - self.mean
+        self.mean += d / self.count
+        self._m2 += d * (x - self.mean)   # nutzt alten und neuen Mittelwert → numerisch stabil
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def merge(self, other: "RunningStats") -> None:
+        """Combine another RunningStats into this one (Chan et al. parallel update)."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self._m2 = other.count, other.mean, other._m2
+            self.min, self.max = other.min, other.max
+            return
+        n = self.count + other.count
+        d = other.mean - self.mean
+        self.mean += d * other.count / n
+        self._m2 += other._m2 + d * d * self.count * other.count / n
+        self.count = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation (like statistics.stdev); 0.0 for fewer than 2 values."""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self._m2 / (self.count - 1))
+
+
+# ------------------------- KLASSE: QuantileSketch -------------------------
+#Quantile (p50/p90/p99) ohne alle Werte zu speichern: logarithmische Buckets
+#(wie DDSketch). Jeder Wert wird mit höchstens `relative_accuracy` relativem Fehler
+#wiedergegeben; Skizzen mit gleicher Genauigkeit lassen sich addieren (mergeable).
+
+class QuantileSketch:
+    """Mergeable quantile sketch for non-negative values with bounded relative error."""
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: Dict[int, int] = {}   # Bucket-Index → Anzahl Werte
+        self._zeros = 0                      # Werte == 0 (haben keinen Logarithmus)
+        self.count = 0
+        self.min = math.inf                  # exakte Extremwerte, begrenzen die Bucket-Schätzung
+        self.max = -math.inf
+
+    def add(self, x: float) -> None:
+        if x < 0:
+            raise ValueError("QuantileSketch only supports non-negative values")
+        self.count += 1
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+        if x == 0:
+            self._zeros += 1
+            return
+        # Bucket i deckt (gamma^(i-1), gamma^i] ab
+        i = math.ceil(math.log(x) / self._log_gamma)
+        self._buckets[i] = self._buckets.get(i, 0) + 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other._gamma != self._gamma:
+            raise ValueError("can only merge sketches with the same relative accuracy")
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._zeros += other._zeros
+        for i, c in other._buckets.items():
+            self._buckets[i] = self._buckets.get(i, 0) + c
+
+    def quantile(self, q: float) -> float:
+        """
+        Approximate q-quantile (0 <= q <= 1), clamped to the exact [min, max]
+        of the added values (so a constant stream returns that constant and
+        p99 never exceeds max); raises ValueError if empty.
+        """
+        if not self.count:
+            raise ValueError("quantile() of an empty sketch")
+        return min(max(self._bucket_quantile(q), self.min), self.max)
+
+    def _bucket_quantile(self, q: float) -> float:
+        rank = q * (self.count - 1)   # gleiche Rangdefinition wie "nearest rank" auf sortierten Werten
+        seen = self._zeros
+        if rank < seen:
+            return 0.0
+        for i in sorted(self._buckets):
+            seen += self._buckets[i]
+            if rank < seen:
+                # Repräsentant des Buckets: relativer Fehler <= relative_accuracy
+                return 2 * self._gamma ** i / (self._gamma + 1)
+        return 2 * self._gamma ** max(self._buckets) / (self._gamma + 1)
+
+
+# ------------------------- FUNKTION: effective_branching_factor -------------------------
+#Effektiver Verzweigungsfaktor b* (Russell & Norvig): der Faktor, den ein gleichmäßiger
+#Baum der Tiefe d bräuchte, um N Knoten zu enthalten: N + 1 = 1 + b* + b*^2 + ... + b*^d.
+#Je näher an 1, desto besser lenkt die Heuristik die Suche.
+
+def effective_branching_factor(n_nodes: int, depth: int, tol: float = 1e-6) -> float:
+    """Solve N + 1 = 1 + b + ... + b^depth for b by bisection; 0.0 if depth or N is 0."""
+    if depth <= 0 or n_nodes <= 0:
+        return 0.0
+
+    def tree_size(b: float) -> float:
+        return sum(b ** i for i in range(1, depth + 1))   # Knoten ohne die Wurzel
+
+    lo, hi = 0.0, n_nodes ** (1.0 / depth)   # tree_size(hi) >= hi^depth = N
+    while hi - lo > tol:
+        mid = (lo + hi) / 2
+        if tree_size(mid) < n_nodes:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
+
+
 # ------------------------- SELBSTTEST (nur beim direkten Ausführen) -------------------------
 if __name__ == "__main__":
     # Schneller Test, um zu prüfen, ob die Funktionen korrekt funktionieren
@@ -59,3 +199,10 @@ if __name__ == "__main__":
     # Beispiel 2: mean_std berechnet Durchschnitt und Standardabweichung einer Liste
     m, s = mean_std([1, 2, 3, 4])
     print(f"mean={m}, std={s}")  # Erwartete Ausgabe: mean=2.5, std≈1.29
+
+    # Beispiel 3: Streaming-Statistik und Quantile über 1..1000
+    rs, qs = RunningStats(), QuantileSketch()
+    for x in range(1, 1001):
+        rs.add(x)
+        qs.add(x)
+    print(f"mean={rs.mean}, std={rs.stdev:.2f}, p50≈{qs.quantile(0.5):.1f}, p99≈{qs.quantile(0.99):.1f}")
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import heapq
+from typing import Any, Dict, List, Protocol, Tuple, Type
+
+# ------------------------------ Open-Listen ----------------------------------
+# A* braucht eine Open-Liste, die immer den Knoten mit kleinstem f liefert.
+# Alle Implementierungen bieten dieselbe Schnittstelle: push(f, g, item), pop(), len().
+
+
+class OpenList(Protocol):
+    """Priority structure for A*: pop() returns the entry with the smallest f."""
+
+    def push(self, f: int, g: int, item: Any) -> None: ...
+
+    def pop(self) -> Tuple[int, int, Any]: ...
+
+    def __len__(self) -> int: ...
+
+
+# ------------------------------- Heap-Variante --------------------------------
+
+class HeapOpenList:
+    """
+    Binary heap ordered by (f, g, insertion order) - the original A* behaviour:
+    among equal f, smaller g first; among equal (f, g), first in first out.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[int, int, int, Any]] = []  # (f, g, tie, item)
+        self._tie = 0   # Tie-breaker, damit items nie verglichen werden
+
+    def push(self, f: int, g: int, item: Any) -> None:
+        self._tie += 1
+        heapq.heappush(self._heap, (f, g, self._tie, item))
+
+    def pop(self) -> Tuple[int, int, Any]:
+        f, g, _, item = heapq.heappop(self._heap)
+        return f, g, item
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+# ------------------------------ Bucket-Variante --------------------------------
+
+class BucketOpenList:
+    """
+    Array of buckets for small non-negative integer f-values (8-puzzle: f <= 31).
+
+    _buckets[f][g] is a stack, so push/pop are O(1) amortised with no tuple
+    comparisons. Among equal f, the deepest g is popped first (deeper nodes
+    are closer to the goal); within one (f, g) the order is last in first out.
+    """
+
+    def __init__(self) -> None:
+        self._buckets: List[List[List[Any]]] = []   # [f][g] → Stack von items
+        self._top_g: List[int] = []                 # pro f: höchstes g, das belegt sein könnte
+        self._min_f = 0                             # kein belegtes f liegt darunter
+        self._size = 0
+
+    def push(self, f: int, g: int, item: Any) -> None:
+        buckets = self._buckets
+        while len(buckets) <= f:     # Arrays bei Bedarf nach oben verlängern
+            buckets.append([])
+            self._top_g.append(-1)
+        row = buckets[f]
+        while len(row) <= g:
+            row.append([])
+        row[g].append(item)
+        if g > self._top_g[f]:
+            self._top_g[f] = g
+        if f < self._min_f or self._size == 0:
+            self._min_f = f
+        self._size += 1
+
+    def pop(self) -> Tuple[int, int, Any]:
+        if not self._size:
+            raise IndexError("pop from empty BucketOpenList")
+        buckets = self._buckets
+        top_g = self._top_g
+        f = self._min_f
+        while True:
+            row = buckets[f]
+            g = top_g[f]
+            # Leere g-Stacks überspringen (Zeiger wandert nur nach unten → amortisiert O(1))
+            while g >= 0 and not row[g]:
+                g -= 1
+            top_g[f] = g
+            if g >= 0:
+                break
+            f += 1
+        self._min_f = f
+        self._size -= 1
+        return f, g, row[g].pop()
+
+    def __len__(self) -> int:
+        return self._size
+
+
+# Per Name wählbar (a_star(open_list=...), run_experiments.py --open-list)
+OPEN_LISTS: Dict[str, Type] = {
+    "heap": HeapOpenList,
+    "bucket": BucketOpenList,
+}
+
+
+# ------------------------------ Self-test ------------------------------------
+
+if __name__ == "__main__":
+    for name, cls in OPEN_LISTS.items():
+        ol = cls()
+        for f, g, item in [(5, 1, "a"), (3, 2, "b"), (5, 3, "c"), (3, 1, "d")]:
+            ol.push(f, g, item)
+        print(name, [ol.pop() for _ in range(len(ol))])
@@ -0,0 +1,418 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import queue
+import random
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .state import PuzzleState, Board, MOVE_CODE, LazyPath
+from .utils import is_solvable
+from .openlist import HeapOpenList
+from .heuristics import for_board
+from .search import SearchResult, SearchStats, _NO_MOVE_CODE, _fill_stats, _reconstruct_moves, _timed
+
+# ------------------------- Hash-verteiltes A* (HDA*) -------------------------
+# Kishimoto et al. (2009): jeder Zustand gehört genau einem Worker-Prozess, bestimmt
+# durch seinen Zobrist-Hash. Jeder Worker führt ein eigenes A* über seine Zustände
+# (eigene Open-List und g-Werte); erzeugte Nachfolger anderer Worker werden gesammelt
+# und in Paketen (batch_size) über deren Queue verschickt.
+#
+# Ende der Suche: Die beste bekannte Lösungslänge U liegt im Shared Memory. Ein Worker
+# ist untätig, wenn er keinen Knoten mit f < U mehr hat. Zwei gemeinsame Zähler
+# (untätige Worker fehlen in `busy`, verschickte aber noch nicht verarbeitete Knoten
+# in `in_flight`) werden unter einem Lock geändert: Ein Sender zählt in_flight hoch,
+# bevor er selbst untätig werden kann, ein Empfänger wird wieder `busy`, bevor er
+# in_flight herunterzählt. busy == 0 und in_flight == 0 heißt daher: nirgends gibt es
+# noch Arbeit, und U ist optimal (zulässige Heuristik).
+
+_NO_SOLUTION = 2 ** 62          # "U = unendlich" im int64-Shared-Memory
+_POLL_INTERVAL = 16             # Expansionen zwischen zwei Blicken in die eigene Queue
+_FLUSH_INTERVAL = 64            # Expansionen, nach denen alle Pakete verschickt werden
+_BUDGET_INTERVAL = 256          # Expansionen zwischen zwei Budget-Prüfungen
+_IDLE_TIMEOUT = 0.005           # Sekunden, die ein untätiger Worker auf Nachrichten wartet
+_RESULT_POLL = 0.5              # Sekunden zwischen zwei Lebenszeichen-Prüfungen des Koordinators
+
+# done-Flag im Shared Memory → Status
+_RUNNING, _QUIESCENT, _TIMEOUT, _NODE_LIMIT, _WORKER_FAILED = range(5)
+_STOP_STATUS = {_TIMEOUT: "timeout", _NODE_LIMIT: "node_limit", _WORKER_FAILED: "worker_failed"}
+
+
+class _WorkerFailed(Exception):
+    """A worker process exited before answering (raised by the coordinator's lookups)."""
+
+
+def zobrist_table(board: Board) -> Tuple[Tuple[int, ...], ...]:
+    """
+    table[tile][cell] = random 64-bit key; the blank (tile 0) has all-zero keys.
+    Seeded by the board shape, so every process builds the same table.
+    """
+    rng = random.Random(f"zobrist-{board.rows}x{board.cols}")
+    return ((0,) * board.size,) + tuple(
+        tuple(rng.getrandbits(64) for _ in range(board.size)) for _ in range(1, board.size)
+    )
+
+
+def zobrist_hash(tiles: Sequence[int], table: Tuple[Tuple[int, ...], ...]) -> int:
+    """XOR of the keys of all tiles on their cells."""
+    key = 0
+    for cell, tile in enumerate(tiles):
+        key ^= table[tile][cell]
+    return key
+
+
+def hda_star(
+    start: PuzzleState,
+    h: Callable[[PuzzleState], int],
+    workers: int = 0,
+    batch_size: int = 64,
+    max_expanded: Optional[int] = None,
+    time_limit: Optional[float] = None,
+    instrument: bool = False,
+    store_path: bool = True,
+) -> SearchResult:
+    """
+    Hash-distributed parallel A* over `workers` processes (0 = one per CPU).
+
+    Returns the same SearchResult as search.a_star(): an optimal solution,
+    `expanded` summed over all workers. Node batches hold up to `batch_size`
+    states. max_expanded (total, checked every few hundred expansions per
+    worker) and time_limit stop the search with status "node_limit" or
+    "timeout"; lower_bound stays None, since nodes still in transit are not
+    known to the workers. If a worker process dies (e.g. the heuristic
+    raises), the others are stopped and the result has status
+    "worker_failed". instrument=True sums the counters of all workers.
+    """
+    t0 = time.perf_counter()
+    heuristic_name = h.__name__.capitalize()
+    n_workers = workers or os.cpu_count() or 1
+    board = start.board
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+
+    # Unlösbar → die Worker würden nur ihre Hälfte des Zustandsraums erschöpfen
+    if not is_solvable(start.tiles, board.shape):
+        return SearchResult(
+            solved=False,
+            depth=0,
+            expanded=0,
+            runtime_s=time.perf_counter() - t0,
+            heuristic=heuristic_name,
+            start_state=start.tiles,
+            path=None,
+            stats=SearchStats() if instrument else None,
+        )
+
+    ctx = mp.get_context()
+    inboxes = [ctx.Queue() for _ in range(n_workers)]
+    results = ctx.Queue()
+    counters = ctx.Array("q", [n_workers, 0, 0])   # busy, in_flight, gemeldete Expansionen
+    incumbent = ctx.Value("q", _NO_SOLUTION)
+    done = ctx.Value("i", _RUNNING)
+    deadline = time.monotonic() + time_limit if time_limit is not None else None
+    procs = [
+        ctx.Process(
+            target=_hda_worker,
+            args=(
+                rank, start, h, inboxes, results, (counters, incumbent, done),
+                batch_size, deadline, max_expanded, store_path, instrument,
+            ),
+            daemon=True,
+        )
+        for rank in range(n_workers)
+    ]
+    try:
+        for p in procs:
+            p.start()
+        reports = _collect_reports(results, procs, done)
+        depth = incumbent.value
+        if done.value == _QUIESCENT:
+            status = "solved" if depth != _NO_SOLUTION else "exhausted"
+        else:
+            status = _STOP_STATUS[done.value]
+        moves = None
+        if status == "solved" and store_path:
+            # Parent-Pointer liegen beim jeweiligen Besitzer → Zug für Zug nachfragen
+            remote = _RemoteScores(board, inboxes, results, procs)
+            try:
+                moves = _reconstruct_moves(remote, board.goal_code, board.goal_blank, start.packed(), board)
+            except _WorkerFailed:
+                status = "worker_failed"
+        solved = status == "solved"
+    finally:
+        for inbox in inboxes:
+            inbox.put("stop")
+        for p in procs:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+    t1 = time.perf_counter()
+
+    expanded = sum(r[0] for r in reports)
+    stats = None
+    if instrument:
+        stats = SearchStats(
+            h_calls=sum(r[1][5] for r in reports),
+            h_time_s=sum(r[1][6] for r in reports),
+        )
+        totals = [sum(r[1][i] for r in reports) for i in range(5)]
+        stats = _fill_stats(stats, *totals, expanded, depth if solved else 0)
+    return SearchResult(
+        solved=solved,
+        depth=depth if solved else 0,
+        expanded=expanded,
+        runtime_s=t1 - t0,
+        heuristic=heuristic_name,
+        start_state=start.tiles,
+        path=LazyPath(start, moves) if moves is not None else None,
+        status=status,
+        stats=stats,
+        moves=moves,
+    )
+
+
+class _RemoteScores:
+    """
+    Read-only g_score lookup for _reconstruct_moves(): asks the owning worker.
+    Raises _WorkerFailed instead of waiting forever if that worker has died.
+    """
+
+    def __init__(self, board: Board, inboxes, results, procs) -> None:
+        self.board = board
+        self.table = zobrist_table(board)
+        self.inboxes = inboxes
+        self.results = results
+        self.procs = procs
+
+    def __getitem__(self, code: int) -> int:
+        owner = zobrist_hash(self.board.unpack(code), self.table) % len(self.inboxes)
+        self.inboxes[owner].put(("lookup", code))
+        while True:
+            try:
+                return self.results.get(timeout=_RESULT_POLL)
+            except queue.Empty:
+                if not self.procs[owner].is_alive():
+                    raise _WorkerFailed(self.procs[owner].name) from None
+
+
+def _collect_reports(results, procs, done) -> List[tuple]:
+    """
+    Wait for the end-of-search report of every worker. A worker that exits
+    without reporting stops the others (status "worker_failed"); their
+    reports are still collected, so `expanded` covers the surviving workers.
+    """
+    reports: Dict[int, Optional[tuple]] = {}
+    while len(reports) < len(procs):
+        try:
+            rank, expanded, counts = results.get(timeout=_RESULT_POLL)
+            reports[rank] = (expanded, counts)
+        except queue.Empty:
+            for rank, p in enumerate(procs):
+                # Ein Worker endet vor seinem Bericht nur durch einen Fehler
+                if rank not in reports and p.exitcode is not None:
+                    _stop(done, _WORKER_FAILED)
+                    reports[rank] = None
+    return [r for r in reports.values() if r is not None]
+
+
+# ---------------------------------- Worker ------------------------------------
+
+def _hda_worker(
+    rank: int,
+    start: PuzzleState,
+    h: Callable[[PuzzleState], int],
+    inboxes: List,
+    results,
+    shared: Tuple,
+    batch_size: int,
+    deadline: Optional[float],
+    max_expanded: Optional[int],
+    store_path: bool,
+    instrument: bool,
+) -> None:
+    """One HDA* process: A* over the states it owns, then answers parent lookups."""
+    counters, incumbent, done = shared
+    lock = counters.get_lock()
+    n_workers = len(inboxes)
+    inbox = inboxes[rank]
+    board = start.board
+    h = for_board(h, board)
+    h_delta = getattr(h, "delta", None)
+    stats = SearchStats() if instrument else None
+    if stats is not None:
+        h, h_delta = _timed(h, stats), h_delta and _timed(h_delta, stats)
+    zobrist = zobrist_table(board)
+    goal_code = board.goal_code
+    bits, mask = board.bits_per_cell, board.cell_mask
+    expand = board.packed_neighbors
+    move_code = MOVE_CODE if store_path else _NO_MOVE_CODE
+
+    open_nodes = HeapOpenList()
+    g_score: Dict[int, int] = {}    # g << 2 | Zug, nur für eigene Zustände
+    outboxes: List[list] = [[] for _ in range(n_workers)]
+    expanded = reported = generated = stale_pops = reopened = peak_open = 0
+    best = _NO_SOLUTION             # lokale Kopie von U (darf veralten: nur mehr Arbeit, nie falsch)
+    idle = False
+
+    def accept(item) -> None:
+        # Knoten übernehmen, wenn er neu ist oder einen kürzeren Weg hat; item = (code, blank,
+        # parent_blank, g << 2 | Zug, h, zobrist)
+        nonlocal best, reopened
+        code = item[0]
+        g = item[3] >> 2
+        old = g_score.get(code)
+        if old is not None:
+            if old >> 2 <= g:
+                return
+            reopened += 1   # HDA* expandiert nicht global in f-Reihenfolge
+        g_score[code] = item[3]
+        if code == goal_code:
+            with incumbent.get_lock():
+                if g < incumbent.value:
+                    incumbent.value = g
+                best = incumbent.value
+            return
+        open_nodes.push(g + item[4], g, item)
+
+    def receive(batch: list) -> None:
+        nonlocal idle
+        with lock:
+            if idle:
+                counters[0] += 1    # erst wieder busy, dann in_flight herunterzählen
+                idle = False
+            counters[1] -= len(batch)
+        for item in batch:
+            accept(item)
+
+    def send(q: int) -> None:
+        batch = outboxes[q]
+        outboxes[q] = []
+        with lock:
+            counters[1] += len(batch)
+        inboxes[q].put(batch)
+
+    def flush() -> None:
+        for q in range(n_workers):
+            if outboxes[q]:
+                send(q)
+
+    def check_budget() -> None:
+        nonlocal reported
+        with lock:
+            counters[2] += expanded - reported
+            total = counters[2]
+        reported = expanded
+        if max_expanded is not None and total >= max_expanded:
+            _stop(done, _NODE_LIMIT)
+        elif deadline is not None and time.monotonic() >= deadline:
+            _stop(done, _TIMEOUT)
+
+    start_zob = zobrist_hash(start.tiles, zobrist)
+    if start_zob % n_workers == rank:
+        start_h = h(start)
+        accept((start.packed(), start.blank, -1, 0, start_h, start_zob))
+
+    budgeted = max_expanded is not None or deadline is not None
+    while True:
+        # ---- Nachrichten abholen, U und das Stopp-Flag auffrischen
+        if not expanded % _POLL_INTERVAL or not open_nodes:
+            while True:
+                try:
+                    batch = inbox.get_nowait()
+                except queue.Empty:
+                    break
+                if batch == "stop":
+                    return      # Koordinator bricht ab (z. B. nach einem Fehler)
+                receive(batch)
+            best = incumbent.value
+            if done.value:
+                break
+
+        # ---- besten gültigen Knoten mit f < U holen
+        item = None
+        while open_nodes:
+            f, g, item = open_nodes.pop()
+            if g_score[item[0]] >> 2 != g:
+                stale_pops += 1     # über einen kürzeren Weg erneut eingefügt
+                item = None
+                continue
+            if f >= best:
+                open_nodes = HeapOpenList()   # alles Übrige ist mindestens so teuer wie U
+                item = None
+            break
+
+        if item is None:
+            # ---- untätig: Pakete leeren, abmelden, auf Nachrichten warten
+            flush()
+            with lock:
+                if not idle:
+                    counters[0] -= 1
+                    idle = True
+                if counters[0] == 0 and counters[1] == 0:
+                    _stop(done, _QUIESCENT)
+            if done.value:
+                break
+            try:
+                batch = inbox.get(timeout=_IDLE_TIMEOUT)
+            except queue.Empty:
+                if budgeted:
+                    check_budget()
+                continue
+            if batch == "stop":
+                return
+            receive(batch)
+            continue
+
+        # ---- expandieren: eigene Nachfolger direkt, fremde gesammelt verschicken
+        if stats is not None and len(open_nodes) >= peak_open:
+            peak_open = len(open_nodes) + 1
+        expanded += 1
+        code, blank, parent_blank, gm, h_val, zob = item
+        child_g = g + 1
+        children = expand(code, blank, parent_blank)
+        generated += len(children)
+        for child, child_blank, action in children:
+            # Der Stein von child_blank ist auf das alte Leerfeld `blank` gerutscht
+            tile = (child >> (bits * blank)) & mask
+            child_zob = zob ^ zobrist[tile][child_blank] ^ zobrist[tile][blank]
+            if h_delta is not None:
+                child_h = h_val + h_delta(child, tile, child_blank, blank)
+            else:
+                child_h = h(PuzzleState._unchecked(board.unpack(child), child_blank, board))
+            if child_g + child_h >= best:
+                continue    # kann U nicht mehr verbessern
+            child_item = (child, child_blank, blank, child_g << 2 | move_code[action], child_h, child_zob)
+            owner = child_zob % n_workers
+            if owner == rank:
+                accept(child_item)
+            else:
+                out = outboxes[owner]
+                out.append(child_item)
+                if len(out) >= batch_size:
+                    send(owner)
+        if not expanded % _FLUSH_INTERVAL:
+            flush()     # andere Worker nicht auf halbvolle Pakete warten lassen
+        if budgeted and not expanded % _BUDGET_INTERVAL:
+            check_budget()
+
+    if budgeted:
+        check_budget()
+    counts = (generated, stale_pops, reopened, peak_open, len(g_score),
+              stats.h_calls if stats else 0, stats.h_time_s if stats else 0.0)
+    results.put((rank, expanded, counts))
+
+    # ---- nach der Suche: Parent-Pointer für die Pfadrekonstruktion herausgeben
+    while True:
+        msg = inbox.get()
+        if msg == "stop":
+            return
+        if isinstance(msg, tuple):      # ("lookup", code); späte Knotenpakete werden ignoriert
+            results.put(g_score[msg[1]])
+
+
+def _stop(done, reason: int) -> None:
+    # Erster Grund gewinnt (z. B. Timeout vor gleichzeitigem Ende)
+    with done.get_lock():
+        if done.value == _RUNNING:
+            done.value = reason
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import mmap
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .state import PuzzleState, Board, DEFAULT_BOARD, get_board
+from .heuristics import for_board
+
+# ----------------------- Additive Pattern-Datenbanken -------------------------
+# Eine Pattern-Datenbank (PDB) speichert für eine Teilmenge der Steine (das Pattern)
+# die minimale Anzahl an Zügen DIESER Steine, um sie an ihre Zielfelder zu bringen.
+# Alle anderen Steine und das Leerfeld sind "unsichtbar": ein Pattern-Stein darf auf
+# jedes benachbarte Feld ohne Pattern-Stein rutschen. Bei disjunkten Patterns dürfen
+# die Werte deshalb addiert werden und bleiben zulässig und konsistent (additive PDB).
+#
+# Index einer Tabelle = Rank der Positionen der Pattern-Steine (k-Permutation der Felder).
+# Tabellen gibt es für jedes Board mit Standardziel; vorgegebene Aufteilungen für 3x3 und 4x4.
+
+N_CELLS = DEFAULT_BOARD.size
+MAGIC = b"8PZPDB02"   # Dateikennung + Formatversion (01: Abstraktion mit Leerfeld, inkonsistent)
+UNSEEN = 0xFF
+
+# Übliche disjunkte Aufteilungen der Steine, je Boardform
+PARTITIONS_BY_SHAPE: Dict[Tuple[int, int], Dict[str, Tuple[Tuple[int, ...], ...]]] = {
+    (3, 3): {
+        "3-3-2": ((1, 2, 3), (4, 5, 6), (7, 8)),
+        "4-4": ((1, 2, 3, 4), (5, 6, 7, 8)),
+    },
+    # 15-Puzzle: drei kompakte Blöcke à 5 Steine (16!/11! = 524160 Einträge pro Tabelle)
+    (4, 4): {
+        "5-5-5": ((1, 2, 5, 6, 9), (3, 4, 7, 8, 12), (10, 11, 13, 14, 15)),
+    },
+}
+DEFAULT_PARTITIONS: Dict[Tuple[int, int], str] = {(3, 3): "4-4", (4, 4): "5-5-5"}
+PARTITIONS = PARTITIONS_BY_SHAPE[(3, 3)]   # Aufteilungen des 8-Puzzles
+DEFAULT_PARTITION = DEFAULT_PARTITIONS[(3, 3)]
+
+# Standardverzeichnis für die gecachten Tabellen: <repo>/data
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+# ------------------------------- Indexing ------------------------------------
+
+def pattern_size(k: int, n_cells: int = N_CELLS) -> int:
+    """Number of placements of k distinct tiles on n_cells cells: n_cells! / (n_cells-k)!."""
+    size = 1
+    for i in range(k):
+        size *= n_cells - i
+    return size
+
+
+def placement_index(positions: Sequence[int], n_cells: int = N_CELLS) -> int:
+    """Dense index of a sequence of distinct cell positions (partial Lehmer code)."""
+    used = 0
+    idx = 0
+    for i, p in enumerate(positions):
+        # Wie viele noch freie Felder liegen vor p? → Ziffer mit Basis (n_cells - i)
+        d = p - (used & ((1 << p) - 1)).bit_count()
+        used |= 1 << p
+        idx = idx * (n_cells - i) + d
+    return idx
+
+
+def placement_from_index(idx: int, k: int, n_cells: int = N_CELLS) -> List[int]:
+    """Inverse of placement_index() for k positions."""
+    digits = [0] * k
+    for i in range(k - 1, -1, -1):
+        idx, digits[i] = divmod(idx, n_cells - i)
+    free = list(range(n_cells))
+    return [free.pop(d) for d in digits]
+
+
+# ------------------------------- Builder -------------------------------------
+
+def build_pattern_table(pattern: Sequence[int], board: Board = DEFAULT_BOARD) -> bytearray:
+    """
+    Retrograde BFS from the goal placement of `pattern`.
+
+    Abstract states are placements of the pattern tiles only (the blank is
+    left out): a pattern tile may move onto any adjacent cell not held by
+    another pattern tile, at cost 1. Every real move changes at most one
+    pattern by one such step, so the summed tables are consistent, not
+    just admissible (search.a_star never reopens closed states).
+    """
+    k = len(pattern)
+    n_cells = board.size
+    table = bytearray([UNSEEN]) * pattern_size(k, n_cells)
+    goal_positions = [board.goal.index(t) for t in pattern]
+    table[placement_index(goal_positions, n_cells)] = 0
+    adjacent = [[j for j, _ in moves] for moves in board.blank_moves]
+
+    # Schichtweise BFS; Kanten sind symmetrisch, also gilt die Distanz auch zum Ziel hin
+    frontier = [goal_positions]
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for positions in frontier:
+            for i, p in enumerate(positions):
+                for j in adjacent[p]:
+                    if j in positions:
+                        continue
+                    child = positions.copy()
+                    child[i] = j
+                    idx = placement_index(child, n_cells)
+                    if table[idx] == UNSEEN:
+                        table[idx] = depth
+                        next_frontier.append(child)
+        frontier = next_frontier
+    return table
+
+
+# ---------------------------- Datei-Format -----------------------------------
+# MAGIC | k (1 Byte) | k Pattern-Steine (je 1 Byte) | Tabelle (1 Byte pro Placement)
+
+def default_path(pattern: Sequence[int], directory: str = DEFAULT_DIR, board: Board = DEFAULT_BOARD) -> str:
+    """Cache file name for a pattern, e.g. data/pdb_3x3_1-2-3.bin."""
+    return os.path.join(directory, f"pdb_{board.rows}x{board.cols}_{'-'.join(map(str, pattern))}.bin")
+
+
+def save_pattern_table(pattern: Sequence[int], table: Sequence[int], path: str) -> None:
+    """Write a pattern table atomically to `path`."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(bytes([len(pattern), *pattern]))
+        f.write(bytes(table))
+    os.replace(tmp, path)
+
+
+def load_pattern_table(
+    pattern: Sequence[int], path: str, build: bool = True, board: Board = DEFAULT_BOARD
+) -> memoryview:
+    """Memory-map the table for `pattern` at `path` (building and caching it if missing)."""
+    # Fehlt der Cache oder stammt er aus einer älteren Formatversion → (neu) bauen
+    if not os.path.exists(path) or (build and _is_stale(path)):
+        if not build:
+            raise FileNotFoundError(path)
+        save_pattern_table(pattern, build_pattern_table(pattern, board), path)
+
+    header = MAGIC + bytes([len(pattern), *pattern])
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mm[:len(header)] != header or len(mm) != len(header) + pattern_size(len(pattern), board.size):
+        mm.close()
+        raise ValueError(f"{path} is not a pattern database for tiles {tuple(pattern)}")
+    return memoryview(mm)[len(header):]
+
+
+def _is_stale(path: str) -> bool:
+    with open(path, "rb") as f:
+        magic = f.read(len(MAGIC))
+    return magic[:6] == MAGIC[:6] and magic != MAGIC
+
+
+# ---------------------------- Heuristik-Objekt --------------------------------
+
+class AdditivePDB:
+    """
+    Additive disjoint pattern database heuristic.
+
+    Callable like the functions in heuristics.py and implements the
+    IncrementalHeuristic protocol (delta), so search.a_star updates it per
+    move by re-indexing only the pattern that contains the moved tile.
+    `board` selects the board (3x3 by default); patterns=None uses its
+    default partition (DEFAULT_PARTITIONS).
+    """
+
+    def __init__(
+        self,
+        patterns: Optional[Iterable[Sequence[int]]] = None,
+        directory: str = DEFAULT_DIR,
+        board: Board = DEFAULT_BOARD,
+    ) -> None:
+        if board.goal != get_board(board.rows, board.cols).goal:
+            raise ValueError("pattern databases are only built for the standard goal")
+        if patterns is None:
+            name = DEFAULT_PARTITIONS.get(board.shape)
+            if name is None:
+                raise ValueError(f"no default pattern partition for {board}; pass patterns explicitly")
+            patterns = PARTITIONS_BY_SHAPE[board.shape][name]
+        self.patterns: Tuple[Tuple[int, ...], ...] = tuple(tuple(p) for p in patterns)
+        self.directory = directory
+        self.board = board
+
+        seen = [t for p in self.patterns for t in p]
+        if len(seen) != len(set(seen)) or not set(seen) <= set(range(1, board.size)):
+            raise ValueError(f"patterns must be disjoint sets of tiles 1..{board.size - 1}")
+
+        self.tables: List[memoryview] = [
+            load_pattern_table(p, default_path(p, directory, board), board=board) for p in self.patterns
+        ]
+        # Stein → (Nummer des Patterns, das ihn enthält); für delta()
+        self._pattern_of: Dict[int, int] = {t: i for i, p in enumerate(self.patterns) for t in p}
+        # Stein → Stelle innerhalb seines Patterns; zuletzt gesehener Eltern-Knoten je Pattern
+        self._slot: Dict[int, int] = {t: j for p in self.patterns for j, t in enumerate(p)}
+        self._members: List[frozenset] = [frozenset(p) for p in self.patterns]
+        self._parents: List[Optional[Tuple[int, List[int], int]]] = [None] * len(self.patterns)
+        # Name wie bei den Heuristik-Funktionen (search.a_star nutzt h.__name__)
+        self.__name__ = "pdb_" + "_".join(str(len(p)) for p in self.patterns)
+
+    def __call__(self, s: PuzzleState) -> int:
+        n_cells = self.board.size
+        where = [0] * n_cells
+        for i, t in enumerate(s.tiles):
+            where[t] = i
+        return sum(
+            table[placement_index([where[t] for t in pattern], n_cells)]
+            for pattern, table in zip(self.patterns, self.tables)
+        )
+
+    def delta(self, code: int, tile: int, src: int, dst: int) -> int:
+        i = self._pattern_of.get(tile)
+        if i is None:   # Stein gehört zu keinem Pattern → Wert unverändert
+            return 0
+        table = self.tables[i]
+        # Eltern-Board: Stein zurück auf src, Leerfeld auf dst. Geschwister teilen sich
+        # den Eltern-Knoten → dessen Pattern-Positionen nur einmal aus dem Board lesen
+        bits = self.board.bits_per_cell
+        n_cells = self.board.size
+        parent_code = code ^ (tile << (bits * dst)) ^ (tile << (bits * src))
+        cached = self._parents[i]
+        if cached is None or cached[0] != parent_code:
+            positions = self._positions(parent_code, i)
+            cached = self._parents[i] = (parent_code, positions, table[placement_index(positions, n_cells)])
+        _, parent, parent_h = cached
+        # Nur der Eintrag des bewegten Steins ändert sich
+        child = parent.copy()
+        child[self._slot[tile]] = dst
+        return table[placement_index(child, n_cells)] - parent_h
+
+    def _positions(self, code: int, i: int) -> List[int]:
+        # Felder der Steine von Pattern i im gepackten Board
+        slot = self._slot
+        members = self._members[i]
+        bits, mask = self.board.bits_per_cell, self.board.cell_mask
+        positions = [0] * len(self.patterns[i])
+        for cell in range(self.board.size):
+            t = (code >> (bits * cell)) & mask
+            if t in members:
+                positions[slot[t]] = cell
+        return positions
+
+    def for_board(self, board: Board) -> "AdditivePDB":
+        # Siehe heuristics.for_board(): eigenes Board → self, sonst dessen Standard-Aufteilung
+        if board is self.board:
+            return self
+        return AdditivePDB(directory=self.directory, board=board)
+
+    def __reduce__(self):
+        # Worker-Prozesse laden die Tabellen selbst per mmap (geteilte Seiten statt Kopien)
+        return (self.__class__, (self.patterns, self.directory, self.board))
+
+    def __repr__(self) -> str:
+        if self.board is DEFAULT_BOARD:
+            return f"AdditivePDB(patterns={self.patterns!r})"
+        return f"AdditivePDB(patterns={self.patterns!r}, board={self.board!r})"
+
+
+_default_pdb: Optional[AdditivePDB] = None
+
+
+def pdb(s: PuzzleState) -> int:
+    """Default additive PDB heuristic (DEFAULT_PARTITIONS of the board), loaded on first use."""
+    if s.board is not DEFAULT_BOARD:  # andere Boardgröße → Tabellen dieses Boards
+        return for_board(pdb, s.board)(s)
+    return _get_default_pdb()(s)
+
+
+def _get_default_pdb() -> AdditivePDB:
+    global _default_pdb
+    if _default_pdb is None:
+        _default_pdb = AdditivePDB()
+    return _default_pdb
+
+
+def _pdb_delta(code: int, tile: int, src: int, dst: int) -> int:
+    return _get_default_pdb().delta(code, tile, src, dst)
+
+
+pdb.delta = _pdb_delta  # type: ignore[attr-defined]
+
+
+def _pdb_for_board(board: Board) -> AdditivePDB:
+    # Tabellen nur für Boards mit Standard-Aufteilung (3x3, 4x4) und Standardziel
+    if board.shape not in DEFAULT_PARTITIONS:
+        raise ValueError(f"pattern databases only exist for the 3x3 and 4x4 boards, not {board}")
+    return AdditivePDB(board=board)
+
+
+pdb.for_board = _pdb_for_board  # type: ignore[attr-defined]
+
+
+# ------------------------------ Self-test ------------------------------------
+
+if __name__ == "__main__":
+    from .heuristics import manhattan
+
+    s = PuzzleState((8, 6, 7, 2, 5, 4, 3, 0, 1))
+    for name, partition in PARTITIONS.items():
+        h = AdditivePDB(partition)
+        print(f"{name}: h={h(s)}  (Manhattan={manhattan(s)})")
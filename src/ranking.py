@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from array import array
+from math import factorial
+from typing import Iterable, List, Tuple
+
+from .state import PuzzleState, GOAL, N
+
+# ----------------------------- Rank space ------------------------------------
+# Jeder lösbare Zustand bekommt eine dichte Nummer in 0 .. 9!/2 - 1.
+# Aufbau des Ranks: blank_index * HALF + Teil-Lehmer-Code der 8 Steine.
+# Die Steine (ohne Leerfeld, in Lesereihenfolge) bilden beim lösbaren 8-Puzzle
+# immer eine gerade Permutation → die letzten beiden Steine sind durch die
+# Parität festgelegt und müssen nicht mitkodiert werden.
+
+N_CELLS = N * N
+N_TILES = N_CELLS - 1                     # 8 echte Steine
+HALF = factorial(N_TILES) // 2            # 20160 gerade Permutationen der Steine
+N_STATES = N_CELLS * HALF                 # 181440 lösbare Zustände
+
+
+# ------------------------------- rank ----------------------------------------
+
+def rank_tiles(tiles: Tuple[int, ...]) -> int:
+    """
+    Return the dense rank (0 .. N_STATES-1) of a solvable tile tuple.
+
+    Raises
+    ------
+    ValueError
+        If `tiles` is not a solvable 3x3 configuration (its rank would
+        collide with a solvable one).
+    """
+    if len(tiles) != N_CELLS:
+        raise ValueError(f"ranks only exist for the 3x3 board, got {len(tiles)} tiles")
+    blank = tiles.index(0)
+    used = 0          # Bitmaske der bereits verwendeten Steine
+    r = 0
+    parity = 0
+    i = 0
+    for v in tiles:
+        if v == 0:
+            continue
+        v -= 1        # Steine 1..8 → 0..7
+        # Lehmer-Ziffer: wie viele noch unbenutzte Steine sind kleiner als v?
+        d = v - (used & ((1 << v) - 1)).bit_count()
+        used |= 1 << v
+        parity += d
+        if i < N_TILES - 2:
+            r = r * (N_TILES - i) + d   # gemischtes Zahlensystem mit Basen 8, 7, ..., 3
+        i += 1
+    if parity % 2:   # bei ungerader Breite ist jede lösbare Permutation gerade, egal wo das Leerfeld steht
+        raise ValueError(f"state {tiles} is not solvable and has no rank")
+    return blank * HALF + r
+
+
+def rank(s: PuzzleState) -> int:
+    """Return the dense rank of a PuzzleState (see rank_tiles)."""
+    return rank_tiles(s.tiles)
+
+
+# ------------------------------ unrank ---------------------------------------
+
+def unrank_tiles(r: int) -> Tuple[int, ...]:
+    """Inverse of rank_tiles(): return the tile tuple with rank `r`."""
+    if not 0 <= r < N_STATES:
+        raise ValueError(f"rank must be in 0..{N_STATES - 1}, got {r}")
+    blank, rem = divmod(r, HALF)
+
+    # Ziffern des gemischten Zahlensystems von hinten nach vorne auslesen
+    digits = [0] * (N_TILES - 2)
+    for i in range(N_TILES - 3, -1, -1):
+        rem, digits[i] = divmod(rem, N_TILES - i)
+
+    remaining = list(range(1, N_TILES + 1))
+    seq: List[int] = [remaining.pop(d) for d in digits]
+    # Die letzten beiden Steine aufsteigend anhängen und bei falscher Parität tauschen
+    a, b = remaining
+    if sum(digits) % 2:
+        a, b = b, a
+    seq.append(a)
+    seq.append(b)
+
+    seq.insert(blank, 0)   # Leerfeld an seine Position einsetzen
+    return tuple(seq)
+
+
+def unrank(r: int) -> PuzzleState:
+    """Return the PuzzleState with dense rank `r`."""
+    return PuzzleState._unchecked(unrank_tiles(r), r // HALF)  # Leerfeld-Index steckt im Rank
+
+
+# ------------------------------- batch ---------------------------------------
+
+def rank_batch(states: Iterable[PuzzleState]) -> array:
+    """Rank many states at once; returns a compact array('I') of ranks."""
+    return array("I", (rank_tiles(s.tiles) for s in states))
+
+
+def unrank_batch(ranks: Iterable[int]) -> List[PuzzleState]:
+    """Unrank many ranks at once, preserving order."""
+    return [unrank(r) for r in ranks]
+
+
+GOAL_RANK: int = rank_tiles(GOAL)
+
+
+# ------------------------------ Self-test ------------------------------------
+
+if __name__ == "__main__":
+    # Stichprobe: rank/unrank müssen exakt invers zueinander sein
+    for r in range(0, N_STATES, 997):
+        assert rank_tiles(unrank_tiles(r)) == r
+    print("N_STATES =", N_STATES, "GOAL_RANK =", GOAL_RANK)
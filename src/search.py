@@ -1,15 +1,48 @@
 from __future__ import annotations
 
+import math
 import time
-import heapq
 from dataclasses import dataclass, field
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
-from .state import PuzzleState, GOAL
+from .state import PuzzleState, Board, ACTIONS, MOVE_CODE, MOVE_LETTERS, LazyPath
+from .utils import is_solvable
+from .openlist import OPEN_LISTS, HeapOpenList, OpenList
+from .metrics import effective_branching_factor
+from .hooks import SearchHooks, bind_hook
+from .heuristics import for_board, for_goal, zero_heuristic
 
 
 # ---------------------------- Result structure -------------------------------
 
+@dataclass
+class SearchStats:
+    """
+    Optional instrumentation of one search (a_star/ida_star with instrument=True).
+    Shows whether a run is heuristic-bound (h_calls, h_time_s) or
+    data-structure-bound (generated, stale_pops, peak_open, peak_closed).
+    """
+    # Erzeugte Nachfolger (inklusive solcher, die sofort verworfen werden)
+    generated: int = 0
+    # Einträge, die aus der Open-List kamen, obwohl der Zustand schon geschlossen war
+    stale_pops: int = 0
+    # Offene Zustände, die über einen kürzeren Weg erneut eingefügt wurden
+    reopened: int = 0
+    # Größte Open-List (A*: Einträge inkl. veralteter; IDA*: tiefster Pfad)
+    peak_open: int = 0
+    # Größte Closed-List (IDA* speichert keine → 0)
+    peak_closed: int = 0
+    # Aufrufe von h bzw. h.delta und die darin verbrachte Zeit
+    h_calls: int = 0
+    h_time_s: float = 0.0
+    # Effektiver Verzweigungsfaktor (nur bei gelösten Suchen, sonst 0.0)
+    branching_factor: float = 0.0
+
+
+# Spaltennamen der Instrumentierung (CSV, Zusammenfassung)
+STATS_FIELDS: Tuple[str, ...] = tuple(SearchStats.__dataclass_fields__)
+
+
 @dataclass
 class SearchResult:
     # Wurde eine Lösung gefunden? (True/False)
@@ -24,92 +57,242 @@ class SearchResult:
     heuristic: str
     # Startzustand, von dem aus die Suche gestartet wird (als tupel)
     start_state: Tuple[int, ...]
-    # kompletter Pfad von Start bis Ziel (Liste von PuzzleStates)
-    path: Optional[List[PuzzleState]] = field(default=None)
+    # kompletter Pfad von Start bis Ziel (Liste von PuzzleStates; bei a_star/ida_star ein
+    # LazyPath, der die Zustände erst beim Zugriff aus `moves` erzeugt)
+    path: Optional[Sequence[PuzzleState]] = field(default=None)
+    # Warum die Suche endete: "solved", "exhausted" (kein Ziel erreichbar) oder ein
+    # Budget-Abbruch ("node_limit", "timeout", "memory_limit"); leer → aus solved abgeleitet
+    status: str = ""
+    # Bei Budget-Abbruch: größtes sicher erreichtes f (untere Schranke der optimalen Tiefe)
+    lower_bound: Optional[int] = None
+    # Zähler der Suche, nur wenn mit instrument=True gesucht wurde
+    stats: Optional[SearchStats] = None
+    # Lösung als Zugfolge des Leerfeldes (Buchstaben aus state.MOVE_LETTERS, z. B. "ULDR");
+    # None, wenn nicht gelöst oder mit store_path=False gesucht
+    moves: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if not self.status:
+            self.status = "solved" if self.solved else "exhausted"
+
+
+@dataclass(frozen=True)
+class Incumbent:
+    """A solution reported by ara_star() while it keeps improving."""
+    # Länge der Lösung und garantierte Schranke: depth ≤ bound · optimale Länge
+    depth: int
+    bound: float
+    # Gewicht der Runde, die die Lösung gefunden hat
+    weight: float
+    # Expansionen und Laufzeit bis zu diesem Zeitpunkt
+    expanded: int
+    runtime_s: float
+    # Zugfolge (None bei store_path=False)
+    moves: Optional[str] = None
+
+
+# Prüfintervall für die Uhr: time.perf_counter() nur alle 256 Expansionen aufrufen
+_CLOCK_CHECK_MASK = 0xFF
 
 
 # ------------------------------- A* search -----------------------------------
 
-def a_star(start: PuzzleState, h: Callable[[PuzzleState], int]) -> SearchResult:
+def a_star(
+    start: PuzzleState,
+    h: Callable[[PuzzleState], int],
+    open_list: str = "heap",
+    max_expanded: Optional[int] = None,
+    time_limit: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+    instrument: bool = False,
+    hooks: Optional[SearchHooks] = None,
+    store_path: bool = True,
+    weight: float = 1,
+) -> SearchResult:
     """
    Führt den A* Suchalgorithmus aus, um den kürzesten Weg zum
-   Zielzustand des 8-Puzzles zu finden. Nutzt die übergebenen Heuristikfunktionen h.
+   Zielzustand des 8-Puzzles (oder eines größeren n x n Boards, je nach start.board)
+   zu finden. Nutzt die übergebenen Heuristikfunktionen h, für andere Boards
+   spezialisiert über heuristics.for_board().
+   open_list wählt die Open-List-Implementierung (siehe openlist.OPEN_LISTS):
+   "heap" (Standard) oder "bucket" (O(1) für ganzzahlige f, tiefere g zuerst).
+   Optionale Budgets (None = unbegrenzt) beenden die Suche sauber:
+   max_expanded → status "node_limit", time_limit in Sekunden → "timeout",
+   max_nodes (Einträge in Open- plus Closed-List) → "memory_limit".
+   instrument=True füllt SearchResult.stats (siehe SearchStats); h wird dann
+   zusätzlich gezählt und gestoppt.
+   hooks (siehe hooks.SearchHooks) erhält on_expand/on_generate/on_f_layer/
+   on_goal/on_finish-Ereignisse; nicht überschriebene Hooks werden nie aufgerufen.
+   Die Lösung kommt als Zugstring (SearchResult.moves) plus LazyPath; mit
+   store_path=False werden keine Parent-Pointer gespeichert und nur depth berichtet.
+   weight > 1 macht daraus Weighted A* (f = g + weight·h): deutlich weniger
+   Expansionen, die Lösung ist aber nur garantiert höchstens weight-mal so lang
+   wie die optimale. Die Bucket-Open-List und hooks brauchen ganzzahlige Gewichte.
    Gibt ein SearchResult mit allen relevanten Such-Informationen zurück.
     """
     # Startzeit für Laufzeitmessung
     t0 = time.perf_counter()
+    deadline = t0 + time_limit if time_limit is not None else None
+    budgeted = max_expanded is not None or max_nodes is not None or deadline is not None
     # Name der verwendeten Heuristik extrahieren
     heuristic_name = h.__name__.capitalize()
+    # Tabellen des Boards (beim 8-Puzzle die 3x3-Tabellen) einmal in lokale Variablen holen
+    board = start.board
+    h = for_board(h, board)
+    goal_code = board.goal_code
+    bits, mask = board.bits_per_cell, board.cell_mask
+    expand = board.packed_neighbors
+    # Inkrementelle Heuristiken (siehe heuristics.IncrementalHeuristic) berechnen h(Kind)
+    # aus h(Eltern) + delta, statt das ganze Board neu auszuwerten
+    h_delta = getattr(h, "delta", None)
+    if weight != 1:
+        weight = _check_weight(weight, open_list)
+        if hooks is not None and not isinstance(weight, int):
+            # SearchHooks (und das Trace-Format) sehen nur ganzzahlige f
+            raise ValueError("search hooks need integer f-values; use an integer weight or no hooks")
+        h, h_delta = _weighted(h, weight), h_delta and _weighted(h_delta, weight)
+    stats = SearchStats() if instrument else None
+    if stats is not None:
+        h, h_delta = _timed(h, stats), h_delta and _timed(h_delta, stats)
+    # Nur überschriebene Hooks binden; alle anderen bleiben None (ein Vergleich pro Ereignis)
+    on_expand = bind_hook(hooks, "on_expand")
+    on_generate = bind_hook(hooks, "on_generate")
+    on_f_layer = bind_hook(hooks, "on_f_layer")
+    on_goal = bind_hook(hooks, "on_goal")
+    on_finish = bind_hook(hooks, "on_finish")
+    layer_f = -1            # f der aktuellen f-Schicht (für on_f_layer)
 
-    # Priority Queue (Open-List): speichert Zustände sortiert nach f = g + h
-    open_heap: List[Tuple[int, int, int, PuzzleState]] = []  # (f, g, tie, state)
-    # g_score: bisher bekannte beste Kosten vom Start zu einem Zustand
-    g_score: Dict[PuzzleState, int] = {start: 0}
-    # came_from: merkt sich, von welchem Zustand man gekommen ist für die Pfadrekontruktion
-    came_from: Dict[PuzzleState, Optional[PuzzleState]] = {start: None}
+    # Intern arbeitet die Suche auf gepackten Boards (ein int pro Zustand, siehe state.pack_tiles):
+    # Hashing und Vergleich in g_score/closed sind damit reine int-Operationen
+    start_code = start.packed()
+    start_blank = start.blank
+
+    # Open-List: liefert Zustände sortiert nach f = g + h; item = (code, blank, parent_blank)
+    if open_list not in OPEN_LISTS:
+        raise ValueError(f"unknown open_list {open_list!r}; choose from {', '.join(OPEN_LISTS)}")
+    open_nodes: OpenList = OPEN_LISTS[open_list]()
+    push = open_nodes.push
+    pop = open_nodes.pop
+    # g_score: bisher bekannte beste Kosten vom Start zu einem Zustand, zusammen mit dem
+    # Parent-Pointer als 2-Bit-Zugcode: Wert = g << 2 | Zug (Index in state.ACTIONS).
+    # Der Vorgänger ergibt sich durch Rückgängigmachen des Zuges → kein came_from-Dict nötig
+    g_score: Dict[int, int] = {start_code: 0}
+    move_code = MOVE_CODE if store_path else _NO_MOVE_CODE
 
     expanded_nodes = 0      # Zählt, wie viele Zustände tatsächlich erweitert wurden
-    tie_counter = 0         # Tie-breaker für Heap, falls f-Werte gleich sind
+    generated = stale_pops = reopened = peak_open = 0   # Zähler für SearchStats
 
-    # Startzustand in Priority Queue einfügen
+    # Startzustand in die Open-List einfügen
     f0 = h(start)   # f = g(=0) + h(start)
-    heapq.heappush(open_heap, (f0, 0, tie_counter, start))
+    push(f0, 0, (start_code, start_blank, -1))
+    if on_generate is not None:
+        on_generate(start_code, start_blank, 0, f0)
     # Closed-List: Zustände, die vollständig verarbeitet wurden
-    closed: set[PuzzleState] = set()
+    closed: set[int] = set()
 
     # Hauptschleife
-    while open_heap:
-        # Besten zustand (kleinstes f) entnehmen
-        f, g, _, current = heapq.heappop(open_heap)
+    while True:
+        # Besten zustand (kleinstes f) entnehmen; leere Open-List → keine Lösung
+        try:
+            f, g, (current, blank, parent_blank) = pop()
+        except IndexError:
+            break
 
         # wenn Zustand bereits verarbeitet wurde --> überspringen
         if current in closed:
+            stale_pops += 1
             continue
+        if stats is not None and len(open_nodes) >= peak_open:
+            peak_open = len(open_nodes) + 1   # +1: der gerade entnommene Eintrag
+
+        # Budgets prüfen, bevor weiterer Aufwand entsteht
+        if budgeted and (status := _budget_status(
+            expanded_nodes, len(open_nodes) + len(closed), max_expanded, max_nodes, deadline,
+        )):
+            return _finished(on_finish, SearchResult(
+                solved=False,
+                depth=0,
+                expanded=expanded_nodes,
+                runtime_s=time.perf_counter() - t0,
+                heuristic=heuristic_name,
+                start_state=start.tiles,
+                path=None,
+                status=status,
+                # zulässige Heuristik: keine Lösung ist kürzer als das kleinste offene f (bzw. f / weight)
+                lower_bound=f if weight == 1 else _weighted_bound(f, weight),
+                stats=_fill_stats(
+                    stats, generated, stale_pops, reopened, peak_open, len(closed), expanded_nodes, 0,
+                ),
+            ))
+
+        if on_f_layer is not None and f > layer_f:
+            layer_f = f
+            on_f_layer(f, expanded_nodes)
 
         # Zustand als abgeschlossen markieren
         closed.add(current)
         expanded_nodes += 1  # measure memory effort
+        if on_expand is not None:
+            on_expand(current, blank, g, f)
 
         # Zieltest: Ist der aktuelle Zustand das Ziel?
-        if current.is_goal():
+        if current == goal_code:
             t1 = time.perf_counter()
+            if on_goal is not None:
+                on_goal(current, g)
 
-            # Pfad vom Start zur Lösung rekonstruieren
-            path = _reconstruct_path(came_from, current)
+            # Zugfolge vom Start zur Lösung rekonstruieren (Zustände erst bei Bedarf)
+            moves = _reconstruct_moves(g_score, current, blank, start_code, board) if store_path else None
 
             # ergebnisobjekt zurückgeben
-            return SearchResult(
+            return _finished(on_finish, SearchResult(
                 solved=True,
-                depth=len(path) - 1,
+                depth=g,
                 expanded=expanded_nodes,
                 runtime_s=t1 - t0,
                 heuristic=heuristic_name,
                 start_state=start.tiles,
-                path=path,
-            )
+                path=LazyPath(start, moves) if moves is not None else None,
+                stats=_fill_stats(
+                    stats, generated, stale_pops, reopened, peak_open, len(closed), expanded_nodes, g,
+                ),
+                moves=moves,
+            ))
 
-        # Alle nachbarn (Folgezustände) des aktuellen Zustands durchgehen
-        for neighbor, action, cost in current.neighbors():
-            tentative_g = g + cost  # neue Kostenberechnung
+        # Alle nachbarn (Folgezustände) des aktuellen Zustands durchgehen,
+        # der Gegenzug zum Vorgänger wird dabei gar nicht erst erzeugt
+        children = expand(current, blank, parent_blank)
+        generated += len(children)
+        for neighbor, neighbor_blank, action in children:
+            tentative_g = g + 1  # neue Kostenberechnung (jeder Zug kostet 1)
 
             # Bereits abgeschlossene Zustände ignorieren
             if neighbor in closed:
                 continue
 
             # wenn noch kein g-Wert existiert oder der neue Weg besser ist
-            if neighbor not in g_score or tentative_g < g_score[neighbor]:
-                g_score[neighbor] = tentative_g
-                came_from[neighbor] = current   # Vorgänger speichern
-                tie_counter += 1
+            old = g_score.get(neighbor)
+            if old is None or tentative_g < old >> 2:
+                if old is not None:
+                    reopened += 1   # alter Open-Eintrag wird dadurch später zum stale pop
+                g_score[neighbor] = tentative_g << 2 | move_code[action]   # g + Vorgänger-Zug
 
                 # f = neuer g-Wert + Heuristik
-                f_val = tentative_g + h(neighbor)
-                # Nachbar in Priority Queue einfügen
-                heapq.heappush(open_heap, (f_val, tentative_g, tie_counter, neighbor))
+                if h_delta is not None:
+                    # Der Stein von Feld neighbor_blank ist auf das alte Leerfeld `blank` gerutscht
+                    tile = (neighbor >> (bits * blank)) & mask
+                    f_val = tentative_g + (f - g) + h_delta(neighbor, tile, neighbor_blank, blank)
+                else:
+                    # Heuristiken erwarten einen PuzzleState; der Nachfolger ist garantiert gültig
+                    f_val = tentative_g + h(PuzzleState._unchecked(board.unpack(neighbor), neighbor_blank, board))
+                # Nachbar in die Open-List einfügen
+                push(f_val, tentative_g, (neighbor, neighbor_blank, blank))
+                if on_generate is not None:
+                    on_generate(neighbor, neighbor_blank, tentative_g, f_val)
 
     # Falls kein Ziel gefunden wurde: Ergebnis mit solved=False zurückgeben
     t1 = time.perf_counter()
-    return SearchResult(
+    return _finished(on_finish, SearchResult(
         solved=False,
         depth=0,
         expanded=expanded_nodes,
@@ -117,28 +300,700 @@ def a_star(start: PuzzleState, h: Callable[[PuzzleState], int]) -> SearchResult:
         heuristic=heuristic_name,
         start_state=start.tiles,
         path=None,
+        stats=_fill_stats(stats, generated, stale_pops, reopened, peak_open, len(closed), expanded_nodes, 0),
+    ))
+
+
+# ------------------------------- IDA* search ---------------------------------
+
+def ida_star(
+    start: PuzzleState,
+    h: Callable[[PuzzleState], int],
+    max_expanded: Optional[int] = None,
+    time_limit: Optional[float] = None,
+    instrument: bool = False,
+    store_path: bool = True,
+) -> SearchResult:
+    """
+    Iterative Deepening A*: Tiefensuche mit wachsender f-Schranke.
+    Speichert keine g_score/came_from/closed-Strukturen, sondern verändert ein
+    einziges veränderbares Board direkt (und macht Züge beim Zurückgehen rückgängig).
+    Nutzt inkrementelle Heuristiken (h.delta) und Parent-Move-Pruning.
+    max_expanded und time_limit begrenzen die Suche wie bei a_star(); ein
+    Speicherbudget entfällt, da IDA* nur den aktuellen Pfad speichert.
+    instrument=True füllt SearchResult.stats; peak_open ist hier der tiefste Pfad.
+    store_path=False liefert wie bei a_star() nur depth, ohne moves/path.
+    Gibt dasselbe SearchResult wie a_star() zurück; expanded zählt über alle Iterationen.
+    """
+    t0 = time.perf_counter()
+    deadline = t0 + time_limit if time_limit is not None else None
+    budgeted = max_expanded is not None or deadline is not None
+    heuristic_name = h.__name__.capitalize()
+    # Board-Tabellen (Name `tables`, da `board` unten das veränderbare Spielfeld ist)
+    tables = start.board
+    h = for_board(h, tables)
+    goal_code = tables.goal_code
+    bits = tables.bits_per_cell
+    packed_moves = tables.packed_moves
+    h_delta = getattr(h, "delta", None)
+    stats = SearchStats() if instrument else None
+    if stats is not None:
+        h, h_delta = _timed(h, stats), h_delta and _timed(h_delta, stats)
+
+    # Unlösbare Zustände würden die Schranke endlos erhöhen → sofort abbrechen
+    if not is_solvable(start.tiles, tables.shape):
+        return SearchResult(
+            solved=False,
+            depth=0,
+            expanded=0,
+            runtime_s=time.perf_counter() - t0,
+            heuristic=heuristic_name,
+            start_state=start.tiles,
+            path=None,
+            stats=stats,
+        )
+
+    board = list(start.tiles)        # das einzige Board, wird in-place verändert
+    code = start.packed()            # gepackte Kopie für Zieltest und h.delta
+    blank_path: List[int] = []       # Leerfeld-Positionen entlang des aktuellen Pfades
+    expanded_nodes = 0
+    deepest = 0                      # längster betretener Pfad (nur mit instrument)
+    found = False
+    bound = h(start)
+
+    def dfs(g: int, h_val: int, blank: int, parent_blank: int) -> float:
+        # Gibt das kleinste f zurück, das die aktuelle Schranke überschreitet
+        nonlocal code, expanded_nodes, found, deepest
+        f = g + h_val
+        if f > bound:
+            return f
+        if stats is not None and g > deepest:
+            deepest = g
+        if budgeted and (status := _budget_status(expanded_nodes, 0, max_expanded, None, deadline)):
+            raise _BudgetExceeded(status)
+        expanded_nodes += 1
+        if code == goal_code:
+            found = True
+            return f
+
+        minimum = math.inf
+        blank_shift = bits * blank
+        for j, shift, _ in packed_moves[blank]:
+            if j == parent_blank:  # Gegenzug überspringen
+                continue
+            # Zug ausführen: Stein von j auf das Leerfeld schieben
+            tile = board[j]
+            board[blank] = tile
+            board[j] = 0
+            code ^= (tile << shift) ^ (tile << blank_shift)
+            if h_delta is not None:
+                child_h = h_val + h_delta(code, tile, j, blank)
+            else:
+                child_h = h(PuzzleState._unchecked(tuple(board), j, tables))
+            blank_path.append(j)
+
+            t = dfs(g + 1, child_h, j, blank)
+            if found:
+                return t  # Board/Pfad bleiben im Zielzustand stehen
+
+            # Zug rückgängig machen
+            blank_path.pop()
+            code ^= (tile << shift) ^ (tile << blank_shift)
+            board[j] = tile
+            board[blank] = 0
+            if t < minimum:
+                minimum = t
+        return minimum
+
+    h0 = bound
+    while True:
+        try:
+            t = dfs(0, h0, start.blank, -1)
+        except _BudgetExceeded as stop:
+            # Alle f < bound wurden in früheren Iterationen ohne Ziel durchsucht
+            return SearchResult(
+                solved=False,
+                depth=0,
+                expanded=expanded_nodes,
+                runtime_s=time.perf_counter() - t0,
+                heuristic=heuristic_name,
+                start_state=start.tiles,
+                path=None,
+                status=stop.status,
+                lower_bound=bound,
+                stats=_ida_stats(stats, deepest, expanded_nodes, 0),
+            )
+        if found or t == math.inf:
+            break
+        bound = t  # nächste Iteration mit der kleinsten überschrittenen f-Schranke
+
+    t1 = time.perf_counter()
+    if not found:
+        return SearchResult(
+            solved=False,
+            depth=0,
+            expanded=expanded_nodes,
+            runtime_s=t1 - t0,
+            heuristic=heuristic_name,
+            start_state=start.tiles,
+            path=None,
+            stats=_ida_stats(stats, deepest, expanded_nodes, 0),
+        )
+
+    # Leerfeld-Positionen in Zugbuchstaben übersetzen; Zustände erst bei Bedarf (LazyPath)
+    moves = None
+    if store_path:
+        prev = start.blank
+        offset_letter = dict(zip(tables.move_offset, MOVE_LETTERS))   # Leerfeld-Verschiebung → Zugbuchstabe
+        letters = []
+        for j in blank_path:
+            letters.append(offset_letter[j - prev])
+            prev = j
+        moves = "".join(letters)
+
+    return SearchResult(
+        solved=True,
+        depth=len(blank_path),
+        expanded=expanded_nodes,
+        runtime_s=t1 - t0,
+        heuristic=heuristic_name,
+        start_state=start.tiles,
+        path=LazyPath(start, moves) if moves is not None else None,
+        stats=_ida_stats(stats, deepest, expanded_nodes, len(blank_path)),
+        moves=moves,
     )
 
 
+# --------------------------- Bidirectional search ----------------------------
+# Sucht gleichzeitig vorwärts (Start → Ziel) und rückwärts (Ziel → Start), bis sich
+# beide Suchen treffen. Mit zero_heuristic ist das eine bidirektionale Breitensuche:
+# zwei Suchbäume der Tiefe ~d/2 statt einem der Tiefe d. Mit einer echten Heuristik
+# läuft MM (Holte et al. 2016): front-to-end A* in beide Richtungen mit der Priorität
+# max(f, 2g), sodass sich beide Hälften in der Mitte des Lösungsweges treffen.
+
+def bidirectional(
+    start: PuzzleState,
+    h: Callable[[PuzzleState], int],
+    open_list: str = "heap",
+    max_expanded: Optional[int] = None,
+    time_limit: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+    instrument: bool = False,
+    store_path: bool = True,
+) -> SearchResult:
+    """
+    Bidirektionale Suche mit demselben SearchResult wie a_star().
+    zero_heuristic → bidirektionale Breitensuche (Schicht für Schicht, immer die
+    kleinere Front zuerst); jede andere Heuristik → MM. Rückwärts schätzt h die
+    Distanz zum Startzustand (siehe heuristics.for_goal()); Heuristiken, die nur
+    das Standardziel kennen (PDB, Perfect), laufen rückwärts als zero_heuristic.
+    open_list, Budgets, instrument und store_path wie bei a_star(); max_nodes
+    zählt die gespeicherten Zustände beider Richtungen, expanded die Expansionen
+    beider Richtungen zusammen.
+    """
+    t0 = time.perf_counter()
+    deadline = t0 + time_limit if time_limit is not None else None
+    budget = (max_expanded, max_nodes, deadline)
+    heuristic_name = h.__name__.capitalize()
+    board = start.board
+    if open_list not in OPEN_LISTS:
+        raise ValueError(f"unknown open_list {open_list!r}; choose from {', '.join(OPEN_LISTS)}")
+    stats = SearchStats() if instrument else None
+
+    start_code = start.packed()
+    g_fwd: Dict[int, int] = {start_code: 0}             # g << 2 | Zug, wie g_score in a_star
+    g_bwd: Dict[int, int] = {board.goal_code: 0}
+    move_code = MOVE_CODE if store_path else _NO_MOVE_CODE
+    roots = ((start_code, start.blank), (board.goal_code, board.goal_blank))
+
+    if not is_solvable(start.tiles, board.shape):
+        # Start und Ziel liegen in verschiedenen Hälften des Zustandsraums → nie ein Treffen
+        status, value, meet, expanded, counters = "exhausted", 0, None, 0, (0, 0, 0, 0, 0)
+    elif start_code == board.goal_code:
+        status, value, meet, expanded, counters = "solved", 0, roots[0], 0, (0, 0, 0, 0, 0)
+    elif h is zero_heuristic:
+        status, value, meet, expanded, counters = _bfs_meet(board, roots, (g_fwd, g_bwd), move_code, budget)
+    else:
+        h_fwd = for_board(h, board)
+        h_bwd = for_goal(h, board, start.tiles) or zero_heuristic
+        heuristics = tuple((fn, getattr(fn, "delta", None)) for fn in (h_fwd, h_bwd))
+        if stats is not None:
+            heuristics = tuple((_timed(fn, stats), delta and _timed(delta, stats)) for fn, delta in heuristics)
+        status, value, meet, expanded, counters = _mm_meet(
+            board, roots, (g_fwd, g_bwd), heuristics, OPEN_LISTS[open_list], move_code, budget,
+            (start, PuzzleState._unchecked(board.goal, board.goal_blank, board)),
+        )
+    t1 = time.perf_counter()
+    solved = status == "solved"
+
+    moves = None
+    if solved and store_path:
+        # Vorwärtsteil Start → Treffpunkt; Rückwärtsteil Ziel → Treffpunkt, umgedreht und invertiert
+        meet_code, meet_blank = meet
+        head = _reconstruct_moves(g_fwd, meet_code, meet_blank, start_code, board)
+        tail = _reconstruct_moves(g_bwd, meet_code, meet_blank, board.goal_code, board)
+        moves = head + tail[::-1].translate(_INVERSE_LETTER)
+
+    return SearchResult(
+        solved=solved,
+        depth=value if solved else 0,
+        expanded=expanded,
+        runtime_s=t1 - t0,
+        heuristic=heuristic_name,
+        start_state=start.tiles,
+        path=LazyPath(start, moves) if moves is not None else None,
+        status=status,
+        lower_bound=value if status not in ("solved", "exhausted") else None,
+        stats=_fill_stats(stats, *counters, expanded, value if solved else 0),
+        moves=moves,
+    )
+
+
+def _bfs_meet(board: Board, roots, g_dicts, move_code, budget):
+    """
+    Bidirectional BFS on packed boards. Returns (status, depth or lower bound,
+    meeting (code, blank), expanded, stats counters).
+    """
+    expand = board.packed_neighbors
+    max_expanded, max_nodes, deadline = budget
+    budgeted = max_expanded is not None or max_nodes is not None or deadline is not None
+    fronts = [[(code, blank, -1)] for code, blank in roots]
+    depth = [0, 0]          # Tiefe der jeweils letzten vollständig erzeugten Schicht
+    expanded = generated = peak_open = 0
+
+    def counters():
+        return generated, 0, 0, peak_open, len(g_dicts[0]) + len(g_dicts[1])
+
+    while fronts[0] and fronts[1]:
+        side = 0 if len(fronts[0]) <= len(fronts[1]) else 1   # kleinere Front erweitern
+        mine, other = g_dicts[side], g_dicts[1 - side]
+        child_g = depth[side] + 1
+        layer = []
+        for code, blank, parent_blank in fronts[side]:
+            if budgeted and (status := _budget_status(
+                expanded, len(mine) + len(other), max_expanded, max_nodes, deadline,
+            )):
+                # Jeder Weg mit höchstens depth[0] + depth[1] Zügen wäre schon getroffen worden
+                return status, depth[0] + depth[1] + 1, None, expanded, counters()
+            expanded += 1
+            children = expand(code, blank, parent_blank)
+            generated += len(children)
+            for child, child_blank, action in children:
+                if child in mine:
+                    continue
+                mine[child] = child_g << 2 | move_code[action]
+                found = other.get(child)
+                if found is not None:
+                    # Alle kürzeren Wege wären in früheren Schichten getroffen worden →
+                    # das erste Treffen ist optimal (Länge depth[0] + depth[1] + 1)
+                    return "solved", child_g + (found >> 2), (child, child_blank), expanded, counters()
+                layer.append((child, child_blank, blank))
+        fronts[side] = layer
+        depth[side] = child_g
+        peak_open = max(peak_open, len(fronts[0]) + len(fronts[1]))
+    return "exhausted", 0, None, expanded, counters()
+
+
+def _mm_meet(board: Board, roots, g_dicts, heuristics, open_list_cls, move_code, budget, root_states):
+    """
+    MM bidirectional heuristic search: always expand the side whose open list
+    has the smaller priority max(g + h, 2g); stop once the best meeting U is
+    at most that priority C. Same return value as _bfs_meet().
+    """
+    expand = board.packed_neighbors
+    bits, mask = board.bits_per_cell, board.cell_mask
+    max_expanded, max_nodes, deadline = budget
+    budgeted = max_expanded is not None or max_nodes is not None or deadline is not None
+    opens = [open_list_cls(), open_list_cls()]
+    closed = [set(), set()]
+    for side, ((code, blank), state) in enumerate(zip(roots, root_states)):
+        h0 = heuristics[side][0](state)
+        opens[side].push(h0, 0, (code, blank, -1, h0))   # item = (code, blank, parent_blank, h)
+    tops = [None, None]     # gültiger, schon entnommener Kopf jeder Open-List
+    best, meet = math.inf, None
+    expanded = generated = stale_pops = reopened = peak_open = 0
+
+    while True:
+        for side in (0, 1):
+            while tops[side] is None and opens[side]:
+                entry = opens[side].pop()
+                code = entry[2][0]
+                if code in closed[side] or g_dicts[side][code] >> 2 != entry[1]:
+                    stale_pops += 1   # inzwischen über einen kürzeren Weg erreicht
+                    continue
+                tops[side] = entry
+        counters = (generated, stale_pops, reopened, peak_open, len(closed[0]) + len(closed[1]))
+        if tops[0] is None or tops[1] is None:
+            # Eine Richtung hat ihren Zustandsraum erschöpft: das beste Treffen ist optimal
+            if meet is None:
+                return "exhausted", 0, None, expanded, counters
+            return "solved", best, meet, expanded, counters
+        bound = min(tops[0][0], tops[1][0])
+        if best <= bound:
+            return "solved", best, meet, expanded, counters
+        if budgeted and (status := _budget_status(
+            expanded, len(g_dicts[0]) + len(g_dicts[1]), max_expanded, max_nodes, deadline,
+        )):
+            return status, bound, None, expanded, counters
+        if peak_open <= len(opens[0]) + len(opens[1]):
+            peak_open = len(opens[0]) + len(opens[1]) + 2   # +2: die beiden entnommenen Köpfe
+
+        side = 0 if tops[0][0] <= tops[1][0] else 1
+        _, g, (code, blank, parent_blank, h_val) = tops[side]
+        tops[side] = None
+        closed[side].add(code)
+        expanded += 1
+        mine, other = g_dicts[side], g_dicts[1 - side]
+        h, h_delta = heuristics[side]
+        push = opens[side].push
+        child_g = g + 1
+        children = expand(code, blank, parent_blank)
+        generated += len(children)
+        for child, child_blank, action in children:
+            old = mine.get(child)
+            if old is not None:
+                if old >> 2 <= child_g:
+                    continue
+                # MM erweitert nicht in f-Reihenfolge → auch geschlossene Zustände wieder öffnen
+                reopened += 1
+                closed[side].discard(child)
+            mine[child] = child_g << 2 | move_code[action]
+            if h_delta is not None:
+                tile = (child >> (bits * blank)) & mask
+                child_h = h_val + h_delta(child, tile, child_blank, blank)
+            else:
+                child_h = h(PuzzleState._unchecked(board.unpack(child), child_blank, board))
+            push(max(child_g + child_h, 2 * child_g), child_g, (child, child_blank, blank, child_h))
+            found = other.get(child)
+            if found is not None and child_g + (found >> 2) < best:
+                best, meet = child_g + (found >> 2), (child, child_blank)
+
+
+# ------------------------------ Anytime search -------------------------------
+# ARA* (Likhachev et al. 2003): zuerst Weighted A* mit großem Gewicht → schnell eine
+# (suboptimale) Lösung; danach wird das Gewicht schrittweise bis 1 gesenkt. Jede
+# Runde verwendet die Suchergebnisse der vorherigen weiter: nur Zustände, deren g
+# sich verbessert hat (OPEN und INCONS), werden erneut expandiert.
+
+def ara_star(
+    start: PuzzleState,
+    h: Callable[[PuzzleState], int],
+    weight: float = 3.0,
+    weight_step: float = 0.5,
+    on_incumbent: Optional[Callable[[Incumbent], None]] = None,
+    max_expanded: Optional[int] = None,
+    time_limit: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+    instrument: bool = False,
+    store_path: bool = True,
+) -> SearchResult:
+    """
+    Anytime Repairing A*: liefert sofort eine Lösung (Weighted A* mit `weight`)
+    und verbessert sie, während das Gewicht in Schritten von `weight_step` auf 1
+    sinkt. Jede neue beste Lösung wird an on_incumbent(Incumbent) gemeldet,
+    zusammen mit ihrer garantierten Suboptimalitätsschranke.
+    Ohne Budget läuft die Suche bis zur bewiesenen optimalen Lösung. Endet ein
+    Budget (max_expanded, time_limit, max_nodes wie bei a_star()) vorher, ist
+    das Ergebnis die beste bisherige Lösung: solved=True, status = Budget-Status
+    und lower_bound = sicher bewiesene Mindestlänge; ohne jede Lösung solved=False.
+    expanded zählt über alle Runden.
+    """
+    t0 = time.perf_counter()
+    deadline = t0 + time_limit if time_limit is not None else None
+    budgeted = max_expanded is not None or max_nodes is not None or deadline is not None
+    weight = _check_weight(weight, "heap")
+    if weight_step <= 0:
+        raise ValueError(f"weight_step must be positive, got {weight_step}")
+    heuristic_name = h.__name__.capitalize()
+    board = start.board
+    h = for_board(h, board)
+    goal_code = board.goal_code
+    bits, mask = board.bits_per_cell, board.cell_mask
+    expand = board.packed_neighbors
+    h_delta = getattr(h, "delta", None)
+    stats = SearchStats() if instrument else None
+    if stats is not None:
+        h, h_delta = _timed(h, stats), h_delta and _timed(h_delta, stats)
+
+    start_code = start.packed()
+    g_score: Dict[int, int] = {start_code: 0}      # g << 2 | Zug, wie in a_star
+    move_code = MOVE_CODE if store_path else _NO_MOVE_CODE
+    h0 = h(start)
+    goal_g = 0 if start_code == goal_code else math.inf   # Länge der besten bekannten Lösung
+    # OPEN bzw. INCONS: code → (blank, h); INCONS hält Zustände, die in dieser Runde
+    # schon expandiert waren und danach einen kürzeren Weg bekommen haben
+    open_states: Dict[int, Tuple[int, int]] = {start_code: (start.blank, h0)}
+    incons: Dict[int, Tuple[int, int]] = {}
+    expanded_nodes = generated = stale_pops = reopened = peak_open = peak_closed = 0
+    best: Optional[Incumbent] = None
+    stop = ""
+
+    def floor() -> float:
+        # min g + h über OPEN ∪ INCONS: untere Schranke der optimalen Lösungslänge
+        pending = (*open_states.items(), *incons.items())
+        return min(((g_score[code] >> 2) + h_val for code, (_, h_val) in pending), default=math.inf)
+
+    def publish(bound: float) -> None:
+        # Neue beste Lösung (kürzer oder mit engerer Schranke) merken und melden
+        nonlocal best
+        bound = max(bound, 1.0)
+        if best is not None and goal_g >= best.depth and bound >= best.bound:
+            return
+        moves = _reconstruct_moves(g_score, goal_code, board.goal_blank, start_code, board) if store_path else None
+        best = Incumbent(
+            depth=int(goal_g),
+            bound=bound,
+            weight=weight,
+            expanded=expanded_nodes,
+            runtime_s=time.perf_counter() - t0,
+            moves=moves,
+        )
+        if on_incumbent is not None:
+            on_incumbent(best)
+
+    while True:
+        # ---- eine Runde: Weighted A* mit dem aktuellen Gewicht über OPEN ∪ INCONS
+        open_states.update(incons)
+        incons = {}
+        open_nodes = HeapOpenList()
+        for code, (blank, h_val) in open_states.items():
+            g = g_score[code] >> 2
+            open_nodes.push(g + weight * h_val, g, (code, blank, -1, h_val))
+        closed: set[int] = set()
+        while open_nodes:
+            f, g, item = open_nodes.pop()
+            code, blank, parent_blank, h_val = item
+            if code in closed or g_score[code] >> 2 != g:
+                stale_pops += 1
+                continue
+            if f >= goal_g:
+                break   # Runde fertig: mit diesem Gewicht ist keine bessere Lösung erreichbar
+            if budgeted and (stop := _budget_status(
+                expanded_nodes, len(open_nodes) + len(g_score), max_expanded, max_nodes, deadline,
+            )):
+                break
+            if stats is not None and len(open_nodes) >= peak_open:
+                peak_open = len(open_nodes) + 1
+            del open_states[code]
+            closed.add(code)
+            expanded_nodes += 1
+            children = expand(code, blank, parent_blank)
+            generated += len(children)
+            child_g = g + 1
+            for child, child_blank, action in children:
+                old = g_score.get(child)
+                if old is not None:
+                    if old >> 2 <= child_g:
+                        continue
+                    reopened += 1
+                g_score[child] = child_g << 2 | move_code[action]
+                if h_delta is not None:
+                    tile = (child >> (bits * blank)) & mask
+                    child_h = h_val + h_delta(child, tile, child_blank, blank)
+                else:
+                    child_h = h(PuzzleState._unchecked(board.unpack(child), child_blank, board))
+                if child == goal_code:
+                    goal_g = child_g
+                if child in closed:
+                    incons[child] = (child_blank, child_h)   # erst in der nächsten Runde wieder offen
+                else:
+                    open_states[child] = (child_blank, child_h)
+                    open_nodes.push(child_g + weight * child_h, child_g, (child, child_blank, blank, child_h))
+        if len(closed) > peak_closed:
+            peak_closed = len(closed)
+
+        if goal_g == math.inf:
+            break   # Budget erschöpft oder Zustandsraum ohne Ziel durchsucht
+        lower = floor()
+        if stop:
+            # Abgebrochene Runde: nur die überall gültige Schranke g(goal) / min(g + h)
+            publish(goal_g / lower if lower > 0 else 1.0)
+            break
+        # Vollständige Runde: Lösung ist höchstens weight-mal so lang wie die optimale
+        publish(min(weight, goal_g / lower) if lower > 0 else 1.0)
+        if best.bound <= 1:
+            break   # optimal bewiesen
+        weight = max(1.0, weight - weight_step)
+
+    t1 = time.perf_counter()
+    if best is None:
+        return SearchResult(
+            solved=False,
+            depth=0,
+            expanded=expanded_nodes,
+            runtime_s=t1 - t0,
+            heuristic=heuristic_name,
+            start_state=start.tiles,
+            path=None,
+            status=stop or "exhausted",
+            lower_bound=int(floor()) if stop else None,
+            stats=_fill_stats(stats, generated, stale_pops, reopened, peak_open, peak_closed, expanded_nodes, 0),
+        )
+    return SearchResult(
+        solved=True,
+        depth=best.depth,
+        expanded=expanded_nodes,
+        runtime_s=t1 - t0,
+        heuristic=heuristic_name,
+        start_state=start.tiles,
+        path=LazyPath(start, best.moves) if best.moves is not None else None,
+        status=stop or "solved",
+        # Nicht bewiesen optimal: die Schranke der besten Lösung ergibt die Mindestlänge
+        lower_bound=math.ceil(best.depth / best.bound - 1e-9) if stop else None,
+        stats=_fill_stats(
+            stats, generated, stale_pops, reopened, peak_open, peak_closed, expanded_nodes, best.depth,
+        ),
+        moves=best.moves,
+    )
+
+
+# ------------------------------ Weighted search ------------------------------
+
+def _check_weight(weight: float, open_list: str) -> float:
+    """
+    Reject weights below 1 and non-integer f-values for the bucket open list.
+    Returns the weight, as an int if it is integral (2.0 → 2, so f stays an int).
+    """
+    if weight < 1:
+        raise ValueError(f"weight must be at least 1, got {weight}")
+    if weight == int(weight):
+        return int(weight)
+    if open_list == "bucket":
+        raise ValueError("the bucket open list needs integer f-values; use an integer weight or open_list='heap'")
+    return weight
+
+
+def _weighted(fn: Callable[..., int], weight: float) -> Callable[..., float]:
+    """Scale a heuristic (or its delta) by `weight` for Weighted A*."""
+
+    def weighted(*args):
+        return weight * fn(*args)
+
+    return weighted
+
+
+def _weighted_bound(f: float, weight: float) -> int:
+    # f = g + weight·h ≤ weight·(g + h) → f / weight ist eine untere Schranke (Kosten ganzzahlig)
+    return math.ceil(f / weight - 1e-9)
+
+
+# ----------------------------- Instrumentation -------------------------------
+
+def _finished(on_finish: Optional[Callable[[SearchResult], None]], result: SearchResult) -> SearchResult:
+    """Report `result` to the on_finish hook (if any) and return it."""
+    if on_finish is not None:
+        on_finish(result)
+    return result
+
+
+def _timed(fn: Callable[..., int], stats: SearchStats) -> Callable[..., int]:
+    """Wrap a heuristic (or its delta) so every call is counted and timed into `stats`."""
+    clock = time.perf_counter
+
+    def timed(*args):
+        t = clock()
+        value = fn(*args)
+        stats.h_time_s += clock() - t
+        stats.h_calls += 1
+        return value
+
+    return timed
+
+
+def _fill_stats(
+    stats: Optional[SearchStats],
+    generated: int,
+    stale_pops: int,
+    reopened: int,
+    peak_open: int,
+    peak_closed: int,
+    expanded: int,
+    depth: int,
+) -> Optional[SearchStats]:
+    """Copy the loop counters into `stats` (if instrumented) and derive the branching factor."""
+    if stats is None:
+        return None
+    stats.generated = generated
+    stats.stale_pops = stale_pops
+    stats.reopened = reopened
+    stats.peak_open = peak_open
+    stats.peak_closed = peak_closed
+    stats.branching_factor = effective_branching_factor(expanded, depth)
+    return stats
+
+
+def _ida_stats(stats: Optional[SearchStats], deepest: int, expanded: int, depth: int) -> Optional[SearchStats]:
+    """IDA* variant of _fill_stats(): every generated child gets exactly one h call."""
+    if stats is None:
+        return None
+    return _fill_stats(stats, max(stats.h_calls - 1, 0), 0, 0, deepest + 1, 0, expanded, depth)
+
+
+# --------------------------------- Budgets -----------------------------------
+
+class _BudgetExceeded(Exception):
+    """Unwinds the IDA* recursion when a budget runs out."""
+
+    def __init__(self, status: str) -> None:
+        super().__init__(status)
+        self.status = status
+
+
+def _budget_status(
+    expanded: int,
+    stored: int,
+    max_expanded: Optional[int],
+    max_nodes: Optional[int],
+    deadline: Optional[float],
+) -> str:
+    """Return the status of the first exhausted budget, or "" if the search may continue."""
+    if max_expanded is not None and expanded >= max_expanded:
+        return "node_limit"
+    if max_nodes is not None and stored > max_nodes:
+        return "memory_limit"
+    # Die Uhr ist teuer im Vergleich zu einer Expansion → nur in Abständen lesen
+    if deadline is not None and not expanded & _CLOCK_CHECK_MASK and time.perf_counter() >= deadline:
+        return "timeout"
+    return ""
+
+
 # ------------------------------ Path recovery --------------------------------
 
-def _reconstruct_path(
-    came_from: Dict[PuzzleState, Optional[PuzzleState]],
-    goal_state: PuzzleState,
-) -> List[PuzzleState]:
+# Ohne Pfadspeicherung: jeder Zug bekommt Code 0 (g_score hält dann nur g)
+_NO_MOVE_CODE: Dict[str, int] = dict.fromkeys(MOVE_CODE, 0)
+# Zugbuchstabe → Gegenzug (für den umgedrehten Rückwärtsteil der bidirektionalen Suche)
+_INVERSE_LETTER = str.maketrans({
+    name[0]: next(other[0] for r, c, other in ACTIONS if (r, c) == (-dr, -dc)) for dr, dc, name in ACTIONS
+})
+
+
+def _reconstruct_moves(
+    g_score: Dict[int, int],
+    goal_code: int,
+    goal_blank: int,
+    start_code: int,
+    board: Board,
+) -> str:
     """
-    Rekonstruiert den vollständigen Lösungsweg vom Ziel zurück zum Start,
-    indem die came_from-Verkettung rückwärts verfolgt wird.
-    Gibt eine Liste von PuzzleStates von Start --> Ziel zurück
+    Rekonstruiert die Zugfolge vom Start zum Ziel aus den 2-Bit-Zugcodes in g_score:
+    vom Ziel aus wird jeder gespeicherte Zug rückgängig gemacht, bis der Start erreicht ist.
+    Gibt einen String aus state.MOVE_LETTERS zurück (Start --> Ziel).
     """
-    path: List[PuzzleState] = [goal_state]
-    # Vom Ziel aus so lange zurückgehen, bis der Start erreicht ist
-    while came_from[path[-1]] is not None:
-        path.append(came_from[path[-1]])
+    letters: List[str] = []
+    bits, mask, offsets = board.bits_per_cell, board.cell_mask, board.move_offset
+    code, blank = goal_code, goal_blank
+    while code != start_code:
+        move = g_score[code] & 3
+        letters.append(MOVE_LETTERS[move])
+        # Der Zug hat das Leerfeld von parent_blank nach blank bewegt; der Stein steht jetzt auf parent_blank
+        parent_blank = blank - offsets[move]
+        tile = (code >> (bits * parent_blank)) & mask
+        code ^= (tile << (bits * parent_blank)) ^ (tile << (bits * blank))
+        blank = parent_blank
 
-    # Liste umdrehen, damit sie vom Start zum ziel läuft
-    path.reverse()
-    return path
+    # Liste umdrehen, damit sie vom Start zum Ziel läuft
+    letters.reverse()
+    return "".join(letters)
 
 
 # ------------------------------- Self-test -----------------------------------
@@ -148,6 +1003,7 @@ if __name__ == "__main__":
 
     start = PuzzleState((1, 2, 3, 4, 5, 6, 0, 7, 8))
     for fn in (hamming, manhattan):
-        print(f"Running A* with {fn.__name__}")
-        res = a_star(start, fn)
-        print(f"Solved={res.solved}, depth={res.depth}, expanded={res.expanded}, time={res.runtime_s:.4f}s")
\ No newline at end of file
+        for solver in (a_star, ida_star, bidirectional, ara_star):
+            print(f"Running {solver.__name__} with {fn.__name__}")
+            res = solver(start, fn)
+            print(f"Solved={res.solved}, depth={res.depth}, expanded={res.expanded}, time={res.runtime_s:.4f}s")
\ No newline at end of file
@@ -1,7 +1,9 @@
 from __future__ import annotations # Aktiviert zukünftige Typunterstützung, damit Klassen referenziert werden können, bevor sie definiert sind
 
-from dataclasses import dataclass # Ermöglicht automatische Erstellen einer unveränderbaren PuzzleState-Klasse
-from typing import Iterable, List, Tuple, Dict # Import für Typangaben, damit Code verständlicher bleibt
+from dataclasses import FrozenInstanceError # Gleiche Fehlermeldung wie bei einer frozen dataclass
+from collections import abc # Basisklasse für LazyPath (verhält sich wie eine Liste)
+from math import factorial, isqrt # Kantenlänge eines quadratischen Boards aus der Anzahl der Felder
+from typing import Iterable, Iterator, List, Optional, Tuple, Dict, overload # Import für Typangaben, damit Code verständlicher bleibt
 
 # ----- Board geometry ---------------------------------------------------------
 
@@ -21,93 +23,375 @@ GOAL: Tuple[int, ...] = (1, 2, 3, 4, 5, 6, 7, 8, 0)
 # wie weit jeder Stein noch von seiner richtigen Position entfernt ist
 GOAL_POS: Dict[int, Tuple[int, int]] = {v: INDEX_TO_RC[i] for i, v in enumerate(GOAL)}
 
+# ----- Packed encoding --------------------------------------------------------
+
+# Jedes Feld belegt 4 Bit in einem einzigen int: Feld i steht in den Bits 4*i .. 4*i+3
+# Dadurch werden Hashing, Vergleich und Nachfolgerberechnung in A* reine int-Operationen
+BITS_PER_CELL = 4
+CELL_MASK = (1 << BITS_PER_CELL) - 1  # 0b1111, maskiert genau ein Feld
+
+
+def pack_tiles(tiles: Iterable[int]) -> int:
+    """Pack a tile sequence into a single int (4 bits per cell, cell 0 lowest)."""
+    code = 0
+    for i, v in enumerate(tiles):
+        code |= v << (BITS_PER_CELL * i)  # Wert an die Bitposition des Feldes schieben
+    return code
+
+
+def unpack_tiles(code: int) -> Tuple[int, ...]:
+    """Inverse of pack_tiles(): return the tile tuple encoded in `code`."""
+    return tuple((code >> (BITS_PER_CELL * i)) & CELL_MASK for i in range(N * N))
+
+
+# Gepackter Zielzustand und Position des Leerfeldes im Ziel (für den Goal-Check in A*)
+GOAL_CODE: int = pack_tiles(GOAL)
+GOAL_BLANK: int = GOAL.index(0)
+
+# ----- Precomputed blank moves ------------------------------------------------
+
+# Mögliche Bewegungen des Leerfeldes: (DeltaRow, DeltaCol, Aktionsname), feste Reihenfolge
+ACTIONS: Tuple[Tuple[int, int, str], ...] = ((-1, 0, "Up"), (1, 0, "Down"), (0, -1, "Left"), (0, 1, "Right"))
+
+# Gegenzug jeder Aktion (wird für das Parent-Move-Pruning gebraucht)
+INVERSE_ACTION: Dict[str, str] = {"Up": "Down", "Down": "Up", "Left": "Right", "Right": "Left"}
+
+
+def _build_blank_moves(rows: int = N, cols: int = N) -> Tuple[Tuple[Tuple[int, str], ...], ...]:
+    """For every blank index, the tuple of legal (swap_index, action) pairs."""
+    table = []
+    for zero_idx in range(rows * cols):
+        zr, zc = divmod(zero_idx, cols)
+        moves = []
+        for dr, dc, action in ACTIONS:
+            nr, nc = zr + dr, zc + dc
+            if 0 <= nr < rows and 0 <= nc < cols:  # Randprüfung nur einmal beim Modul-Import
+                moves.append((nr * cols + nc, action))
+        table.append(tuple(moves))
+    return tuple(table)
+
+
+# Leerfeld-Index → ((Tauschindex, Aktion), ...); ersetzt die Randprüfungen in neighbors()
+BLANK_MOVES: Tuple[Tuple[Tuple[int, str], ...], ...] = _build_blank_moves()
+
+# Dasselbe für die gepackte Darstellung, mit vorberechneten Bit-Shifts:
+# Leerfeld-Index → ((Tauschindex, Shift des Tauschfeldes, Aktion), ...)
+PACKED_MOVES: Tuple[Tuple[Tuple[int, int, str], ...], ...] = tuple(
+    tuple((j, BITS_PER_CELL * j, action) for j, action in moves) for moves in BLANK_MOVES
+)
+
+# Kompakte Zugcodes (für Parent-Pointer und Lösungsstrings): Index der Aktion in ACTIONS (2 Bit)
+# bzw. ein Buchstabe pro Zug; MOVE_OFFSET ist die Verschiebung des Leerfeld-Index
+MOVE_CODE: Dict[str, int] = {action: i for i, (_, _, action) in enumerate(ACTIONS)}
+MOVE_LETTERS = "".join(action[0] for _, _, action in ACTIONS)   # "UDLR"
+MOVE_OFFSET: Tuple[int, ...] = tuple(dr * N + dc for dr, dc, _ in ACTIONS)
+
+
+# ----- Boards beliebiger Größe --------------------------------------------------
+# Die Konstanten oben beschreiben das 3x3-Board (8-Puzzle). Für andere Größen
+# (15-Puzzle = 4x4, 24-Puzzle = 5x5, Rechtecke wie 2x4 oder 3x4) bündelt ein
+# Board-Objekt dieselben Tabellen. Boards werden pro Form (rows, cols) gecacht:
+# get_board(4) bzw. get_board(3, 4) liefert immer dasselbe Objekt,
+# die Tabellen werden also nur einmal gebaut und per Identität verglichen.
+
+class Board:
+    """
+    Geometry and precomputed tables of one rows x cols board (use get_board()).
+
+    Attributes mirror the 3x3 module constants: index_to_rc, goal, goal_pos,
+    bits_per_cell, cell_mask, goal_code, goal_blank, blank_moves,
+    packed_moves and move_offset. packed_neighbors(code, blank, parent_blank)
+    works like the module function of the same name, with this board's tables
+    bound into the closure.
+    """
+
+    def __init__(self, rows: int, cols: int, goal: Optional[Tuple[int, ...]] = None) -> None:
+        if rows < 2 or cols < 2:
+            raise ValueError(f"boards need at least 2 rows and 2 columns, got {rows}x{cols}")
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.index_to_rc: Tuple[Tuple[int, int], ...] = tuple(divmod(i, cols) for i in range(self.size))
+        self.goal: Tuple[int, ...] = tuple(range(1, self.size)) + (0,) if goal is None else tuple(goal)
+        self.goal_pos: Dict[int, Tuple[int, int]] = {v: self.index_to_rc[i] for i, v in enumerate(self.goal)}
+        # 4 Bit reichen bis zum 15-Puzzle, größere Boards brauchen mehr Bits pro Feld
+        self.bits_per_cell = max(BITS_PER_CELL, (self.size - 1).bit_length())
+        self.cell_mask = (1 << self.bits_per_cell) - 1
+        self.goal_code = self.pack(self.goal)
+        self.goal_blank = self.goal.index(0)
+        self.blank_moves = _build_blank_moves(rows, cols)
+        self.packed_moves: Tuple[Tuple[Tuple[int, int, str], ...], ...] = tuple(
+            tuple((j, self.bits_per_cell * j, action) for j, action in moves) for moves in self.blank_moves
+        )
+        self.move_offset: Tuple[int, ...] = tuple(dr * cols + dc for dr, dc, _ in ACTIONS)
+        self.packed_neighbors = _make_packed_neighbors(self.packed_moves, self.bits_per_cell, self.cell_mask)
+
+    def pack(self, tiles: Iterable[int]) -> int:
+        """pack_tiles() with this board's bits per cell."""
+        bits = self.bits_per_cell
+        code = 0
+        for i, v in enumerate(tiles):
+            code |= v << (bits * i)
+        return code
+
+    def unpack(self, code: int) -> Tuple[int, ...]:
+        """Inverse of pack()."""
+        bits, mask = self.bits_per_cell, self.cell_mask
+        return tuple((code >> (bits * i)) & mask for i in range(self.size))
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """(rows, cols)."""
+        return self.rows, self.cols
+
+    @property
+    def n_states(self) -> int:
+        """Number of solvable states (half of all (rows*cols)! permutations)."""
+        return factorial(self.size) // 2
+
+    def __repr__(self) -> str:
+        return f"Board({self.rows}x{self.cols})"
+
+    def with_goal(self, goal: Tuple[int, ...]) -> "Board":
+        """
+        An uncached copy of this board whose goal is `goal` (same shape).
+        Used to aim heuristics at another target, e.g. the start state in the
+        backward half of a bidirectional search (see heuristics.for_goal()).
+        """
+        return Board(self.rows, self.cols, goal)
+
+    def __reduce__(self):  # beim Unpickeln das gecachte Board derselben Form verwenden
+        if self.goal != tuple(range(1, self.size)) + (0,):   # Board mit eigenem Ziel (with_goal)
+            return (Board, (self.rows, self.cols, self.goal))
+        return (get_board, (self.rows, self.cols))
+
+
+def _make_packed_neighbors(packed_moves, bits: int, mask: int):
+    # Closure statt Methode: Tabellen liegen in Zellvariablen, kein self-Lookup pro Aufruf
+    def packed_neighbors(code: int, blank: int, parent_blank: int = -1) -> List[Tuple[int, int, str]]:
+        blank_shift = bits * blank
+        succ: List[Tuple[int, int, str]] = []
+        for j, shift, action in packed_moves[blank]:
+            if j == parent_blank:
+                continue
+            tile = (code >> shift) & mask
+            succ.append((code ^ (tile << shift) ^ (tile << blank_shift), j, action))
+        return succ
+
+    return packed_neighbors
+
+
+_BOARDS: Dict[Tuple[int, int], Board] = {}
+
+
+def get_board(rows: int = N, cols: Optional[int] = None) -> Board:
+    """Return the (cached) rows x cols board (square if cols is omitted); get_board(3) is DEFAULT_BOARD."""
+    if cols is None:
+        cols = rows
+    board = _BOARDS.get((rows, cols))
+    if board is None:
+        board = _BOARDS[(rows, cols)] = Board(rows, cols)
+    return board
+
+
+def board_for_tiles(tiles: Tuple[int, ...], shape: Optional[Tuple[int, int]] = None) -> Board:
+    """
+    The board for `tiles`: get_board(*shape) if a (rows, cols) shape is given,
+    else the square board matching len(tiles). ValueError if they do not fit.
+    """
+    if shape is not None:
+        rows, cols = shape
+        if rows * cols != len(tiles):
+            raise ValueError(f"a {rows}x{cols} board has {rows * cols} cells, got {len(tiles)} tiles")
+        return get_board(rows, cols)
+    n = isqrt(len(tiles))
+    if n * n != len(tiles) or n < 2:
+        raise ValueError(
+            f"tiles must have a square length (9, 16, 25, ...), got {len(tiles)}; "
+            "pass shape=(rows, cols) for rectangular boards"
+        )
+    return get_board(n)
+
+
+# Das 3x3-Board; seine Tabellen entsprechen den Modulkonstanten oben
+DEFAULT_BOARD: Board = get_board(N)
+
 
-@dataclass(frozen=True) # Erstellt eine unveränderbare Klasse (wichtig für Sets in A*)
 class PuzzleState:
     """
-    Immutable 8-puzzle state.
+    Immutable sliding-puzzle state (8-puzzle by default, any rows x cols board).
 
     Attributes
     ----------
     tiles : tuple[int, ...]
-        A length-9 tuple with a permutation of 0..8 (0 = blank).
+        A row-major permutation of 0..rows*cols-1 (0 = blank). Square boards
+        are inferred from the length (9 → 3x3, 16 → 4x4, ...); rectangular
+        ones need PuzzleState(tiles, shape=(rows, cols)).
+    blank : int
+        Linear index of the blank (cached, so nobody has to call tiles.index(0)).
+    board : Board
+        Shared geometry and tables of this board size (see get_board()).
+
+    Construction via PuzzleState(tiles) validates the tiles. States generated
+    internally from an already valid state use PuzzleState._unchecked(),
+    which skips the validation.
     """
-    # Speichert den aktuellen Puzzle-Zustand als Tuple, z. B. (2,8,3,1,6,4,7,0,5)
+    # __slots__ statt __dict__: weniger Speicher pro Zustand (wichtig bei großen Sets in A*)
+    # _hash wird einmal berechnet und danach nur noch zurückgegeben
+    __slots__ = ("tiles", "blank", "_hash", "board")
+
     tiles: Tuple[int, ...]  # Wird in allen Berechnungen (neighbors, Heuristiken, Goal-Check) verwendet
+    blank: int
+    board: Board            # geteiltes Objekt pro Boardgröße, kostet nur einen Zeiger pro Zustand
 
     # --- VALIDIERUNG DES ZUSTANDS -----------------------------------------------------
-    def __post_init__(self) -> None: # Wird nach Objekt-Erstellung automatisch ausgeführt
-        # Prüft, ob genau 9 Elemente vorhanden sind (3x3-Puzzle):
-        if len(self.tiles) != N * N:
-            raise ValueError(f"tiles must have length {N*N}, got {len(self.tiles)}")
+    def __init__(self, tiles: Tuple[int, ...], shape: Optional[Tuple[int, int]] = None) -> None: # Nur für Zustände von außen (Benutzer, Dateien, Tests)
+        tiles = tuple(tiles)
+        # Prüft, ob die Länge zum Board passt (9 → 3x3, 16 → 4x4, ... oder zur angegebenen Form):
+        if shape is None and len(tiles) == N * N:
+            board = DEFAULT_BOARD
+        else:
+            board = board_for_tiles(tiles, shape)
 
-        # Prüft, ob die Werte eine echte Permutation von 0–8 sind:
+        # Prüft, ob die Werte eine echte Permutation von 0..n*n-1 sind:
         # Wichtig, um ungültige Puzzle-Konfigurationen zu verhindern
-        if set(self.tiles) != set(range(N * N)):
-            raise ValueError("tiles must be a permutation of 0..8 (with 0 as blank)")
+        if set(tiles) != set(range(board.size)):
+            raise ValueError(f"tiles must be a permutation of 0..{board.size - 1} (with 0 as blank)")
+
+        _set_tiles(self, tiles)
+        _set_blank(self, tiles.index(0))
+        _set_hash(self, hash(tiles))
+        _set_board(self, board)
+
+    @classmethod
+    def _unchecked(cls, tiles: Tuple[int, ...], blank: int, board: Board = DEFAULT_BOARD) -> "PuzzleState":
+        """
+        Trusted fast path: build a state without validation.
+
+        Only for tiles derived from an already valid state (successors,
+        unpacked codes, unranked indices); `blank` must be tiles.index(0)
+        and `board` the board of that state.
+        """
+        self = object.__new__(cls)  # __init__ (und damit die Validierung) wird übersprungen
+        _set_tiles(self, tiles)
+        _set_blank(self, blank)
+        _set_hash(self, hash(tiles))
+        _set_board(self, board)
+        return self
+
+    # --- UNVERÄNDERBARKEIT, VERGLEICH, HASH ------------------------------------------
+    def __setattr__(self, name: str, value) -> None: # Wie bei einer frozen dataclass
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.tiles == other.tiles and self.board is other.board # 3x4 ≠ 4x3 bei gleichen Kacheln
+
+    def __hash__(self) -> int: # Gecachter Hash → Sets/Dicts müssen das Tuple nicht neu hashen
+        return self._hash
+
+    def __repr__(self) -> str:
+        # Außer beim 3x3-Board die Form mit ausgeben: 3x4 und 4x3 haben gleich viele Kacheln
+        if self.board is DEFAULT_BOARD:
+            return f"PuzzleState(tiles={self.tiles!r})"
+        return f"PuzzleState(tiles={self.tiles!r}, shape={self.board.shape!r})"
+
+    def __reduce__(self): # Pickle/copy über den validierenden Konstruktor
+        if self.board is DEFAULT_BOARD:
+            return (self.__class__, (self.tiles,))
+        return (self.__class__, (self.tiles, self.board.shape))
 
     # --- ZIELPRÜFUNG --------------------------------------------------------------
     def is_goal(self) -> bool: # Prüft, ob Puzzle gelöst ist
-        """Return True iff this state equals the default GOAL configuration."""
-        return self.tiles == GOAL # Vergleicht direkt mit dem global definierten Zielzustand
+        """Return True iff this state equals the goal configuration of its board."""
+        return self.tiles == self.board.goal # beim 3x3-Board ist das GOAL
 
     # --- GENERIEREN VON NACHBARZUSTÄNDEN --------------------------------------------------
-    def neighbors(self) -> List[Tuple["PuzzleState", str, int]]:
+    def neighbors(self, last_action: Optional[str] = None) -> List[Tuple["PuzzleState", str, int]]:
         # Findet die Position des Leerfeldes (0), da nur dieses bewegt wird
         """
         Return all valid successor states.
 
+        Parameters
+        ----------
+        last_action : str, optional
+            Action that produced this state. Its inverse is pruned, so the
+            parent is never generated again.
+
         Returns
         -------
         list of (next_state, action, cost)
             action ∈ {"Up","Down","Left","Right"} describes the blank's movement.
             cost is always 1 (uniform step cost).
         """
-        zero_idx = self.tiles.index(0)
-
-        # Wandelt Index in (row, col) um, ist hilfreich zur Bestimmung erlaubter Moves
-        zr, zc = INDEX_TO_RC[zero_idx]
+        skip_action = INVERSE_ACTION.get(last_action) if last_action is not None else None
+        zero_idx = self.blank
+        board = self.board
 
         succ: List[Tuple[PuzzleState, str, int]] = [] # Liste für alle erzeugten Nachbarzustände
 
-        # Definiert mögliche Bewegungen des Leerfeldes: nach oben, unten, links, rechts
-        # Jeder Eintrag: (DeltaRow, DeltaCol, Aktionsname)
-        moves = [(-1, 0, "Up"), (1, 0, "Down"), (0, -1, "Left"), (0, 1, "Right")]
-
-        # Durchläuft jede mögliche Bewegung:
-        for dr, dc, action in moves:
-            nr, nc = zr + dr, zc + dc # Berechnet neue Position des Leerfeldes
-            # Erzeugt neuen Zustand, indem das Leerfeld mit der Zielposition getauscht wird:
-            if 0 <= nr < N and 0 <= nc < N:
-                neighbor_idx = nr * N + nc # Berechnet Index der Position, mit der getauscht wird
-                new_tiles = _swap(self.tiles, zero_idx, neighbor_idx) # Erzeugt neuen Zustand, indem das Leerfeld mit Zielposition getauscht wird
-                succ.append((PuzzleState(new_tiles), action, 1)) #fügt neuen Zustand + ausgeführte Aktion + Kosten (immer 1) zur Liste hinzu
+        # Erlaubte Züge für diese Leerfeld-Position kommen direkt aus der vorberechneten Tabelle:
+        for neighbor_idx, action in board.blank_moves[zero_idx]:
+            # Gegenzug des letzten Zuges überspringen (führt nur zurück zum Vorgänger)
+            if action == skip_action:
+                continue
+            new_tiles = _swap(self.tiles, zero_idx, neighbor_idx) # Erzeugt neuen Zustand, indem das Leerfeld mit Zielposition getauscht wird
+            # Nachfolger eines gültigen Zustands ist wieder gültig → ohne Validierung erzeugen
+            succ.append((PuzzleState._unchecked(new_tiles, neighbor_idx, board), action, 1)) #fügt neuen Zustand + ausgeführte Aktion + Kosten (immer 1) zur Liste hinzu
 
         return succ # Gibt Liste aller gültigen Nachbarn zurück
 
     # --- formatting -----------------------------------------------------------
-    def pretty(self) -> str: # Gibt das Puzzle in 3 Zeilen formatiert zurück
-        """Human-friendly 3x3 string representation (blank shown as a dot)."""
-        rows = [] # Hier werden die drei Puzzle-Zeilen gespeichert
-        # Durchläuft nacheinander 3 Puzzle-Zeilen (oben, Mitte, unten):
-        for r in range(N):
+    def pretty(self) -> str: # Gibt das Puzzle zeilenweise formatiert zurück
+        """Human-friendly board string, one line per row (blank shown as a dot)."""
+        board = self.board
+        width = len(str(board.size - 1)) # Spaltenbreite: 1 beim 8-Puzzle, 2 ab dem 15-Puzzle
+        rows = [] # Hier werden die Puzzle-Zeilen gespeichert
+        # Durchläuft nacheinander die Puzzle-Zeilen (oben → unten):
+        for r in range(board.rows):
             row_vals = [] # Speichert Werte der aktuellen Zeile
-            # Durchläuft nacheinander die 3 Spalten der aktuellen Zeile (links, Mitte, rechts):
-            for c in range(N):
-                v = self.tiles[r * N + c] # Holt den Wert an Position (r,c)
+            # Durchläuft nacheinander die Spalten der aktuellen Zeile (links → rechts):
+            for c in range(board.cols):
+                v = self.tiles[r * board.cols + c] # Holt den Wert an Position (r,c)
                 row_vals.append("." if v == 0 else str(v)) # Zeigt 0 als '.' für bessere Lesbarkeit
             # Erstellt eine formatierte Zeile wie "2 8 3":
-            rows.append(" ".join(f"{x:>1}" for x in row_vals))
-        return "\n".join(rows) # Gibt das vollständige 3x3-Board zurück
+            rows.append(" ".join(f"{x:>{width}}" for x in row_vals))
+        return "\n".join(rows) # Gibt das vollständige Board zurück
 
     # --- HILFSMETHODEN ----------------------------------------------
     def index_of(self, tile: int) -> int: # Gibt linearen Index eines Steins zurück
-        """Return the linear index (0..8) of a given tile value."""
+        """Return the linear index (0..n*n-1) of a given tile value."""
+        if tile == 0:
+            return self.blank # Leerfeld-Position ist bereits gecacht
         return self.tiles.index(tile) # Wird z. B. von position_of genutzt
 
     def position_of(self, tile: int) -> Tuple[int, int]: # Gibt (row, col) eines Steins zurück
         """Return (row, col) of a given tile."""
-        return INDEX_TO_RC[self.index_of(tile)] # Nutzt bestehende Index→Position-Mapping
+        return self.board.index_to_rc[self.index_of(tile)] # Nutzt bestehende Index→Position-Mapping
+
+    # --- GEPACKTE DARSTELLUNG -------------------------------------------------
+    def packed(self) -> int: # Gibt das Board als einzelnen int zurück
+        """Return the packed integer encoding of this state (see pack_tiles / Board.pack)."""
+        if self.board is DEFAULT_BOARD:
+            return pack_tiles(self.tiles)
+        return self.board.pack(self.tiles)
+
+    @classmethod
+    def from_packed(cls, code: int, rows: int = N, cols: Optional[int] = None) -> "PuzzleState": # Baut wieder einen PuzzleState aus dem int
+        """Build a PuzzleState of a rows x cols board (square by default) from its packed encoding."""
+        board = get_board(rows, cols)
+        return cls(board.unpack(code), board.shape)
+
+
+# Direkte Setter der Slots (umgehen das gesperrte __setattr__, nur intern verwendet)
+_set_tiles = PuzzleState.tiles.__set__
+_set_blank = PuzzleState.blank.__set__
+_set_hash = PuzzleState._hash.__set__
+_set_board = PuzzleState.board.__set__
 
 
 # ----- INTERNER HELFER: SWAP --------------------------------------------------
@@ -121,6 +405,115 @@ def _swap(t: Tuple[int, ...], i: int, j: int) -> Tuple[int, ...]:
     return tuple(lst) # Gibt neues Tuple nach dem Tausch zurück
 
 
+# ----- GEPACKTE NACHFOLGER ---------------------------------------------------
+# Gegenstück zu PuzzleState.neighbors() auf der gepackten Darstellung:
+def packed_neighbors(code: int, blank: int, parent_blank: int = -1) -> List[Tuple[int, int, str]]:
+    """
+    Return all successors of a packed board.
+
+    Parameters
+    ----------
+    code : int
+        Packed board (see pack_tiles).
+    blank : int
+        Linear index of the blank in `code` (cached by the caller).
+    parent_blank : int, optional
+        Blank index of the parent state. Moving the blank back there would
+        just undo the last move, so that successor is pruned.
+
+    Returns
+    -------
+    list of (next_code, next_blank, action)
+        Same actions and order as PuzzleState.neighbors(); cost is always 1.
+    """
+    blank_shift = BITS_PER_CELL * blank
+    succ: List[Tuple[int, int, str]] = []
+    for j, shift, action in PACKED_MOVES[blank]:
+        if j == parent_blank:  # Gegenzug → würde nur den Vorgänger erzeugen
+            continue
+        tile = (code >> shift) & CELL_MASK
+        # Leerfeld ist 0 → Stein per XOR von Feld j nach Feld blank verschieben
+        succ.append((code ^ (tile << shift) ^ (tile << blank_shift), j, action))
+    return succ
+
+
+# ----- LÖSUNGSWEG ALS ZUGFOLGE -------------------------------------------------
+# Ein Lösungsweg wird als String von Zugbuchstaben (z. B. "ULDR") gespeichert;
+# PuzzleStates entstehen erst, wenn jemand den Pfad tatsächlich ansieht.
+
+def apply_moves(start: "PuzzleState", moves: str) -> Iterator["PuzzleState"]:
+    """
+    Yield `start` and every state reached by playing `moves` (letters from
+    MOVE_LETTERS, describing the blank's movement). Raises ValueError on a
+    letter that is unknown or would move the blank off the board.
+    """
+    state = start
+    board = start.board
+    yield state
+    for letter in moves:
+        blank = state.blank
+        target = -1
+        for j, action in board.blank_moves[blank]:
+            if action[0] == letter:
+                target = j
+                break
+        if target < 0:
+            raise ValueError(f"illegal move {letter!r} from blank index {blank}")
+        state = PuzzleState._unchecked(_swap(state.tiles, blank, target), target, board)
+        yield state
+
+
+class LazyPath(abc.Sequence):
+    """
+    Read-only list of the states along a solution, stored as start + move string.
+
+    Behaves like List[PuzzleState] (len, indexing, slicing, iteration); the
+    states are built on first access and then cached. Pickles as (start, moves).
+    """
+
+    __slots__ = ("start", "moves", "_states")
+
+    def __init__(self, start: "PuzzleState", moves: str) -> None:
+        self.start = start
+        self.moves = moves
+        self._states: Optional[List[PuzzleState]] = None
+
+    def _materialize(self) -> List["PuzzleState"]:
+        if self._states is None:
+            self._states = list(apply_moves(self.start, self.moves))
+        return self._states
+
+    @overload
+    def __getitem__(self, i: int) -> "PuzzleState": ...
+
+    @overload
+    def __getitem__(self, i: slice) -> List["PuzzleState"]: ...
+
+    def __getitem__(self, i):
+        return self._materialize()[i]
+
+    def __len__(self) -> int:
+        return len(self.moves) + 1
+
+    def __iter__(self) -> Iterator["PuzzleState"]:
+        if self._states is not None:
+            return iter(self._states)
+        return apply_moves(self.start, self.moves)   # ohne Cache: O(1) Zusatzspeicher
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyPath):
+            return self.start == other.start and self.moves == other.moves
+        if isinstance(other, list):
+            return self._materialize() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"LazyPath(start={self.start!r}, moves={self.moves!r})"
+
+    def __reduce__(self):
+        return (self.__class__, (self.start, self.moves))
+
+
 # ----- SELBSTTEST (optional, run as script) ------------------------------
 
 if __name__ == "__main__": # Wird nur ausgeführt, wenn Datei direkt gestartet wird
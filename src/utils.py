@@ -1,38 +1,46 @@
 from __future__ import annotations
 
-from typing import Tuple
+from typing import List, Optional, Tuple, Union
 import random
 
-from .state import PuzzleState, GOAL
-
-N = 3  # dimension
+from .state import PuzzleState, GOAL, N, Board, DEFAULT_BOARD, board_for_tiles, get_board
+from .ranking import N_STATES, rank_tiles, unrank, unrank_batch
 
 
 # ---------------------------- Solvability ------------------------------------
 # prüft, ob ein Puzzle-Zustand lösbar ist (über Inversionszählungs)
-def is_solvable(tiles: Tuple[int, ...]) -> bool:
+def is_solvable(tiles: Tuple[int, ...], shape: Optional[Tuple[int, int]] = None) -> bool:
     """
-    Return True iff the given 3x3 configuration is solvable.
+    Return True iff the given rows x cols configuration is solvable.
 
     Parameters
     ----------
     tiles : tuple[int, ...]
-        A permutation of 0..8, where 0 denotes the blank.
+        A row-major permutation of 0..rows*cols-1, where 0 denotes the blank.
+    shape : (rows, cols), optional
+        Board shape; square boards are inferred from the length
+        (9 → 8-puzzle, 16 → 15-puzzle, ...).
 
     Notes
     -----
-    For the 8-puzzle (odd width), the puzzle is solvable iff the inversion count
-    (count of pairs i<j with tiles[i] > tiles[j], excluding the blank) is even.
+    Odd width (8-puzzle, 24-puzzle, 4x3): solvable iff the inversion count (count of
+    pairs i<j with tiles[i] > tiles[j], excluding the blank) is even.
+    Even width (15-puzzle, 3x4): every vertical move flips the inversion parity and
+    moves the blank one row, so solvable iff inversions + rows between the
+    blank and the bottom row is even (as in the goal, blank bottom right).
     """
-    # Validierung: Müssen 9 Felder sein, eine Permutation von 0-8
-    if len(tiles) != N * N:
-        raise ValueError(f"tiles must have length {N*N}, got {len(tiles)}")
-    if set(tiles) != set(range(N * N)):
-        raise ValueError("tiles must be a permutation of 0..8")
+    # Validierung: Länge muss zum Board passen, Permutation von 0..rows*cols-1
+    board = board_for_tiles(tiles, shape)
+    if set(tiles) != set(range(board.size)):
+        raise ValueError(f"tiles must be a permutation of 0..{board.size - 1}")
     # Inversionen zählen (größere Zahl vor kleinerer -> falsche Reihenfolge)
     inv = _inversion_count(tiles)
     # Beimm 8-Puzzle ist der Zustand lösbar, wenn die Nazahl der Inversionen gerade ist
-    return (inv % 2) == 0
+    if board.cols % 2 == 1:
+        return (inv % 2) == 0
+    # Gerade Breite: Zeilenabstand des Leerfeldes zur untersten Zeile mitzählen
+    blank_row = tiles.index(0) // board.cols
+    return (inv + board.rows - 1 - blank_row) % 2 == 0
 
 # Hilfsfunktion: zählt wie viele Zahlenpaare in der falsche Reihenfolge stehen
 def _inversion_count(tiles: Tuple[int, ...]) -> int:
@@ -49,40 +57,99 @@ def _inversion_count(tiles: Tuple[int, ...]) -> int:
 
 
 # ----------------------- Random solvable generator ---------------------------
-# Erzeugt einen zufälligen, aber garantiert lösbaren Startzustand
+# Erzeugt einen zufälligen, aber garantiert lösbaren Startzustand.
+# Statt zu mischen und unlösbare Zustände zu verwerfen (~50% Ausschuss plus
+# Inversionszählung pro Versuch) wird direkt ein gleichverteilter Rank gezogen
+# und mit ranking.unrank_tiles in einen Zustand umgewandelt.
+
+def _draw_rank(rng: random.Random, goal_rank: Optional[int]) -> int:
+    """Uniform rank over all solvable states except `goal_rank` (if given)."""
+    if goal_rank is None:
+        return rng.randrange(N_STATES)
+    r = rng.randrange(N_STATES - 1)   # einen Wert weniger ziehen ...
+    return r + 1 if r >= goal_rank else r   # ... und den Ziel-Rank überspringen
+
+
+def _goal_rank(goal: Tuple[int, ...]) -> Optional[int]:
+    # Ein unlösbares "Ziel" kann ohnehin nie gezogen werden → nichts auszuschließen
+    try:
+        return rank_tiles(tuple(goal))
+    except ValueError:
+        return None
+
+
+# Boardgröße: int = quadratisch (3, 4, 5), (rows, cols) = rechteckig (z. B. (3, 4))
+BoardSize = Union[int, Tuple[int, int]]
+
+
+def _board_of(size: BoardSize) -> Board:
+    return get_board(size) if isinstance(size, int) else get_board(*size)
+
+
+def _shuffled_solvable(rng: random.Random, board: Board, goal: Tuple[int, ...]) -> PuzzleState:
+    """
+    Uniform solvable state of a board without a rank space (15-puzzle and up):
+    shuffle all tiles and, if the result is unsolvable, swap the first two
+    non-blank tiles. The swap pairs every unsolvable permutation with exactly
+    one solvable one, so the result stays uniform.
+    """
+    while True:
+        tiles = list(board.goal)
+        rng.shuffle(tiles)
+        if not is_solvable(tuple(tiles), board.shape):
+            i, j = [k for k in range(3) if tiles[k] != 0][:2]
+            tiles[i], tiles[j] = tiles[j], tiles[i]
+        state = PuzzleState._unchecked(tuple(tiles), tiles.index(0), board)
+        if state.tiles != goal:
+            return state
+
+
 def random_solvable_state(
     rng: random.Random,
     goal: Tuple[int, ...] = GOAL,
-    max_attempts: int = 10_000,
+    size: BoardSize = N,
 ) -> PuzzleState:
     """
-    Generate a random solvable 8-puzzle state using the provided RNG.
+    Generate a uniformly random solvable state using the provided RNG.
 
     Parameters
     ----------
     rng : random.Random
         Seedable RNG you control (e.g., random.Random(42)) for reproducibility.
     goal : tuple[int, ...], optional
-        Goal configuration to avoid returning; defaults to GOAL.
-    max_attempts : int, optional
-        Safety cap on shuffling attempts.
+        Goal configuration to avoid returning; defaults to GOAL (for size 3)
+        or the goal of the chosen board.
+    size : int or (rows, cols), optional
+        Board width: 3 (8-puzzle, default), 4 (15-puzzle), 5 (24-puzzle), ...,
+        or a rectangular shape such as (3, 4).
 
     Returns
     -------
     PuzzleState
-        A solvable configuration. Tries not to equal `goal`, but if it fails to
-        find a different solvable state within `max_attempts`, it returns GOAL.
+        A solvable configuration different from `goal`. On the 3x3 board it
+        is drawn by unranking a random rank (one RNG call, no rejection
+        sampling); larger boards shuffle and fix the parity.
+    """
+    board = _board_of(size)
+    if board is not DEFAULT_BOARD:
+        return _shuffled_solvable(rng, board, board.goal if tuple(goal) == GOAL else tuple(goal))
+    return unrank(_draw_rank(rng, _goal_rank(goal)))
+
+
+def random_solvable_states(
+    rng: random.Random,
+    n: int,
+    goal: Tuple[int, ...] = GOAL,
+    size: BoardSize = N,
+) -> List[PuzzleState]:
+    """
+    Batch variant of random_solvable_state(): `n` uniform solvable states.
+    Consumes the RNG exactly like n single calls, so results are identical.
     """
-    base = list(range(N * N))  # Zahlen 0-8
-    for _ in range(max_attempts):
-        rng.shuffle(base)      # zufälliger shuffle
-        tiles = tuple(base)
-
-        # Nur zurückgeben, wenn der Zustand lösbar ist und nicht das Ziel selbst
-        if is_solvable(tiles) and tiles != tuple(goal):
-            return PuzzleState(tiles)
-    # Fallback: wenn nach vielen Versuchen nichts gefunden wird
-    return PuzzleState(tuple(goal))
+    if _board_of(size) is not DEFAULT_BOARD:
+        return [random_solvable_state(rng, goal, size=size) for _ in range(n)]
+    goal_rank = _goal_rank(goal)
+    return unrank_batch([_draw_rank(rng, goal_rank) for _ in range(n)])
 
 
 # ------------------------------ Small helpers --------------------------------
@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import itertools
 import math
+import pickle
+import random
+import statistics
 
-from src.state import PuzzleState, GOAL
-from src.utils import is_solvable
-from src.heuristics import hamming, manhattan, zero_heuristic
-from src.search import a_star
+import pytest
+
+from src.state import Board, LazyPath, PuzzleState, GOAL, apply_moves, get_board, packed_neighbors, unpack_tiles
+from src.utils import is_solvable, random_solvable_state, random_solvable_states
+from src.heuristics import for_board, hamming, manhattan, linear_conflict, zero_heuristic
+from src.pattern_db import pdb
+from src.search import a_star, ara_star, bidirectional, ida_star
+from src.parallel_search import hda_star, zobrist_hash, zobrist_table
+from src.hooks import FLayerTracer, SearchHooks, bind_hook, read_trace
+from src.metrics import QuantileSketch, RunningStats, effective_branching_factor
+from src.openlist import BucketOpenList
+from src.ranking import N_STATES, GOAL_RANK, rank, unrank, rank_batch, unrank_batch
 
 
 def test_goal_is_solvable():
@@ -60,4 +72,325 @@ def test_a_star_zero_heuristic_matches_ucost():
     # Manhattan should not exceed zero_heuristic expansions
     res_m = a_star(start, manhattan)
     assert res_m.depth == res_z.depth
-    assert res_m.expanded <= res_z.expanded
\ No newline at end of file
+    assert res_m.expanded <= res_z.expanded
+
+def test_packed_roundtrip_and_neighbors():
+    s = PuzzleState((2, 8, 3, 1, 6, 4, 7, 0, 5))
+    code = s.packed()
+    assert PuzzleState.from_packed(code) == s
+    # Packed successors must match neighbors() state-for-state and action-for-action
+    packed = [(unpack_tiles(c), b, a) for c, b, a in packed_neighbors(code, s.tiles.index(0))]
+    expected = [(ns.tiles, ns.tiles.index(0), a) for ns, a, _ in s.neighbors()]
+    assert packed == expected
+
+
+def test_rank_unrank_is_dense_bijection():
+    assert rank(PuzzleState(GOAL)) == GOAL_RANK
+    for r in (0, 1, 12345, N_STATES - 1):
+        assert rank(unrank(r)) == r
+        assert is_solvable(unrank(r).tiles)
+    states = [PuzzleState((1, 2, 3, 4, 5, 6, 0, 7, 8)), PuzzleState(GOAL)]
+    assert unrank_batch(rank_batch(states)) == states
+
+
+def test_parent_move_pruning():
+    s = PuzzleState((1, 2, 3, 4, 0, 5, 6, 7, 8))  # blank in the centre: 4 moves
+    assert len(s.neighbors()) == 4
+    # After moving Up, the inverse move (Down) must not be generated
+    actions = [a for _, a, _ in s.neighbors(last_action="Up")]
+    assert actions == ["Up", "Left", "Right"]
+    packed = packed_neighbors(s.packed(), 4, parent_blank=7)
+    assert [a for _, _, a in packed] == ["Up", "Left", "Right"]
+
+
+def test_state_is_frozen_hashable_and_picklable():
+    s = PuzzleState((1, 2, 3, 4, 5, 6, 7, 0, 8))
+    assert s.blank == 7
+    assert hash(s) == hash(PuzzleState(list(s.tiles)))
+    with pytest.raises(AttributeError):
+        s.tiles = GOAL
+    assert pickle.loads(pickle.dumps(s)) == s
+    # Successors are built without validation but carry the right blank index
+    for ns, _, _ in s.neighbors():
+        assert ns.blank == ns.tiles.index(0)
+    with pytest.raises(ValueError):
+        PuzzleState((1, 1, 3, 4, 5, 6, 7, 0, 8))
+
+
+def test_incremental_heuristics_match_full_evaluation():
+    s = PuzzleState((8, 6, 7, 2, 5, 4, 3, 0, 1))
+    for h in (hamming, manhattan, zero_heuristic):
+        for ns, _, _ in s.neighbors():
+            tile = ns.tiles[s.blank]  # the tile that slid into the old blank cell
+            assert h(s) + h.delta(ns.packed(), tile, ns.blank, s.blank) == h(ns)
+
+
+def test_linear_conflict_dominates_manhattan_and_stays_optimal():
+    s = PuzzleState((2, 3, 1, 4, 5, 6, 7, 8, 0))  # tile 1 must pass 2 and 3 in the top row
+    assert linear_conflict(s) >= manhattan(s) + 2
+    start = PuzzleState((8, 6, 7, 2, 5, 4, 3, 0, 1))
+    res_lc = a_star(start, linear_conflict)
+    res_m = a_star(start, manhattan)
+    assert res_lc.depth == res_m.depth
+    assert res_lc.expanded <= res_m.expanded
+
+
+def test_ida_star_matches_a_star():
+    start = PuzzleState((8, 6, 7, 2, 5, 4, 3, 0, 1))
+    for h in (manhattan, linear_conflict):
+        res_i = ida_star(start, h)
+        assert res_i.solved is True
+        assert res_i.depth == a_star(start, h).depth == 31
+        assert res_i.path[0] == start and res_i.path[-1].is_goal()
+    # Unsolvable input must terminate instead of deepening forever
+    assert ida_star(PuzzleState((2, 1, 3, 4, 5, 6, 7, 8, 0)), manhattan).solved is False
+
+
+def test_open_lists_agree_on_depth():
+    bucket = BucketOpenList()
+    for f, g, item in [(5, 1, "a"), (3, 2, "b"), (5, 3, "c"), (3, 1, "d")]:
+        bucket.push(f, g, item)
+    # Smallest f first, deeper g first within the same f
+    assert [bucket.pop()[2] for _ in range(len(bucket))] == ["b", "d", "c", "a"]
+
+    start = PuzzleState((8, 6, 7, 2, 5, 4, 3, 0, 1))
+    res_heap = a_star(start, manhattan, open_list="heap")
+    res_bucket = a_star(start, manhattan, open_list="bucket")
+    assert res_heap.depth == res_bucket.depth == 31
+    with pytest.raises(ValueError):
+        a_star(start, manhattan, open_list="fibonacci")
+
+
+def test_search_budgets_stop_with_status():
+    start = PuzzleState((8, 6, 7, 2, 5, 4, 3, 0, 1))
+    assert a_star(start, manhattan).status == "solved"
+    res = a_star(start, manhattan, max_expanded=100)
+    assert (res.solved, res.status, res.expanded) == (False, "node_limit", 100)
+    assert res.lower_bound is not None and res.lower_bound <= 31
+    assert a_star(start, manhattan, max_nodes=500).status == "memory_limit"
+    assert a_star(start, hamming, time_limit=0.0).status == "timeout"
+    res_i = ida_star(start, manhattan, max_expanded=100)
+    assert (res_i.status, res_i.expanded) == ("node_limit", 100)
+    assert ida_star(start, manhattan, time_limit=0.0).status == "timeout"
+    # Generous budgets do not change the result
+    assert a_star(start, manhattan, max_expanded=10**6, time_limit=60, max_nodes=10**6).depth == 31
+    assert ida_star(PuzzleState((2, 1, 3, 4, 5, 6, 7, 8, 0)), manhattan).status == "exhausted"
+
+
+def test_instrumented_search_counters():
+    start = PuzzleState((8, 6, 7, 2, 5, 4, 3, 0, 1))
+    assert a_star(start, manhattan).stats is None
+    res = a_star(start, manhattan, instrument=True)
+    st = res.stats
+    assert res.depth == 31 and st.peak_closed == res.expanded
+    assert st.generated >= st.h_calls - 1 > 0 and st.h_time_s > 0
+    assert st.peak_open > 0 and 1.0 < st.branching_factor < 3.0
+    res_i = ida_star(start, manhattan, instrument=True)
+    assert res_i.stats.generated == res_i.stats.h_calls - 1
+    assert res_i.stats.peak_open == 32  # the deepest path: start plus 31 moves
+    assert effective_branching_factor(52, 5) == pytest.approx(1.92, abs=0.01)
+
+
+def test_search_hooks_and_f_layer_trace(tmp_path):
+    start = PuzzleState((8, 6, 7, 2, 5, 4, 3, 0, 1))
+    assert bind_hook(SearchHooks(), "on_expand") is None  # no-op hooks are never called
+
+    class Recorder(SearchHooks):
+        def __init__(self):
+            self.layers, self.goal = [], None
+
+        def on_f_layer(self, f, expanded):
+            self.layers.append(f)
+
+        def on_goal(self, code, g):
+            self.goal = g
+
+    rec = Recorder()
+    res = a_star(start, manhattan, hooks=rec)
+    assert res.expanded == a_star(start, manhattan).expanded
+    assert rec.goal == 31 and rec.layers == sorted(set(rec.layers)) and rec.layers[-1] == 31
+
+    path = str(tmp_path / "trace.bin")
+    with FLayerTracer(path) as tracer:
+        results = [a_star(s, manhattan, hooks=tracer) for s in (start, PuzzleState(GOAL))]
+    records = list(read_trace(path))
+    assert [r.depth for r in records] == [31, 0]
+    for rec_, res_ in zip(records, results):
+        assert sum(c for layer in rec_.histogram.values() for c in layer.values()) == res_.expanded
+        assert rec_.start_state == res_.start_state
+
+    # Weighted A*: integral weights keep f integer and can be traced, fractional ones are rejected
+    with FLayerTracer(path) as tracer:
+        assert a_star(start, manhattan, weight=2.0, hooks=tracer).solved
+    with pytest.raises(ValueError):
+        a_star(start, manhattan, weight=1.5, hooks=Recorder())
+
+    # Appending checks the existing header and board shape
+    with pytest.raises(ValueError):
+        FLayerTracer(path, shape=(4, 4))
+    old = tmp_path / "old.bin"
+    old.write_bytes(b"8PZTRC02" + bytes(16))
+    with pytest.raises(ValueError):
+        FLayerTracer(str(old))
+    with FLayerTracer(path) as tracer:
+        with pytest.raises(ValueError):
+            a_star(PuzzleState.from_packed(get_board(4).goal_code, 4), manhattan, hooks=tracer)
+    assert len(list(read_trace(path))) == 3
+
+
+def test_compact_moves_and_lazy_path():
+    start = PuzzleState((8, 6, 7, 2, 5, 4, 3, 0, 1))
+    for solver in (a_star, ida_star):
+        res = solver(start, manhattan)
+        assert len(res.moves) == res.depth == 31 and set(res.moves) <= set("UDLR")
+        assert isinstance(res.path, LazyPath) and len(res.path) == 32
+        states = list(apply_moves(start, res.moves))
+        assert states[-1].is_goal() and res.path == states and res.path[0] == start
+        assert pickle.loads(pickle.dumps(res.path)) == res.path
+        bare = solver(start, manhattan, store_path=False)
+        assert (bare.depth, bare.moves, bare.path) == (31, None, None)
+    with pytest.raises(ValueError):
+        list(apply_moves(PuzzleState(GOAL), "R"))  # blank already in the right column
+
+
+def test_larger_boards():
+    goal15 = tuple(range(1, 16)) + (0,)
+    assert is_solvable(goal15)
+    assert not is_solvable(goal15[:13] + (15, 14, 0))  # Sam Loyd's 14-15 puzzle
+    # Generic per-board tables give the same values as the 3x3 fast paths
+    fresh = Board(3, 3)
+    for s in random_solvable_states(random.Random(4), 20):
+        t = PuzzleState._unchecked(s.tiles, s.blank, fresh)
+        for h in (hamming, manhattan, linear_conflict):
+            assert for_board(h, fresh)(t) == h(s)
+    rng = random.Random(6)
+    states = [random_solvable_state(rng, size=4) for _ in range(20)]
+    assert all(s.board is get_board(4) and is_solvable(s.tiles) for s in states)
+    # An equal copy of the 3x3 GOAL still means "the goal of the chosen board"
+    assert not random_solvable_state(rng, tuple(list(GOAL)), size=4).is_goal()
+    start = PuzzleState.from_packed(PuzzleState(goal15).packed(), 4)
+    start = list(apply_moves(start, "LLUURDLU"))[-1]
+    for solver in (a_star, ida_star):
+        res = solver(start, linear_conflict)
+        assert res.depth == 8 and list(apply_moves(start, res.moves))[-1].is_goal()
+    with pytest.raises(ValueError):  # pattern databases exist for 3x3 and 4x4 only
+        a_star(PuzzleState.from_packed(get_board(5).goal_code, 5), pdb)
+
+
+def test_rectangular_boards():
+    # 2x3: every permutation the parity rule accepts is reachable from the goal, and no other
+    board = get_board(2, 3)
+    seen, frontier = {board.goal_code}, [(board.goal_code, board.goal_blank)]
+    while frontier:
+        code, blank = frontier.pop()
+        for child, child_blank, _ in board.packed_neighbors(code, blank):
+            if child not in seen:
+                seen.add(child)
+                frontier.append((child, child_blank))
+    solvable = [p for p in itertools.permutations(range(6)) if is_solvable(p, (2, 3))]
+    assert len(seen) == len(solvable) == board.n_states == 360
+    assert {board.pack(p) for p in solvable} == seen
+
+    tiles = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 0, 11)
+    wide, tall = PuzzleState(tiles, shape=(3, 4)), PuzzleState(tiles, shape=(4, 3))
+    assert wide != tall and pickle.loads(pickle.dumps(wide)).board is get_board(3, 4)
+    assert repr(wide) != repr(tall) and eval(repr(tall)) == tall
+    assert repr(PuzzleState(GOAL)) == f"PuzzleState(tiles={GOAL!r})"
+    with pytest.raises(ValueError):
+        PuzzleState(tiles)  # 12 cells: shape required
+    start = list(apply_moves(wide, "ULDLURULDR"))[-1]
+    optimal = a_star(start, zero_heuristic).depth
+    for solver, h in ((a_star, manhattan), (a_star, linear_conflict), (ida_star, linear_conflict)):
+        res = solver(start, h)
+        assert res.depth == optimal and list(apply_moves(start, res.moves))[-1].is_goal()
+    states = random_solvable_states(random.Random(8), 10, size=(3, 4))
+    assert all(s.board.shape == (3, 4) and is_solvable(s.tiles, (3, 4)) for s in states)
+
+
+def test_bidirectional_search():
+    start = PuzzleState((8, 6, 7, 2, 5, 4, 3, 0, 1))
+    uninformed = a_star(start, zero_heuristic)
+    for h in (zero_heuristic, manhattan, linear_conflict, pdb):
+        res = bidirectional(start, h)
+        assert res.solved and res.depth == 31 == len(res.moves)
+        assert res.path[-1].is_goal()
+    # Meeting in the middle needs far fewer expansions than uniform-cost A*
+    assert bidirectional(start, zero_heuristic).expanded * 10 < uninformed.expanded
+    stopped = bidirectional(start, manhattan, max_expanded=50)
+    assert (stopped.status, stopped.expanded) == ("node_limit", 50) and stopped.lower_bound <= 31
+    assert bidirectional(PuzzleState((2, 1, 3, 4, 5, 6, 7, 8, 0)), zero_heuristic).status == "exhausted"
+    assert bidirectional(PuzzleState(GOAL), manhattan).depth == 0
+
+
+def test_weighted_and_anytime_search():
+    start = PuzzleState((8, 6, 7, 2, 5, 4, 3, 0, 1))
+    optimal = a_star(start, manhattan)
+    weighted = a_star(start, manhattan, weight=2)
+    assert weighted.depth <= 2 * optimal.depth and weighted.expanded < optimal.expanded
+    assert a_star(start, manhattan, weight=2, open_list="bucket").depth <= 2 * optimal.depth
+    # Integral float weights (the CLI parses --weight 2 as 2.0) keep f integer for buckets
+    assert a_star(start, manhattan, weight=2.0, open_list="bucket").depth <= 2 * optimal.depth
+    with pytest.raises(ValueError):
+        a_star(start, manhattan, weight=1.5, open_list="bucket")
+
+    incumbents = []
+    res = ara_star(start, linear_conflict, weight=3, on_incumbent=incumbents.append)
+    assert (res.status, res.depth) == ("solved", 31) and res.path[-1].is_goal()
+    assert incumbents[0].weight == 3 and incumbents[-1].bound == 1.0
+    for inc in incumbents:
+        assert inc.depth <= inc.bound * 31 and inc.moves is not None
+    # Out of budget: the best solution so far, with a proven lower bound
+    early = ara_star(start, manhattan, max_expanded=600)
+    assert early.solved and early.status == "node_limit" and early.lower_bound <= 31 <= early.depth
+
+
+def test_hash_distributed_parallel_search():
+    start = PuzzleState((8, 6, 7, 2, 5, 4, 3, 0, 1))
+    table = zobrist_table(start.board)
+    assert zobrist_hash(start.tiles, table) == zobrist_hash(start.tiles, zobrist_table(get_board(3)))
+    for workers, batch_size in ((1, 64), (3, 4)):
+        res = hda_star(start, manhattan, workers=workers, batch_size=batch_size, instrument=True)
+        assert (res.status, res.depth) == ("solved", 31) and res.path[-1].is_goal()
+        assert res.stats.generated >= res.expanded > 0
+    assert hda_star(PuzzleState(GOAL), manhattan, workers=2).depth == 0
+    assert hda_star(PuzzleState((2, 1, 3, 4, 5, 6, 7, 8, 0)), manhattan, workers=2).status == "exhausted"
+    assert hda_star(start, zero_heuristic, workers=2, max_expanded=1000).status == "node_limit"
+    # A crashing worker becomes a status instead of a hang
+    failed = hda_star(start, _exploding_heuristic, workers=2)
+    assert (failed.status, failed.solved) == ("worker_failed", False)
+
+
+def _exploding_heuristic(s):
+    raise RuntimeError("heuristic failed in a worker process")
+
+
+def test_running_stats_and_quantile_sketch():
+    values = [float(x * x % 97 + 1) for x in range(500)]
+    left, right = RunningStats(), RunningStats()
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for i, v in enumerate(values):
+        (left if i % 2 else right).add(v)
+        sketch.add(v)
+    left.merge(right)  # mergeable, e.g. across worker processes
+    assert left.count == len(values)
+    assert math.isclose(left.mean, statistics.mean(values))
+    assert math.isclose(left.stdev, statistics.stdev(values))
+    assert left.max == max(values)
+    exact_p90 = sorted(values)[int(0.9 * (len(values) - 1))]
+    assert abs(sketch.quantile(0.9) - exact_p90) <= 0.01 * exact_p90 + 1e-9
+    assert sketch.quantile(0.99) <= max(values) and sketch.quantile(0.0) >= min(values)
+    constant = QuantileSketch()
+    for _ in range(10):
+        constant.add(3)
+    assert constant.quantile(0.5) == constant.quantile(0.99) == 3
+    other = QuantileSketch()
+    other.add(2000)
+    constant.merge(other)  # min/max survive merges
+    assert constant.quantile(1.0) <= 2000 and constant.quantile(0.0) == 3
+
+
+def test_random_states_by_unranking():
+    batch = random_solvable_states(random.Random(3), 50)
+    rng = random.Random(3)
+    assert batch == [random_solvable_state(rng) for _ in range(50)]
+    assert all(is_solvable(s.tiles) and not s.is_goal() for s in batch)
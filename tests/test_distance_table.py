@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from src.state import PuzzleState, GOAL
+from src.ranking import N_STATES, rank
+from src.heuristics import manhattan
+from src.search import a_star
+from src.distance_table import load_distance_table, solve_by_descent
+from src.experiment import generate_trials_by_depth, parse_depth_spec
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    # Builds the full table once (about a second) into a throwaway cache file
+    path = str(tmp_path_factory.mktemp("dist") / "distances.bin")
+    return load_distance_table(path)
+
+
+def test_table_covers_state_space(table):
+    assert len(table) == N_STATES
+    assert table[rank(PuzzleState(GOAL))] == 0
+    assert max(table) == 31  # known diameter of the 8-puzzle
+
+
+def test_descent_is_optimal(table):
+    start = PuzzleState((8, 6, 7, 2, 5, 4, 3, 0, 1))
+    res = solve_by_descent(start, table)
+    assert res.solved is True
+    assert res.path[0] == start and res.path[-1].is_goal()
+    assert res.depth == a_star(start, manhattan).depth == table[rank(start)]
+    # Consecutive states on the path are one move apart
+    for a, b in zip(res.path, res.path[1:]):
+        assert b in [ns for ns, _, _ in a.neighbors()]
+
+
+def test_load_rejects_foreign_file(tmp_path):
+    bad = tmp_path / "bad.bin"
+    bad.write_bytes(b"not a table")
+    with pytest.raises(ValueError):
+        load_distance_table(str(bad))
+
+
+def test_depth_stratified_trials(table, monkeypatch):
+    import src.distance_table as dt
+    monkeypatch.setattr(dt, "_table", table)  # reuse the fixture table instead of the default cache
+
+    per_depth = parse_depth_spec("1:5,10-11,31", default_count=3)
+    assert per_depth == {1: 5, 10: 3, 11: 3, 31: 3}
+    trials = generate_trials_by_depth(per_depth, random.Random(0))
+    assert [table[rank(s)] for s in trials] == [1] * 5 + [10] * 3 + [11] * 3 + [31] * 3
+    with pytest.raises(ValueError):
+        generate_trials_by_depth({40: 1}, random.Random(0))
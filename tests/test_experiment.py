@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import random
+from collections import Counter
+
+from src.experiment import (
+    ResultWriter,
+    SummaryAccumulator,
+    generate_trials,
+    generate_trials_by_depth,
+    iter_batch,
+    read_results_csv,
+    run_batch,
+    save_csv,
+    select_heuristics,
+    summarize,
+)
+
+
+def _comparable(results):
+    # Everything except the timing column must match between serial and parallel runs
+    return [(r.heuristic, r.solved, r.depth, r.expanded, r.start_state) for r in results]
+
+
+def test_parallel_batch_matches_serial():
+    trials = generate_trials(6, random.Random(5))
+    heuristics = select_heuristics(["Manhattan", "LinearConflict"])
+    serial = run_batch(trials, heuristics)
+    parallel = run_batch(trials, heuristics, workers=2, chunksize=2)
+    assert len(serial) == len(parallel) == 12
+    assert _comparable(parallel) == _comparable(serial)
+
+
+def test_streaming_pipeline_matches_batch(tmp_path):
+    trials = generate_trials(4, random.Random(9))
+    heuristics = select_heuristics(["Manhattan", "Hamming"])
+    out = tmp_path / "results.csv"
+    acc = SummaryAccumulator()
+    with ResultWriter(str(out), flush_every=1) as writer:
+        stream = iter_batch(trials, heuristics)
+        first = next(stream)
+        writer.write(first)
+        acc.add(first)
+        # Flushed rows are on disk before the batch has finished
+        assert len(out.read_text().splitlines()) == 2
+        for r in stream:
+            writer.write(r)
+            acc.add(r)
+    assert len(out.read_text().splitlines()) == 1 + 8
+    expected = summarize(run_batch(trials, heuristics))
+    got = acc.rows()
+    for e, g in zip(expected, got):
+        assert (e["heuristic"], e["mean_expanded"], e["mean_depth_if_solved"]) == (
+            g["heuristic"], g["mean_expanded"], g["mean_depth_if_solved"]
+        )
+
+
+def test_resume_skips_completed_runs(tmp_path):
+    trials = generate_trials(3, random.Random(11))
+    heuristics = select_heuristics(["Manhattan", "Hamming"])
+    out = tmp_path / "results.csv"
+    save_csv(run_batch(trials[:2], heuristics), str(out))
+    # Simulate a crash in the middle of the last row
+    text = out.read_text()
+    out.write_text(text[: len(text) - 5])
+
+    with ResultWriter(str(out), append=True) as writer:
+        done = Counter((r.start_state, r.heuristic) for r in read_results_csv(str(out)))
+        assert sum(done.values()) == 3
+        new = list(iter_batch(trials, heuristics, skip=done))
+        for r in new:
+            writer.write(r)
+    assert len(new) == 3  # the truncated run plus both runs of the third trial
+    rows = list(read_results_csv(str(out)))
+    assert [r.start_state for r in rows] == [t.tiles for t in trials for _ in heuristics]
+
+
+def test_instrumented_results_round_trip_through_csv(tmp_path):
+    trials = generate_trials(2, random.Random(3))
+    heuristics = select_heuristics(["Manhattan"])
+    results = run_batch(trials, heuristics, search_kwargs={"instrument": True})
+    out = tmp_path / "results.csv"
+    save_csv(results, str(out))
+    rows = list(read_results_csv(str(out)))
+    assert [r.stats.generated for r in rows] == [r.stats.generated for r in results]
+    summary = summarize(rows)
+    assert summary[0]["mean_h_calls"] == sum(r.stats.h_calls for r in results) / 2
+    # Uninstrumented runs leave the columns empty and the summary without them
+    assert "mean_h_calls" not in summarize(run_batch(trials, heuristics))[0]
+
+
+def test_per_depth_summary_groups_by_sampled_depth():
+    trials = generate_trials_by_depth({2: 3, 10: 3}, random.Random(1))
+    heuristics = select_heuristics(["Manhattan"])
+    acc = SummaryAccumulator(by_depth=True)
+    for r in run_batch(trials, heuristics, search_kwargs={"max_expanded": 30}):
+        acc.add(r)
+    rows = acc.rows()
+    # Budget-stopped runs stay with the depth they were sampled at (no depth-0 group)
+    assert [(row["depth"], row["n_runs"]) for row in rows] == [(2, 3), (10, 3)]
+    assert rows[0]["solve_rate"] == 1.0 and rows[1]["solve_rate"] < 1.0
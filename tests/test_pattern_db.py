@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import pickle
+import random
+
+import pytest
+
+from src.state import PuzzleState, GOAL, apply_moves, get_board
+from src.heuristics import manhattan
+from src.search import a_star
+from src.ranking import rank
+from src.distance_table import load_distance_table
+from src.utils import random_solvable_states
+from src.pattern_db import AdditivePDB, PARTITIONS, PARTITIONS_BY_SHAPE, placement_index, placement_from_index
+
+
+@pytest.fixture(scope="module", params=sorted(PARTITIONS))
+def heuristic(request, tmp_path_factory):
+    return AdditivePDB(PARTITIONS[request.param], directory=str(tmp_path_factory.mktemp("pdb")))
+
+
+def test_placement_index_roundtrip():
+    for positions in ([0, 1, 2], [8, 0, 4], [3, 7]):
+        assert placement_from_index(placement_index(positions), len(positions)) == positions
+
+
+def test_pdb_dominates_manhattan(heuristic):
+    assert heuristic(PuzzleState(GOAL)) == 0
+    s = PuzzleState((8, 6, 7, 2, 5, 4, 3, 0, 1))
+    assert heuristic(s) >= manhattan(s)
+
+
+def test_a_star_with_pdb_is_optimal(heuristic):
+    start = PuzzleState((8, 6, 7, 2, 5, 4, 3, 0, 1))
+    res = a_star(start, heuristic)
+    res_m = a_star(start, manhattan)
+    assert res.depth == res_m.depth == 31
+    assert res.expanded < res_m.expanded
+
+
+@pytest.fixture(scope="module")
+def distances(tmp_path_factory):
+    return load_distance_table(str(tmp_path_factory.mktemp("dist") / "distances.bin"))
+
+
+def test_pdb_is_consistent_and_a_star_stays_optimal(heuristic, distances):
+    rng = random.Random(3)
+    for s in random_solvable_states(rng, 300):
+        h = heuristic(s)
+        # Konsistenz: ein Zug ändert den Wert um höchstens 1 (a_star öffnet nichts neu)
+        assert all(abs(heuristic(child) - h) <= 1 for child, _, _ in s.neighbors())
+    for s in random_solvable_states(rng, 30) + [PuzzleState((0, 3, 5, 8, 6, 2, 7, 1, 4))]:
+        assert a_star(s, heuristic, store_path=False).depth == distances[rank(s)]
+
+
+def test_pdb_delta_matches_full_evaluation(heuristic):
+    for s in random_solvable_states(random.Random(4), 50):
+        for ns, _, _ in s.neighbors():
+            tile = ns.tiles[s.blank]  # the tile that slid into the old blank cell
+            assert heuristic(s) + heuristic.delta(ns.packed(), tile, ns.blank, s.blank) == heuristic(ns)
+
+
+def test_pdb_on_the_15_puzzle(tmp_path):
+    board = get_board(4)
+    patterns = PARTITIONS_BY_SHAPE[(4, 4)]["5-5-5"]
+    assert sorted(t for p in patterns for t in p) == list(range(1, 16))
+    # Small patterns keep the test fast; the 5-5-5 tables are built the same way
+    h = AdditivePDB(((1, 2, 5), (3, 4)), directory=str(tmp_path), board=board)
+    start = list(apply_moves(PuzzleState(board.goal), "LLUURDLUUR"))[-1]
+    for s in random_solvable_states(random.Random(5), 30, size=4) + [start]:
+        for ns, _, _ in s.neighbors():
+            tile = ns.tiles[s.blank]
+            assert h(s) + h.delta(ns.packed(), tile, ns.blank, s.blank) == h(ns)
+    assert a_star(start, h).depth == a_star(start, manhattan).depth
+    assert pickle.loads(pickle.dumps(h)).board is board
+    with pytest.raises(ValueError):   # tiles 4..8 do not exist on a 2x2 board
+        AdditivePDB(PARTITIONS["4-4"], directory=str(tmp_path), board=get_board(2))
+    with pytest.raises(ValueError):   # no default partition for 3x4
+        AdditivePDB(directory=str(tmp_path), board=get_board(3, 4))
+
+
+def test_pdb_pickles_by_reference(heuristic):
+    clone = pickle.loads(pickle.dumps(heuristic))
+    s = PuzzleState((1, 2, 3, 4, 5, 6, 0, 7, 8))
+    assert clone(s) == heuristic(s)